@@ -0,0 +1,149 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import statistics
+import tracemalloc
+import networkx as nx
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(REPO_ROOT)
+from benchmarks.synthetic_repo import generate_repo
+from benchmarks.run_benchmarks import git_revision
+from src.retriever.BM25Index import load_files
+from src.parser.CallGraph import CallGraph
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def networkx_neighborhood(graph, name, k, direction):
+    """The dict-of-dicts way: breadth-first over successors / predecessors one node at a time."""
+    distance, frontier = {name: 0}, [name]
+    for hop in range(1, k + 1):
+        reached = []
+        for node in frontier:
+            nexts = []
+            if direction in ("out", "both"):
+                nexts.extend(graph.successors(node))
+            if direction in ("in", "both"):
+                nexts.extend(graph.predecessors(node))
+            for other in nexts:
+                if other not in distance:
+                    distance[other] = hop
+                    reached.append(other)
+        frontier = reached
+    return distance
+
+
+def _time_queries(samples, fn):
+    times, results = [], []
+    for name in samples:
+        start = time.perf_counter()
+        results.append(fn(name))
+        times.append((time.perf_counter() - start) * 1000)
+    return {"p50_ms": statistics.median(times), "p99_ms": _percentile(times, 0.99)}, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time call graph construction and callers/callees/k-hop queries.")
+    parser.add_argument("path", nargs="?", default=None, help="Python codebase to use (default: a synthetic repo)")
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--files", type=int, default=2000, help="Synthetic Python files")
+    parser.add_argument("--functions-per-file", type=int, default=50)
+    parser.add_argument("--queries", type=int, default=500, help="Random functions to query")
+    parser.add_argument("--hops", type=int, nargs="+", default=[2, 3])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        directory = args.path
+        if directory is None:
+            directory = os.path.join(tmp_dir, "repo")
+            generate_repo(directory, languages=("python",), files=args.files,
+                          functions_per_file=args.functions_per_file, seed=args.seed)
+        code_files = {path: code for path, code in load_files(directory).items() if path.endswith(".py")}
+
+        start = time.perf_counter()
+        graph = CallGraph.from_codebase(code_files)
+        build_seconds = time.perf_counter() - start
+        array_bytes = sum(getattr(graph, name).nbytes for name in
+                          ("out_offsets", "out_ids", "in_offsets", "in_ids", "lines", "end_lines"))
+        graph_dir = os.path.join(tmp_dir, "callgraph")
+        graph.save(graph_dir)
+        disk_bytes = sum(os.path.getsize(os.path.join(graph_dir, name)) for name in os.listdir(graph_dir))
+        start = time.perf_counter()
+        graph = CallGraph.load(graph_dir)
+        load_ms = (time.perf_counter() - start) * 1000
+        print(f"{len(code_files)} files: {len(graph)} functions, {graph.num_edges} calls; parsed and built in "
+              f"{build_seconds:.1f}s, {array_bytes / 1e6:.1f} MB of arrays, {disk_bytes / 1e6:.1f} MB on disk, "
+              f"loads in {load_ms:.0f} ms", flush=True)
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        baseline = nx.DiGraph()
+        baseline.add_nodes_from(graph.names)
+        baseline.add_edges_from((graph.names[i], graph.names[j]) for i in range(len(graph)) for j in graph.callee_ids(i))
+        baseline_seconds = time.perf_counter() - start
+        baseline_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"networkx baseline: {baseline_bytes / 1e6:.1f} MB of dicts (names shared), built in {baseline_seconds:.1f}s",
+              flush=True)
+
+    rng = random.Random(args.seed)
+    samples = [rng.choice(graph.names) for _ in range(args.queries)]
+    queries = [("callers", graph.callers, lambda name: list(baseline.predecessors(name))),
+               ("callees", graph.callees, lambda name: list(baseline.successors(name)))]
+    for k in args.hops:
+        for direction in ("out", "both"):
+            queries.append((f"{k}-hop {direction}", lambda name, k=k, d=direction: graph.neighborhood(name, k, d),
+                            lambda name, k=k, d=direction: networkx_neighborhood(baseline, name, k, d)))
+
+    results, mismatches = [], 0
+    for label, fast, slow in queries:
+        fast_stats, fast_results = _time_queries(samples, fast)
+        slow_stats, slow_results = _time_queries(samples, slow)
+        wrong = sum((sorted(a) != sorted(b)) if isinstance(a, list) else (a != b)
+                    for a, b in zip(fast_results, slow_results))
+        mismatches += wrong
+        size = statistics.mean(len(r) for r in fast_results)
+        results.append({"query": label, "mean_results": size, "callgraph": fast_stats, "networkx": slow_stats,
+                        "mismatches": wrong})
+        print(f"{label:12} {size:8.1f} results: p50 {fast_stats['p50_ms']:.3f} ms / p99 {fast_stats['p99_ms']:.3f} ms "
+              f"vs networkx p50 {slow_stats['p50_ms']:.3f} ms / p99 {slow_stats['p99_ms']:.3f} ms"
+              f"{'' if not wrong else f'  {wrong} MISMATCHES'}", flush=True)
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": vars(args),
+        "files": len(code_files),
+        "functions": len(graph),
+        "calls": graph.num_edges,
+        "build_seconds": build_seconds,
+        "array_bytes": array_bytes,
+        "disk_bytes": disk_bytes,
+        "load_ms": load_ms,
+        "networkx_build_seconds": baseline_seconds,
+        "networkx_bytes": baseline_bytes,
+        "queries": results,
+        "mismatches": mismatches,
+    }
+    output = args.output or os.path.join(
+        REPO_ROOT, "benchmarks", "results", f"callgraph-{report['revision'] or 'unknown'}-{int(time.time())}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}", flush=True)
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
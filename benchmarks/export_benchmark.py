@@ -0,0 +1,108 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(REPO_ROOT)
+from benchmarks.run_benchmarks import git_revision
+from benchmarks.graph_metrics_benchmark import dependency_graph
+from src.parser.GraphExport import WRITERS, khop_subgraph, package_subgraph
+
+
+def joined_dot(graph):
+    """The exporter the analyzers used before: every line in one list, sorted, then joined."""
+    dot = ['digraph G {']
+    for node in sorted(graph.nodes):
+        dot.append(f'"{node}"')
+    for u, v in sorted(graph.edges):
+        dot.append(f'"{u}" -> "{v}";')
+    dot.append('}')
+    return '\n'.join(dot)
+
+
+def _measure(fn):
+    """(seconds, peak traced MB, result) for fn(); timed untraced, since tracemalloc slows
+    allocation-heavy streaming code far more than one big join, then run again for the peak."""
+    start = time.perf_counter()
+    fn()
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    result = fn()
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return seconds, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare streaming graph exporters with the join-based to_dot.")
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--nodes", type=int, default=200000)
+    parser.add_argument("--fanout", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, default=100000, help="External sort run size")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    graph = dependency_graph(args.nodes, args.fanout, args.nodes // 100, args.seed)
+    print(f"{graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges", flush=True)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        seconds, peak, text = _measure(lambda: joined_dot(graph))
+        baseline_path = os.path.join(tmp_dir, "joined.dot")
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        del text
+        results["joined_dot"] = {"seconds": seconds, "peak_mb": peak}
+        print(f"{'joined dot':22} {seconds:6.2f}s, peak {peak:7.1f} MB", flush=True)
+
+        for fmt in WRITERS:
+            for sort in (True, False):
+                path = os.path.join(tmp_dir, f"graph-{sort}.{fmt}")
+
+                def write():
+                    with open(path, "w", encoding="utf-8") as f:
+                        WRITERS[fmt](graph, f, sort=sort, chunk_size=args.chunk_size)
+
+                seconds, peak, _ = _measure(write)
+                label = f"{fmt} {'sorted' if sort else 'unsorted'}"
+                row = {"seconds": seconds, "peak_mb": peak, "bytes": os.path.getsize(path)}
+                if fmt == "dot" and sort:
+                    with open(path, encoding="utf-8") as a, open(baseline_path, encoding="utf-8") as b:
+                        row["matches_joined"] = a.read() == b.read()
+                results[label] = row
+                print(f"{label:22} {seconds:6.2f}s, peak {peak:7.1f} MB, {row['bytes'] / 1e6:6.1f} MB written"
+                      + ("" if "matches_joined" not in row else
+                         f", {'identical to' if row['matches_joined'] else 'DIFFERENT FROM'} joined dot"), flush=True)
+
+    center = max(graph.nodes, key=graph.out_degree)
+    seconds, _, sub = _measure(lambda: khop_subgraph(graph, center, 1))
+    results["khop_1"] = {"seconds": seconds, "nodes": sub.number_of_nodes(), "edges": sub.number_of_edges()}
+    seconds, _, sub = _measure(lambda: package_subgraph(graph, "pkg_7"))
+    results["package"] = {"seconds": seconds, "nodes": sub.number_of_nodes(), "edges": sub.number_of_edges()}
+    print(f"1-hop around the busiest module: {results['khop_1']['nodes']} nodes; package pkg_7: "
+          f"{results['package']['nodes']} nodes, {results['package']['edges']} edges", flush=True)
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": vars(args),
+        "nodes": graph.number_of_nodes(),
+        "edges": graph.number_of_edges(),
+        "results": results,
+    }
+    output = args.output or os.path.join(
+        REPO_ROOT, "benchmarks", "results", f"export-{report['revision'] or 'unknown'}-{int(time.time())}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}", flush=True)
+    if not results["dot sorted"]["matches_joined"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
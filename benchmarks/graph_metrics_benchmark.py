@@ -0,0 +1,108 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import networkx as nx
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(REPO_ROOT)
+from benchmarks.run_benchmarks import git_revision
+from src.parser.GraphMetrics import graph_metrics
+
+
+def dependency_graph(nodes, fanout, cycle_edges, seed):
+    """A module-graph-shaped DiGraph: each module imports a few earlier ones, popular modules more
+    often (preferential attachment), plus random back edges that create import cycles."""
+    rng = random.Random(seed)
+    graph = nx.DiGraph()
+    graph.add_nodes_from(f"pkg_{i // 50}.mod_{i}" for i in range(nodes))
+    targets = []
+    for i in range(1, nodes):
+        for j in {rng.choice(targets) if targets and rng.random() < 0.7 else rng.randrange(i) for _ in range(fanout)}:
+            graph.add_edge(f"pkg_{j // 50}.mod_{j}", f"pkg_{i // 50}.mod_{i}")   # dependency -> dependent
+            targets.append(j)
+    for _ in range(cycle_edges):
+        i, j = sorted(rng.sample(range(nodes), 2))
+        graph.add_edge(f"pkg_{j // 50}.mod_{j}", f"pkg_{i // 50}.mod_{i}")
+    return graph
+
+
+def networkx_metrics(graph):
+    """The same metrics the pure networkx way."""
+    condensed = nx.condensation(graph)
+    layers = {}
+    for depth, generation in enumerate(nx.topological_generations(condensed)):
+        for component in generation:
+            for node in condensed.nodes[component]["members"]:
+                layers[node] = depth
+    return {
+        "pagerank": nx.pagerank(graph.reverse(copy=False), tol=1.0e-10),
+        "cycles": sorted(sorted(c) for c in nx.strongly_connected_components(graph) if len(c) > 1),
+        "layers": layers,
+        "fan_in": dict(graph.out_degree()),
+        "fan_out": dict(graph.in_degree()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sparse-matrix graph metrics with networkx.")
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--nodes", type=int, default=200000)
+    parser.add_argument("--fanout", type=int, default=4, help="Imports per module")
+    parser.add_argument("--cycle-edges", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    graph = dependency_graph(args.nodes, args.fanout, args.cycle_edges, args.seed)
+    print(f"{graph.number_of_nodes()} modules, {graph.number_of_edges()} edges", flush=True)
+
+    start = time.perf_counter()
+    metrics = graph_metrics(graph)
+    sparse_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    expected = networkx_metrics(graph)
+    networkx_seconds = time.perf_counter() - start
+    print(f"sparse: {sparse_seconds:.2f}s, networkx: {networkx_seconds:.2f}s "
+          f"({networkx_seconds / sparse_seconds:.1f}x)", flush=True)
+
+    pagerank_error = max(abs(metrics["pagerank"][node] - score) for node, score in expected["pagerank"].items())
+    checks = {
+        "pagerank": pagerank_error < 1e-6,
+        "cycles": sorted(metrics["cycles"]) == expected["cycles"],
+        "layers": metrics["layers"] == expected["layers"],
+        "fan_in": metrics["fan_in"]["max"] == max(expected["fan_in"].values()),
+        "fan_out": metrics["fan_out"]["max"] == max(expected["fan_out"].values()),
+    }
+    print(f"{len(metrics['cycles'])} cycles (largest {len(metrics['cycles'][0]) if metrics['cycles'] else 0}), "
+          f"{metrics['num_layers']} layers, fan-in p99 {metrics['fan_in']['p99']:.0f} / max {metrics['fan_in']['max']}, "
+          f"PageRank max error {pagerank_error:.1e}; "
+          + ", ".join(f"{name} {'ok' if ok else 'MISMATCH'}" for name, ok in checks.items()), flush=True)
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": vars(args),
+        "nodes": metrics["nodes"],
+        "edges": metrics["edges"],
+        "sparse_seconds": sparse_seconds,
+        "networkx_seconds": networkx_seconds,
+        "cycles": len(metrics["cycles"]),
+        "num_layers": metrics["num_layers"],
+        "pagerank_max_error": pagerank_error,
+        "checks": checks,
+    }
+    output = args.output or os.path.join(
+        REPO_ROOT, "benchmarks", "results", f"graph-metrics-{report['revision'] or 'unknown'}-{int(time.time())}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}", flush=True)
+    if not all(checks.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
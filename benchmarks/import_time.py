@@ -0,0 +1,182 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(REPO_ROOT)
+from benchmarks.run_benchmarks import git_revision, INPUT_PY
+
+# Imported on first use only; importing a module below must not pull any of these in.
+HEAVY = ("networkx", "matplotlib", "tree_sitter", "tree_sitter_language_pack", "nbformat", "github", "streamlit")
+NUMERIC = ("numpy", "scipy")
+
+# module -> top-level packages it may not import. CodebaseQA's BM25 index and CallGraph are
+# NumPy arrays, so it is the one module allowed to load numpy up front.
+TARGETS = {
+    "src.parser.TokenParse": HEAVY + NUMERIC,
+    "src.parser.CodeBase_CodeLine": HEAVY + NUMERIC,
+    "src.parser.GraphExport": HEAVY + NUMERIC,
+    "src.codebase_summary.MapScheduler": HEAVY + NUMERIC,
+    "src.codebase_summary.CodeBase_Sum": HEAVY + NUMERIC,
+    "src.codebase_summary.CodeBase_Sum_2_TEST_API": HEAVY + NUMERIC,
+    "src.codebase_summary.AnalysisServer": HEAVY + NUMERIC,
+    "src.codebase_summary.CodebaseQA": HEAVY,
+    "input": HEAVY + NUMERIC,
+}
+
+
+def import_profile(module, cwd):
+    """Import module in a fresh interpreter under -X importtime.
+
+    Returns (cumulative microseconds for module, {module it imported: cumulative us}, stdout).
+    """
+    code = f"import {module}"
+    if module == "input":
+        code = f"import sys; sys.path.insert(0, {os.path.dirname(INPUT_PY)!r}); import input"
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=cwd, env=env,
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+    # Children are listed before their parent, indented one level deeper; module's subtree is
+    # everything since the previous top-level import (interpreter startup, site hooks).
+    imported = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if name.strip() == module:
+            return int(cumulative), imported, proc.stdout
+        if len(name) - len(name.lstrip()) == 1:
+            imported = {}
+        else:
+            imported[name.strip()] = int(cumulative)
+    raise RuntimeError(f"import {module} missing from -X importtime output")
+
+
+WARM_JOBS = ("analyze", "ast_info", "graph")
+
+
+def warm_job_imports(cwd):
+    """Modules an AnalysisServer job still imports after _warm_worker, per operation.
+
+    Runs in a fresh interpreter over a two-file package in cwd; anything listed is paid for by
+    the first request a pool worker serves.
+    """
+    code = (
+        "import sys, json\n"
+        "from src.codebase_summary.AnalysisServer import _warm_worker, _run_job\n"
+        "_warm_worker()\n"
+        "loaded = {}\n"
+        f"for operation in {WARM_JOBS!r}:\n"
+        "    before = set(sys.modules)\n"
+        "    _run_job(operation, sys.argv[1], {})\n"
+        "    loaded[operation] = sorted(set(sys.modules) - before)\n"
+        "print(json.dumps(loaded))\n"
+    )
+    package = os.path.join(cwd, "pkg")
+    os.makedirs(package)
+    with open(os.path.join(package, "a.py"), "w", encoding="utf-8") as f:
+        f.write("import b\n\n\ndef f(x):\n    return b.g(x) + 1\n")
+    with open(os.path.join(package, "b.py"), "w", encoding="utf-8") as f:
+        f.write("def g(x):\n    return x * 2\n")
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    proc = subprocess.run([sys.executable, "-c", code, package], cwd=cwd, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"warm worker jobs failed:\n{proc.stderr[-2000:]}")
+    return json.loads(proc.stdout.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that importing the parser and summarizer modules is cheap "
+                                                 "and side-effect free, using python -X importtime.")
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per module; the median is reported")
+    parser.add_argument("--budget-ms", type=float, default=300.0, help="Fail when a module's median import exceeds this")
+    parser.add_argument("--modules", nargs="+", default=list(TARGETS), choices=list(TARGETS))
+    args = parser.parse_args()
+
+    results, failures = {}, []
+    for module in args.modules:
+        with tempfile.TemporaryDirectory() as cwd:
+            timings = []
+            try:
+                for _ in range(args.repeat):
+                    micros, imported, stdout = import_profile(module, cwd)
+                    timings.append(micros / 1000)
+            except RuntimeError as e:
+                results[module] = {"error": str(e)}
+                failures.append(f"{module}: import failed")
+                print(f"{module:45} FAIL: {str(e).splitlines()[-1]}", flush=True)
+                continue
+            leftovers = os.listdir(cwd)
+        timings.sort()
+        median = timings[len(timings) // 2]
+        packages = {name.split(".")[0] for name in imported}
+        forbidden = sorted(packages & set(TARGETS[module]))
+        heaviest = sorted(((us, name) for name, us in imported.items() if "." not in name), reverse=True)[:3]
+        row = {
+            "median_ms": median,
+            "min_ms": timings[0],
+            "modules_imported": len(imported),
+            "forbidden_imports": forbidden,
+            "stdout_chars": len(stdout),
+            "files_written": leftovers,
+            "heaviest": {name: us / 1000 for us, name in heaviest},
+        }
+        results[module] = row
+        problems = []
+        if forbidden:
+            problems.append(f"imports {', '.join(forbidden)}")
+        if stdout:
+            problems.append(f"prints {len(stdout)} chars")
+        if leftovers:
+            problems.append(f"writes {', '.join(leftovers)}")
+        if median > args.budget_ms:
+            problems.append(f"over the {args.budget_ms:.0f} ms budget")
+        failures.extend(f"{module}: {problem}" for problem in problems)
+        print(f"{module:45} {median:7.1f} ms, {len(imported):4} modules; heaviest "
+              + ", ".join(f"{name} {us / 1000:.0f} ms" for us, name in heaviest)
+              + ("" if not problems else f"  FAIL: {'; '.join(problems)}"), flush=True)
+
+    if "src.codebase_summary.AnalysisServer" in args.modules:
+        with tempfile.TemporaryDirectory() as cwd:
+            try:
+                loaded = warm_job_imports(cwd)
+            except RuntimeError as e:
+                loaded = {"error": str(e)}
+                failures.append("AnalysisServer warm worker: jobs failed")
+        results["warm_worker_job_imports"] = loaded
+        late = {operation: sorted({name.split(".")[0] for name in names})
+                for operation, names in loaded.items() if operation != "error" and names}
+        failures.extend(f"AnalysisServer warm worker: {operation} job imports {', '.join(packages)}"
+                        for operation, packages in late.items())
+        print(f"{'AnalysisServer warm worker jobs':45} "
+              + ("imports nothing new" if not late and "error" not in loaded else
+                 f"FAIL: {loaded['error'].splitlines()[-1] if 'error' in loaded else late}"), flush=True)
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": vars(args),
+        "python": sys.version.split()[0],
+        "results": results,
+        "failures": failures,
+    }
+    output = args.output or os.path.join(
+        REPO_ROOT, "benchmarks", "results", f"import-time-{report['revision'] or 'unknown'}-{int(time.time())}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}", flush=True)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import os
+import io
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import statistics
+import contextlib
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(REPO_ROOT)
+from benchmarks.synthetic_repo import generate_repo
+from benchmarks.run_benchmarks import load_input_module, git_revision
+
+LANGUAGES = ["python", "javascript", "java", "c"]
+
+# Lines that open a generated function, and a small function to splice in front of one.
+FUNCTION_HEADER = {
+    "python": re.compile(r"^def func_"),
+    "javascript": re.compile(r"^function func_"),
+    "java": re.compile(r"^    public static int func_"),
+    "c": re.compile(r"^int func_"),
+}
+INSERTED_FUNCTION = {
+    "python": "def added_{n}(x):\n    return func_0_0(x)\n\n",
+    "javascript": "function added_{n}(x) {{\n  return func_0_0(x, 'y');\n}}\n\n",
+    "java": "    public static int added_{n}(int x) {{\n        return func_0_0(x, \"y\");\n    }}\n\n",
+    "c": "int added_{n}(int x) {{\n    return func_0_0(x, \"y\");\n}}\n\n",
+}
+
+
+def edit_source(rng, language, source, step):
+    """Apply one random edit an editor would make: tweak a body, add or delete a function."""
+    lines = source.splitlines(keepends=True)
+    headers = [i for i, line in enumerate(lines) if FUNCTION_HEADER[language].match(line)]
+    kind = rng.choice(["body", "insert", "delete"] if len(headers) > 2 else ["body", "insert"])
+    if kind == "body":
+        bodies = [i for i, line in enumerate(lines) if "total = " in line]
+        index = rng.choice(bodies)
+        lines[index] = re.sub(r"total = \d+", f"total = {step + 1}", lines[index])
+    elif kind == "insert":
+        index = rng.choice(headers)
+        lines.insert(index, INSERTED_FUNCTION[language].format(n=step))
+    else:
+        position = rng.randrange(len(headers) - 1)
+        del lines[headers[position]:headers[position + 1]]
+    return kind, "".join(lines)
+
+
+def bench_language(module, path, language, steps, seed):
+    """Time update_file() on a cached tree against a from-scratch parse after each edit."""
+    rng = random.Random(f"{seed}-{language}")
+    with open(path, "r", encoding="utf-8") as f:
+        source = f.read()
+    analyzer = module.CodebaseAnalyzer(os.path.dirname(path))
+    incremental, full, mismatches, kinds = [], [], 0, {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer.update_file(path, source)
+        for step in range(steps):
+            kind, source = edit_source(rng, language, source, step)
+            kinds[kind] = kinds.get(kind, 0) + 1
+            start = time.perf_counter()
+            patched = analyzer.update_file(path, source)
+            incremental.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            expected = module.CodebaseAnalyzer(os.path.dirname(path), tree_cache_size=0).update_file(path, source)
+            full.append(time.perf_counter() - start)
+            if patched != expected:
+                mismatches += 1
+    result = {
+        "file_bytes": len(source.encode("utf-8")),
+        "edits": kinds,
+        "incremental_median": statistics.median(incremental),
+        "full_median": statistics.median(full),
+        "mismatches": mismatches,
+    }
+    print(f"{language}: {result['file_bytes']} bytes, incremental {result['incremental_median'] * 1000:.2f}ms, "
+          f"full {result['full_median'] * 1000:.2f}ms, {mismatches} mismatches", flush=True)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare incremental update_file() with full re-parses of large files.")
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--languages", nargs="+", default=LANGUAGES, choices=LANGUAGES)
+    parser.add_argument("--functions-per-file", type=int, default=400)
+    parser.add_argument("--steps", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    module = load_input_module()
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config = generate_repo(tmp_dir, languages=args.languages, files=1,
+                               functions_per_file=args.functions_per_file, seed=args.seed)
+        for language in args.languages:
+            for root, _, files in os.walk(os.path.join(tmp_dir, language)):
+                for file in files:
+                    if file != "__init__.py":
+                        results[language] = bench_language(module, os.path.join(root, file), language,
+                                                           args.steps, args.seed)
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": config,
+        "steps": args.steps,
+        "results": results,
+    }
+    output = args.output or os.path.join(
+        REPO_ROOT, "benchmarks", "results", f"incremental-{report['revision'] or 'unknown'}-{int(time.time())}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}", flush=True)
+    if any(r["mismatches"] for r in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import networkx as nx
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(REPO_ROOT)
+from benchmarks.run_benchmarks import git_revision
+from benchmarks.graph_metrics_benchmark import dependency_graph
+from src.parser.GraphLayout import cached_layout, cluster_by_package, render
+
+
+def _seconds(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time graph layouts, the layout cache and headless rendering.")
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[200, 2000, 10000])
+    parser.add_argument("--spring-max", type=int, default=2000, help="Largest graph to run nx.spring_layout on")
+    parser.add_argument("--max-nodes", type=int, default=200, help="Cluster size for the level-of-detail render")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_dir = os.path.join(tmp_dir, "layouts")
+        for size in args.sizes:
+            graph = dependency_graph(size, 3, size // 50, args.seed)
+            row = {"nodes": size, "edges": graph.number_of_edges()}
+            for layout in ("layered", "force"):
+                row[f"{layout}_seconds"], pos = _seconds(lambda: cached_layout(graph, layout, cache_dir))
+                row[f"{layout}_cached_seconds"], _ = _seconds(lambda: cached_layout(graph, layout, cache_dir))
+            row["spring_seconds"] = (_seconds(lambda: nx.spring_layout(graph, seed=42))[0]
+                                     if size <= args.spring_max else None)
+            for extension in ("png", "svg"):
+                row[f"render_{extension}_seconds"], _ = _seconds(
+                    lambda: render(graph, pos, os.path.join(tmp_dir, f"graph.{extension}")))
+            clustered, sizes = cluster_by_package(graph, args.max_nodes)
+            row["clusters"] = clustered.number_of_nodes()
+            row["lod_render_seconds"], _ = _seconds(lambda: render(
+                clustered, cached_layout(clustered, "layered", None), os.path.join(tmp_dir, "clustered.png"), sizes))
+            results.append(row)
+            spring = f"{row['spring_seconds']:.2f}s" if row["spring_seconds"] is not None else "skipped"
+            print(f"{size:6} nodes: layered {row['layered_seconds']:.2f}s, force {row['force_seconds']:.2f}s, "
+                  f"spring {spring}; cache hit {row['force_cached_seconds'] * 1000:.0f} ms; render png "
+                  f"{row['render_png_seconds']:.1f}s / svg {row['render_svg_seconds']:.1f}s; "
+                  f"{row['clusters']} clusters in {row['lod_render_seconds']:.1f}s", flush=True)
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": vars(args),
+        "results": results,
+    }
+    output = args.output or os.path.join(
+        REPO_ROOT, "benchmarks", "results", f"layout-{report['revision'] or 'unknown'}-{int(time.time())}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
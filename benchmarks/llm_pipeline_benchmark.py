@@ -0,0 +1,202 @@
+import os
+import io
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import importlib
+import contextlib
+import urllib.request
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(REPO_ROOT)
+from benchmarks.synthetic_repo import generate_repo
+from benchmarks.run_benchmarks import git_revision
+from src.codebase_summary.MockLLM import MockLLMConfig, start_in_thread
+from src.codebase_summary.RateLimiter import AdaptiveLimiter
+from src.codebase_summary.StreamingReduce import StreamingReducer
+from src.codebase_summary.MapScheduler import MapScheduler, centrality_scores, PRIORITIES
+from src.codebase_summary.Skeleton import SkeletonCompressor
+from src.codebase_summary.StaticSummary import StaticSummarizer
+
+P90_MIN_TRIALS = 20    # fewer runs than this report only median and max; p90 would just be the max
+
+def mock_stats(base_url):
+    with urllib.request.urlopen(f"{base_url}/stats", timeout=60) as response:
+        return json.loads(response.read())
+
+
+def run_gemini_pipeline(base_url, repo_dir, args, reduce="barrier"):
+    """Drive CodeBase_Sum_2_TEST_API's map-reduce pipeline against the mock."""
+    os.environ["GEMINI_API_BASE"] = base_url
+    summarizer = importlib.import_module("src.codebase_summary.CodeBase_Sum_2_TEST_API")
+    summarizer.LLM_API_BASE = base_url
+    summarizer.LIMITER = AdaptiveLimiter(initial=args.initial_window, max_window=args.max_window)
+    summarizer.COMPRESSOR = SkeletonCompressor(token_budget=args.skeleton_budget)
+    summarizer.STATIC = StaticSummarizer(max_lines=args.static_max_lines)
+    timings = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        code_files = summarizer.load_codebase_from_local(repo_dir)
+        start = time.perf_counter()
+        scores = centrality_scores(code_files, args.priority)
+        timings["scoring"] = time.perf_counter() - start
+        scheduler = MapScheduler(code_files, scores, deadline=args.deadline, token_budget=args.token_budget,
+                                 cost=summarizer.prompt_tokens)
+        if reduce == "streaming":
+            reducer = StreamingReducer(code_files, summarizer.generate_package_summary, chunk_size=args.chunk_size)
+            file_summaries = summarizer.summarize_files(
+                code_files, max_workers=args.max_workers, batch_tokens=args.batch_tokens, on_result=lambda path, _, summary: reducer.add(path, summary),
+                on_skip=lambda path: reducer.add(path, None), scheduler=scheduler)
+            timings["map"] = time.perf_counter() - start
+            reduce_summaries, unit = reducer.finish(), "package"
+        else:
+            file_summaries = summarizer.summarize_files(code_files, max_workers=args.max_workers, scheduler=scheduler,
+                                                        batch_tokens=args.batch_tokens)
+            timings["map"] = time.perf_counter() - start
+            reduce_summaries, unit = file_summaries, "file"
+        directory_tree = "\n".join(f"- {path}" for path in sorted(code_files))
+        reduce_start = time.perf_counter()
+        final_summary = summarizer.generate_final_summary(directory_tree, reduce_summaries, unit=unit)
+        timings["final_reduce"] = time.perf_counter() - reduce_start
+        timings["end_to_end"] = time.perf_counter() - start
+        start = time.perf_counter()
+        script = summarizer.generate_video_script(final_summary) if final_summary else None
+        timings["script"] = time.perf_counter() - start
+    windows = [window for _, window in summarizer.LIMITER.history]
+    # Share of total PageRank behind the summaries that made it; 1.0 when nothing was dropped.
+    pagerank = scores if args.priority == "pagerank" else centrality_scores(code_files, "pagerank")
+    coverage = sum(pagerank.get(path, 0.0) for path, _ in file_summaries) / (sum(pagerank.values()) or 1.0)
+    return {"files": len(code_files), "summarized": len(file_summaries), "final_summary": bool(final_summary),
+            "final_reduce_inputs": len(reduce_summaries),
+            "scheduler": scheduler.stats, "skeleton": summarizer.COMPRESSOR.report(),
+            "static": summarizer.STATIC.report(), "centrality_coverage": coverage, "script": bool(script), "seconds": timings,
+            "limiter": summarizer.LIMITER.metrics(), "window_peak": max(windows),
+            "window_mean": sum(windows) / len(windows)}
+
+
+def run_openrouter_pipeline(base_url, repo_dir, args, reduce=None):
+    """Drive CodeBase_Sum's single-prompt summary and script against the mock."""
+    os.environ["OPENROUTER_API_URL"] = f"{base_url}/api/v1/chat/completions"
+    summarizer = importlib.import_module("src.codebase_summary.CodeBase_Sum")
+    summarizer.LLM_API_URL = os.environ["OPENROUTER_API_URL"]
+    from src.downloader.Z_U_F import load_codebase
+    timings = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        code_files = load_codebase(repo_dir)
+        start = time.perf_counter()
+        summary, errors = summarizer.generate_summary(code_files)
+        timings["summary"] = time.perf_counter() - start
+        start = time.perf_counter()
+        script, errors = summarizer.generate_video_script(summary, errors)
+        timings["script"] = time.perf_counter() - start
+    return {"files": len(code_files), "errors": errors, "seconds": timings}
+
+
+PIPELINES = {"gemini": run_gemini_pipeline, "openrouter": run_openrouter_pipeline}
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def run_trial(args, reduce, seed):
+    """One pipeline run against a fresh mock, so every trial starts cold."""
+    config = MockLLMConfig(args.latency, args.tokens_per_second, args.output_tokens, args.rate_429,
+                           args.rate_5xx, args.retry_after, args.max_concurrency, seed,
+                           args.prompt_tokens_per_second)
+    server, base_url = start_in_thread(config)
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            generate_repo(tmp_dir, languages=["python"], files=args.files,
+                          functions_per_file=args.functions_per_file, seed=args.seed)
+            start = time.perf_counter()
+            result = PIPELINES[args.pipeline](base_url, tmp_dir, args, reduce)
+            result["wall_seconds"] = time.perf_counter() - start
+        result["mock"] = mock_stats(base_url)
+    finally:
+        server.shutdown()
+        server.server_close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the summarization pipelines against the local mock LLM.")
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--pipeline", choices=list(PIPELINES), default="gemini")
+    parser.add_argument("--reduce", choices=["barrier", "streaming", "both"], default="both",
+                        help="Reduce after the whole map, per package while it runs, or compare the two")
+    parser.add_argument("--trials", type=int, default=5, help="Runs per reduce mode, each with a new mock seed")
+    parser.add_argument("--chunk-size", type=int, default=20, help="Streaming reduce: summaries per partial")
+    parser.add_argument("--priority", choices=PRIORITIES, default="pagerank", help="Map order")
+    parser.add_argument("--deadline", type=float, default=None, help="Seconds after which no new file starts")
+    parser.add_argument("--token-budget", type=int, default=None, help="Estimated prompt tokens for the map")
+    parser.add_argument("--static-max-lines", type=int, default=80, help="0 sends every file to the LLM")
+    parser.add_argument("--batch-tokens", type=int, default=4000, help="0 sends one file per map request")
+    parser.add_argument("--skeleton-budget", type=int, default=1500, help="0 sends whole files")
+    parser.add_argument("--files", type=int, default=100)
+    parser.add_argument("--functions-per-file", type=int, default=8)
+    parser.add_argument("--max-workers", type=int, default=32, help="Threads for the map step")
+    parser.add_argument("--initial-window", type=float, default=2.0)
+    parser.add_argument("--max-window", type=float, default=32.0)
+    parser.add_argument("--latency", default="lognormal:-1.0,0.8")
+    parser.add_argument("--tokens-per-second", type=float, default=200.0)
+    parser.add_argument("--prompt-tokens-per-second", type=float, default=5000.0)
+    parser.add_argument("--output-tokens", type=int, default=200)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--rate-5xx", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--max-concurrency", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    modes = ["barrier", "streaming"] if args.reduce == "both" else [args.reduce]
+    if args.pipeline == "openrouter":
+        modes, args.trials = [None], 1
+    results = {}
+    for mode in modes:
+        trials = [run_trial(args, mode, args.seed + trial) for trial in range(args.trials)]
+        end_to_end = [t["seconds"].get("end_to_end", t["wall_seconds"]) for t in trials]
+        label = mode or args.pipeline
+        results[label] = {
+            "trials": trials,
+            "num_trials": len(trials),
+            "end_to_end_median": statistics.median(end_to_end),
+            "end_to_end_max": max(end_to_end),
+        }
+        tail = f"max {results[label]['end_to_end_max']:.2f}s"
+        # A tail percentile needs enough runs to differ from the max: p90 from 20 trials on.
+        if len(trials) >= P90_MIN_TRIALS:
+            results[label]["end_to_end_p90"] = _percentile(end_to_end, 0.90)
+            tail += f", p90 {results[label]['end_to_end_p90']:.2f}s"
+        last = trials[-1]
+        print(f"{label}: {last['files']} files, end-to-end median {results[label]['end_to_end_median']:.2f}s, "
+              f"{tail} over {len(trials)} trials; "
+              f"{last['mock']['requests']} LLM requests, {last['mock']['rate_limited']} rate limited", flush=True)
+        if "final_reduce_inputs" in last:
+            print(f"  final reduce over {last['final_reduce_inputs']} summaries took "
+                  f"{last['seconds']['final_reduce']:.2f}s; limiter peak window {last['window_peak']:.2f}", flush=True)
+            print(f"  {last['summarized']} files summarized, centrality coverage {last['centrality_coverage']:.1%}, "
+                  f"scheduler {last['scheduler']}", flush=True)
+            print(f"  skeleton {last['skeleton']}", flush=True)
+            print(f"  static {last['static']}", flush=True)
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": vars(args),
+        "results": results,
+    }
+    output = args.output or os.path.join(
+        REPO_ROOT, "benchmarks", "results", f"llm-{report['revision'] or 'unknown'}-{int(time.time())}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
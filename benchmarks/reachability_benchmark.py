@@ -0,0 +1,150 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import statistics
+import networkx as nx
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(REPO_ROOT)
+from benchmarks.synthetic_repo import generate_repo
+from benchmarks.run_benchmarks import git_revision
+from src.retriever.BM25Index import load_files
+from src.parser.Reachability import ReachabilityIndex, module_graph
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _timed(fn, items):
+    times, results = [], []
+    for item in items:
+        start = time.perf_counter()
+        results.append(fn(item))
+        times.append((time.perf_counter() - start) * 1000)
+    return {"p50_ms": statistics.median(times), "p99_ms": _percentile(times, 0.99)}, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare reachability-index impact queries with graph walks.")
+    parser.add_argument("path", nargs="?", default=None, help="Python codebase to use (default: a synthetic repo)")
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--files", type=int, default=3000, help="Synthetic Python files")
+    parser.add_argument("--functions-per-file", type=int, default=2)
+    parser.add_argument("--import-fanout", type=int, default=3)
+    parser.add_argument("--cycle-edges", type=int, default=30, help="Random back edges added to create import cycles")
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--updates", type=int, default=50, help="Single-edge changes to sync")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        directory = args.path
+        if directory is None:
+            directory = os.path.join(tmp_dir, "repo")
+            generate_repo(directory, languages=("python",), files=args.files, functions_per_file=args.functions_per_file,
+                          import_fanout=args.import_fanout, seed=args.seed)
+        code_files = {path: code for path, code in load_files(directory).items() if path.endswith(".py")}
+        graph = module_graph(code_files)
+    nodes = sorted(graph.nodes, key=str)
+    for _ in range(args.cycle_edges):
+        u, v = rng.sample(nodes, 2)
+        graph.add_edge(u, v)
+
+    start = time.perf_counter()
+    index = ReachabilityIndex(graph)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"{len(index)} modules, {graph.number_of_edges()} edges, {index.num_components} components; "
+          f"index built in {build_ms:.0f} ms, {index.bits.nbytes / 1e6:.2f} MB of bitsets", flush=True)
+
+    samples = [rng.choice(nodes) for _ in range(args.queries)]
+    pairs = [tuple(rng.sample(nodes, 2)) for _ in range(args.queries)]
+    queries = [
+        ("impact", samples, lambda node: set(index.descendants(node)), lambda node: nx.descendants(graph, node)),
+        ("depends", samples, lambda node: set(index.ancestors(node)), lambda node: nx.ancestors(graph, node)),
+        ("reaches", pairs, lambda pair: index.reaches(*pair), lambda pair: nx.has_path(graph, *pair)),
+    ]
+    results, mismatches = [], 0
+    for label, items, fast, slow in queries:
+        fast_stats, fast_results = _timed(fast, items)
+        slow_stats, slow_results = _timed(slow, items)
+        wrong = sum(a != b for a, b in zip(fast_results, slow_results))
+        mismatches += wrong
+        results.append({"query": label, "index": fast_stats, "networkx": slow_stats, "mismatches": wrong})
+        print(f"{label:8} index p50 {fast_stats['p50_ms']:.3f} ms / p99 {fast_stats['p99_ms']:.3f} ms vs "
+              f"graph walk p50 {slow_stats['p50_ms']:.3f} ms / p99 {slow_stats['p99_ms']:.3f} ms"
+              f"{'' if not wrong else f'  {wrong} MISMATCHES'}", flush=True)
+
+    # One edge added or removed per step, synced instead of rebuilt, checked against a fresh build.
+    sync_times, outcomes = [], {}
+    for step in range(args.updates):
+        if step % 2:
+            graph.remove_edge(*rng.choice(sorted(graph.edges, key=str)))
+        else:
+            u, v = rng.sample(nodes, 2)
+            graph.add_edge(u, v)
+        start = time.perf_counter()
+        outcome = index.sync(graph)
+        sync_times.append((time.perf_counter() - start) * 1000)
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+    # Node churn: an isolated module swapped for a new one keeps the node and edge counts, and
+    # new modules arrive with edges.
+    churn_correct = True
+    for step in range(args.updates // 5):
+        isolated = [node for node in graph if not graph.degree(node)]
+        graph.remove_node(rng.choice(isolated) if isolated and step % 2 else rng.choice(nodes))
+        graph.add_node(f"churn_{step}")
+        nodes = sorted(graph.nodes, key=str)
+        if step % 3 == 0:
+            graph.add_edge(rng.choice(nodes), f"churn_{step}")
+        outcome = index.sync(graph)
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+        try:        # checked now: a later removal forces a rebuild that would hide a missed node
+            churn_correct &= (set(index.ancestors(f"churn_{step}")) == nx.ancestors(graph, f"churn_{step}")
+                              and len(index) == len(graph))
+        except KeyError:
+            churn_correct = False
+    samples = [node if node in graph else rng.choice(nodes) for node in samples]
+    samples += [node for node in graph if str(node).startswith("churn_")]
+    fresh = ReachabilityIndex(graph)
+    sync_correct = churn_correct and len(index) == len(fresh) and all(
+        set(index.descendants(node)) == set(fresh.descendants(node))
+        and set(index.ancestors(node)) == set(fresh.ancestors(node)) for node in samples)
+    mismatches += not sync_correct
+    print(f"sync after one-edge changes and node churn {outcomes}: p50 {statistics.median(sync_times):.1f} ms vs "
+          f"{build_ms:.0f} ms build, {'correct' if sync_correct else 'MISMATCH'}", flush=True)
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": vars(args),
+        "modules": len(index),
+        "edges": graph.number_of_edges(),
+        "components": index.num_components,
+        "build_ms": build_ms,
+        "bitset_bytes": index.bits.nbytes,
+        "queries": results,
+        "sync_ms_p50": statistics.median(sync_times),
+        "sync_outcomes": outcomes,
+        "sync_correct": sync_correct,
+        "mismatches": mismatches,
+    }
+    output = args.output or os.path.join(
+        REPO_ROOT, "benchmarks", "results", f"reachability-{report['revision'] or 'unknown'}-{int(time.time())}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}", flush=True)
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
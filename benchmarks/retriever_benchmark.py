@@ -0,0 +1,191 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import statistics
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(REPO_ROOT)
+from benchmarks.synthetic_repo import generate_repo
+from benchmarks.run_benchmarks import git_revision
+from src.retriever.BM25Index import BM25Index, load_files
+from src.retriever.VectorIndex import VectorIndex
+from src.retriever.Chunking import tokenize
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def _directory_bytes(directory):
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+
+def make_queries(code_files, count, rng):
+    """(query, source path) pairs: two to four identifiers drawn from one file, like someone asking about it."""
+    paths = sorted(code_files)
+    queries = []
+    for _ in range(count):
+        path = rng.choice(paths)
+        words = sorted(set(tokenize(code_files[path])))
+        queries.append((" ".join(rng.sample(words, min(len(words), rng.randint(2, 4)))), path))
+    return queries
+
+
+def _recall(hit_lists, queries):
+    """Share of queries whose source file appears among their hits."""
+    return sum(any(hit["path"] == path for hit in hits) for hits, (_, path) in zip(hit_lists, queries)) / len(queries)
+
+
+def _edit_one_file(code_files, rng):
+    """Append an async function to one Python file; it should come back as a chunk of its own."""
+    path = rng.choice(sorted(p for p in code_files if p.endswith(".py")))
+    edited = dict(code_files)
+    edited[path] = code_files[path] + "\n\nasync def freshly_added_helper(value):\n    return await value\n"
+    return edited
+
+
+def bench_bm25(code_files, index_dir, queries, k, rng):
+    start = time.perf_counter()
+    index = BM25Index()
+    index.sync(code_files)
+    index.save(index_dir)
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = BM25Index.load(index_dir)
+    load_ms = (time.perf_counter() - start) * 1000
+    latencies, hit_lists = [], []
+    for query, _ in queries:
+        start = time.perf_counter()
+        hit_lists.append(index.search(query, k))
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    # Edit one file and check the incremental result against a from-scratch index.
+    edited = _edit_one_file(code_files, rng)
+    start = time.perf_counter()
+    changes = index.sync(edited)
+    update_ms = (time.perf_counter() - start) * 1000
+    fresh = BM25Index()
+    fresh.sync(edited)
+    checks = [q for q, _ in queries[:50]] + ["freshly added helper"]
+    mismatches = sum(index.search(q, k) != fresh.search(q, k) for q in checks)
+    top = (index.search("freshly added helper", 1) or [{}])[0]
+    return {
+        "files": len(code_files), "chunks": len(index), "terms": len(index.terms),
+        "build_seconds": build_seconds, "index_bytes": _directory_bytes(index_dir), "load_ms": load_ms,
+        "query_ms_p50": statistics.median(latencies), "query_ms_p99": _percentile(latencies, 0.99),
+        "recall_at_k": _recall(hit_lists, queries),
+        "update_ms": update_ms, "update": changes, "incremental_mismatches": mismatches,
+        "async_def_chunked": (top.get("kind"), top.get("name")) == ("function", "freshly_added_helper"),
+    }
+
+
+def bench_vector(code_files, index_dir, queries, k, rng, dim, shard_size, batch_size):
+    start = time.perf_counter()
+    index = VectorIndex(dim=dim, shard_size=shard_size)
+    index.sync(code_files)
+    index.save(index_dir)
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = VectorIndex.load(index_dir)
+    load_ms = (time.perf_counter() - start) * 1000
+    latencies, hit_lists = [], []
+    for query, _ in queries:
+        start = time.perf_counter()
+        hit_lists.append(index.search(query, k))
+        latencies.append((time.perf_counter() - start) * 1000)
+    texts = [q for q, _ in queries]
+    start = time.perf_counter()
+    batched = [hits for i in range(0, len(texts), batch_size) for hits in index.search_many(texts[i:i + batch_size], k)]
+    batched_qps = len(texts) / (time.perf_counter() - start)
+    # Matrix-matrix and matrix-vector products round differently in the last bits, so compare ranks only.
+    ranks = lambda hit_list: [[(hit["path"], hit["start"]) for hit in hits] for hits in hit_list]
+    batched_mismatches = sum(a != b for a, b in zip(ranks(batched), ranks(hit_lists)))
+
+    # The idf is frozen after the first sync, so the fresh index borrows it to be comparable.
+    edited = _edit_one_file(code_files, rng)
+    start = time.perf_counter()
+    changes = index.sync(edited)
+    index.save(index_dir)
+    update_ms = (time.perf_counter() - start) * 1000
+    fresh = VectorIndex(dim=dim, shard_size=shard_size)
+    fresh.idf = index.idf
+    fresh.sync(edited)
+    checks = texts[:50] + ["freshly added helper"]
+    mismatches = sum(a != b for a, b in zip(index.search_many(checks, k), fresh.search_many(checks, k)))
+    return {
+        "files": len(code_files), "chunks": len(index), "dim": dim, "shards": len(index.shards),
+        "build_seconds": build_seconds, "index_bytes": _directory_bytes(index_dir), "load_ms": load_ms,
+        "query_ms_p50": statistics.median(latencies), "query_ms_p99": _percentile(latencies, 0.99),
+        "batched_queries_per_second": batched_qps, "batched_mismatches": batched_mismatches,
+        "recall_at_k": _recall(hit_lists, queries),
+        "update_ms": update_ms, "update": changes, "incremental_mismatches": mismatches,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure retriever build time, index size and query latency.")
+    parser.add_argument("path", nargs="?", default=None, help="Directory to index (default: a synthetic repo)")
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--functions-per-file", type=int, default=12)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dim", type=int, default=512, help="Vector index embedding dimension")
+    parser.add_argument("--shard-size", type=int, default=5000, help="Vector index rows per shard")
+    parser.add_argument("--batch-size", type=int, default=32, help="Queries per VectorIndex.search_many call")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        directory = args.path
+        if directory is None:
+            directory = os.path.join(tmp_dir, "repo")
+            generate_repo(directory, languages=["python", "javascript"], files=args.files,
+                          functions_per_file=args.functions_per_file, seed=args.seed)
+        code_files = load_files(directory)
+        queries = make_queries(code_files, args.queries, rng)
+        results = {
+            "bm25": bench_bm25(code_files, os.path.join(tmp_dir, "bm25"), queries, args.k, random.Random(args.seed)),
+            "vector": bench_vector(code_files, os.path.join(tmp_dir, "vector"), queries, args.k,
+                                   random.Random(args.seed), args.dim, args.shard_size, args.batch_size),
+        }
+    for name, result in results.items():
+        print(f"{name}: {result['chunks']} chunks from {result['files']} files, built in "
+              f"{result['build_seconds']:.1f}s, {result['index_bytes'] / 1e6:.1f} MB, loads in {result['load_ms']:.0f} ms; "
+              f"query p50 {result['query_ms_p50']:.2f} ms, p99 {result['query_ms_p99']:.2f} ms; "
+              f"recall@{args.k} {result['recall_at_k']:.1%}; "
+              f"one-file update {result['update_ms']:.0f} ms, {result['incremental_mismatches']} mismatches", flush=True)
+        if "batched_queries_per_second" in result:
+            print(f"{name}: {result['shards']} shards of dim {result['dim']}; batches of {args.batch_size} run "
+                  f"{result['batched_queries_per_second']:.0f} queries/s, "
+                  f"{result['batched_mismatches']} rankings differ from single queries", flush=True)
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": vars(args),
+        "results": results,
+    }
+    output = args.output or os.path.join(
+        REPO_ROOT, "benchmarks", "results", f"retriever-{report['revision'] or 'unknown'}-{int(time.time())}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}", flush=True)
+    if not results["bm25"]["async_def_chunked"]:
+        print("bm25: the added async def is not a function chunk of its own", flush=True)
+    if any(r.get("incremental_mismatches") for r in results.values()) or not results["bm25"]["async_def_chunked"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
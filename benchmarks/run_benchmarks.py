@@ -0,0 +1,187 @@
+import os
+import sys
+import io
+import json
+import time
+import platform
+import argparse
+import tempfile
+import statistics
+import subprocess
+import contextlib
+import importlib.util
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(REPO_ROOT)
+from benchmarks.synthetic_repo import generate_repo
+
+INPUT_PY = os.path.join(REPO_ROOT, "src_2_for_self_training", "Input_&_Preprocess", "input.py")
+
+
+def load_input_module(path=INPUT_PY, name="seering_input"):
+    """Import the tree-sitter analyzer from input.py, whose directory is not a package."""
+    module_dir = os.path.dirname(INPUT_PY)
+    if module_dir not in sys.path:
+        sys.path.insert(0, module_dir)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    # Registered so the process pool can pickle references to module-level workers.
+    sys.modules[spec.name] = module
+    with contextlib.redirect_stdout(io.StringIO()):
+        spec.loader.exec_module(module)
+    return module
+
+
+def _bench_load_codebase(repo_dir):
+    from src.downloader.Z_U_F import load_codebase
+    return lambda: load_codebase(repo_dir)
+
+
+def _bench_codeline_analyze(repo_dir):
+    from src.parser.CodeBase_CodeLine import CodebaseAnalyzer
+    return lambda: CodebaseAnalyzer(repo_dir).analyze()
+
+
+def _bench_tokenparse_graph(repo_dir):
+    from src.parser.TokenParse import DependencyGraph
+    return lambda: DependencyGraph(repo_dir).build_dependency_graph()
+
+
+def _bench_treesitter_analyze(repo_dir):
+    module = load_input_module()
+    return lambda: module.CodebaseAnalyzer(repo_dir).analyze()
+
+
+def _bench_treesitter_analyze_pool(repo_dir):
+    module = load_input_module()
+    workers = min(4, os.cpu_count() or 1)
+    return lambda: module.CodebaseAnalyzer(repo_dir).analyze(workers=workers)
+
+
+TARGETS = {
+    "Z_U_F.load_codebase": _bench_load_codebase,
+    "CodeBase_CodeLine.CodebaseAnalyzer.analyze": _bench_codeline_analyze,
+    "TokenParse.DependencyGraph.build_dependency_graph": _bench_tokenparse_graph,
+    "input.CodebaseAnalyzer.analyze": _bench_treesitter_analyze,
+    "input.CodebaseAnalyzer.analyze[workers]": _bench_treesitter_analyze_pool,
+}
+
+
+def time_target(run, repeat, warmup=1):
+    """Time a zero-argument callable, discarding its (very chatty) stdout."""
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(warmup):
+            run()
+    for _ in range(repeat):
+        sink = io.StringIO()
+        with contextlib.redirect_stdout(sink):
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+        timings.append(elapsed)
+    return {
+        "runs": timings,
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "max": max(timings),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, stderr=subprocess.DEVNULL
+        ).decode("utf-8").strip()
+    except Exception:
+        return None
+
+
+def run_benchmarks(repo_dir, targets, repeat):
+    results = {}
+    for name in targets:
+        print(f"Benchmarking {name}...", flush=True)
+        try:
+            run = TARGETS[name](repo_dir)
+            results[name] = time_target(run, repeat)
+            print(f"  median: {results[name]['median']:.4f}s", flush=True)
+        except Exception as e:
+            print(f"  failed: {type(e).__name__}: {e}", flush=True)
+            results[name] = {"error": f"{type(e).__name__}: {e}"}
+    return results
+
+
+def compare_results(current, baseline, threshold):
+    """Return (name, ratio) pairs whose median slowed down by more than threshold."""
+    regressions = []
+    for name, result in current.get("results", {}).items():
+        base = baseline.get("results", {}).get(name)
+        if not base or "median" not in base or "median" not in result:
+            continue
+        ratio = result["median"] / base["median"] if base["median"] else float("inf")
+        print(f"{name}: {base['median']:.4f}s -> {result['median']:.4f}s ({ratio:.2f}x)", flush=True)
+        if ratio > threshold:
+            regressions.append((name, ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the codebase analyzers on a synthetic repo.")
+    parser.add_argument("--output", default=None, help="JSON file to write results to")
+    parser.add_argument("--repo", default=None, help="Benchmark an existing directory instead of a synthetic repo")
+    parser.add_argument("--targets", nargs="+", default=list(TARGETS), choices=list(TARGETS))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--languages", nargs="+", default=["python", "javascript", "java", "c"])
+    parser.add_argument("--files", type=int, default=50)
+    parser.add_argument("--functions-per-file", type=int, default=8)
+    parser.add_argument("--call-density", type=int, default=3)
+    parser.add_argument("--import-fanout", type=int, default=3)
+    parser.add_argument("--nesting-depth", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--compare", default=None, help="Previous results JSON to check for regressions")
+    parser.add_argument("--threshold", type=float, default=1.2, help="Allowed slowdown ratio before failing")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.repo:
+            repo_dir = args.repo
+            config = {"repo": os.path.abspath(args.repo)}
+        else:
+            repo_dir = tmp_dir
+            config = generate_repo(
+                tmp_dir, languages=args.languages, files=args.files,
+                functions_per_file=args.functions_per_file, call_density=args.call_density,
+                import_fanout=args.import_fanout, nesting_depth=args.nesting_depth, seed=args.seed
+            )
+            print(f"Generated {config['generated_files']} files ({config['generated_bytes']} bytes)", flush=True)
+        results = run_benchmarks(repo_dir, args.targets, args.repeat)
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "config": config,
+        "results": results,
+    }
+    output = args.output or os.path.join(
+        REPO_ROOT, "benchmarks", "results", f"bench-{report['revision'] or 'unknown'}-{int(time.time())}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}", flush=True)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_results(report, baseline, args.threshold)
+        if regressions:
+            for name, ratio in regressions:
+                print(f"Regression: {name} is {ratio:.2f}x slower than baseline", flush=True)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+import os
+import io
+import sys
+import json
+import time
+import zipfile
+import argparse
+import tempfile
+import threading
+import statistics
+import urllib.request
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(REPO_ROOT)
+from benchmarks.synthetic_repo import generate_repo
+from benchmarks.run_benchmarks import git_revision
+
+
+def post(url, body, content_type="application/json"):
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": content_type}, method="POST")
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=600) as response:
+            payload = json.loads(response.read())
+            status = response.status
+    except urllib.error.HTTPError as e:
+        payload, status = json.loads(e.read() or b"{}"), e.code
+    return status, payload, time.perf_counter() - start
+
+
+def get_stats(base_url):
+    with urllib.request.urlopen(f"{base_url}/stats", timeout=60) as response:
+        return json.loads(response.read())
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def burst(base_url, calls, concurrency):
+    """Fire (operation, body, content_type) calls concurrently and summarise latency and sources."""
+    before = get_stats(base_url)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        responses = list(pool.map(lambda call: post(f"{base_url}/{call[0]}", call[1], call[2]), calls))
+    elapsed = time.perf_counter() - start
+    after = get_stats(base_url)
+    latencies = [r[2] for r in responses]
+    sources = {}
+    for status, payload, _ in responses:
+        source = payload.get("source", f"http {status}")
+        sources[source] = sources.get(source, 0) + 1
+    return {
+        "requests": len(calls),
+        "concurrency": concurrency,
+        "seconds": elapsed,
+        "throughput_rps": len(calls) / elapsed if elapsed else None,
+        "p50": statistics.median(latencies),
+        "p95": _percentile(latencies, 0.95),
+        "p99": _percentile(latencies, 0.99),
+        "sources": sources,
+        "computed": after["computed"] - before["computed"],
+    }
+
+
+def zip_directory(directory):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for root, _, files in os.walk(directory):
+            for file in sorted(files):
+                path = os.path.join(root, file)
+                archive.write(path, os.path.relpath(path, directory))
+    return buffer.getvalue()
+
+
+def run_scenarios(base_url, repos, requests, concurrency):
+    body = lambda repo, params=None: json.dumps({"path": repo, "params": params or {}}).encode("utf-8")
+    results = {}
+    # Identical concurrent requests for a cold key should collapse into one computation.
+    results["cold_identical"] = burst(base_url, [("analyze", body(repos[0]), "application/json")] * concurrency,
+                                      concurrency)
+    results["warm_identical"] = burst(base_url, [("analyze", body(repos[0]), "application/json")] * requests,
+                                      concurrency)
+    mixed = [(op, body(repo), "application/json") for repo in repos for op in ("analyze", "ast_info", "graph")]
+    results["cold_mixed"] = burst(base_url, mixed * max(1, requests // len(mixed)), concurrency)
+    archive = zip_directory(repos[-1])
+    results["archive_upload"] = burst(base_url, [("graph", archive, "application/zip")] * concurrency, concurrency)
+    for name, result in results.items():
+        print(f"{name}: {result['requests']} requests, p50 {result['p50'] * 1000:.1f}ms, "
+              f"p99 {result['p99'] * 1000:.1f}ms, {result['computed']} computed, sources {result['sources']}", flush=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the analysis server on localhost.")
+    parser.add_argument("--url", default=None, help="Test a running server instead of starting one in-process")
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--repos", type=int, default=3, help="Distinct synthetic repos to request")
+    parser.add_argument("--files", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        repos = []
+        for index in range(args.repos):
+            repo = os.path.join(tmp_dir, f"repo_{index}")
+            generate_repo(repo, languages=["python"], files=args.files, seed=index)
+            repos.append(repo)
+        server = None
+        base_url = args.url
+        if base_url is None:
+            from src.codebase_summary.AnalysisServer import make_server
+            server = make_server(port=0, workers=args.workers, cache_dir=os.path.join(tmp_dir, "cache"))
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            results = run_scenarios(base_url.rstrip("/"), repos, args.requests, args.concurrency)
+        finally:
+            if server is not None:
+                server.shutdown()
+                server.server_close()
+                server.service.close()
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": {"repos": args.repos, "files": args.files, "requests": args.requests,
+                   "concurrency": args.concurrency, "workers": args.workers},
+        "results": results,
+    }
+    output = args.output or os.path.join(
+        REPO_ROOT, "benchmarks", "results", f"server-{report['revision'] or 'unknown'}-{int(time.time())}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
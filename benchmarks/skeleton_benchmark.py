@@ -0,0 +1,73 @@
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(REPO_ROOT)
+from benchmarks.synthetic_repo import generate_repo
+from benchmarks.run_benchmarks import git_revision
+from src.codebase_summary.CodeBase_Sum_2_TEST_API import load_codebase_from_local
+from src.codebase_summary.Skeleton import SkeletonCompressor
+
+
+def bench_directory(directory, budget):
+    """Compress every file under directory; per-file stats, totals and time spent compressing."""
+    code_files = load_codebase_from_local(directory)
+    compressor = SkeletonCompressor(token_budget=budget)
+    start = time.perf_counter()
+    for path, content in code_files.items():
+        compressor.compress(path, content)
+    seconds = time.perf_counter() - start
+    return {"files": compressor.stats, "total": compressor.report(), "compress_ms_per_file":
+            seconds * 1000 / max(1, len(code_files))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report skeleton compression ratios and token savings per file.")
+    parser.add_argument("path", nargs="?", default=None, help="Directory to compress (default: a synthetic repo)")
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--budgets", nargs="+", type=int, default=[500, 1500, 4000])
+    parser.add_argument("--files", type=int, default=40)
+    parser.add_argument("--functions-per-file", type=int, default=60)
+    parser.add_argument("--top", type=int, default=10, help="Largest files to list per budget")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        directory = args.path
+        if directory is None:
+            directory = tmp_dir
+            generate_repo(tmp_dir, languages=["python"], files=args.files,
+                          functions_per_file=args.functions_per_file, seed=args.seed)
+        for budget in args.budgets:
+            result = results[budget] = bench_directory(directory, budget)
+            total = result["total"]
+            print(f"budget {budget}: {total['compressed']}/{total['files']} files compressed, "
+                  f"{total['original_tokens']} -> {total['tokens']} tokens ({total['ratio']}x), "
+                  f"{result['compress_ms_per_file']:.1f} ms/file", flush=True)
+            largest = sorted(result["files"].items(), key=lambda item: -item[1]["original_tokens"])[:args.top]
+            for path, stats in largest:
+                print(f"  {path}: {stats['original_tokens']} -> {stats['tokens']} tokens ({stats['ratio']}x, "
+                      f"{stats['elided_bodies']} bodies elided)", flush=True)
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": vars(args),
+        "results": results,
+    }
+    output = args.output or os.path.join(
+        REPO_ROOT, "benchmarks", "results", f"skeleton-{report['revision'] or 'unknown'}-{int(time.time())}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
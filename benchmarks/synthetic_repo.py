@@ -0,0 +1,249 @@
+import os
+import random
+import argparse
+
+
+LANGUAGE_EXTS = {
+    "python": ".py",
+    "javascript": ".js",
+    "java": ".java",
+    "c": ".c",
+}
+
+
+def _module_name(index):
+    return f"mod_{index}"
+
+
+def _package_name(index, files_per_package):
+    return f"pkg_{index // files_per_package}"
+
+
+def _function_name(module_index, func_index):
+    return f"func_{module_index}_{func_index}"
+
+
+def _pick_callees(rng, module_index, imported, functions_per_file, call_density):
+    """Pick call targets from the module itself and the modules it imports."""
+    candidates = [module_index] + imported
+    calls = []
+    for _ in range(call_density):
+        target = rng.choice(candidates)
+        calls.append((target, rng.randrange(functions_per_file)))
+    return calls
+
+
+def _python_file(rng, index, imported, config, files_per_package):
+    lines = ["import os", "import json"]
+    for target in imported:
+        pkg = _package_name(target, files_per_package)
+        names = ", ".join(_function_name(target, f) for f in range(config["functions_per_file"]))
+        lines.append(f"from {pkg}.{_module_name(target)} import {names}")
+    lines.append("")
+    lines.append(f"CONSTANTS_{index} = {{'name': '{_module_name(index)}', 'values': [1, 2, 3]}}")
+    lines.append("")
+    for func_index in range(config["functions_per_file"]):
+        name = _function_name(index, func_index)
+        lines.append(f"def {name}(a, b=None):")
+        lines.append(f'    """Synthetic function {name}."""')
+        lines.append("    # accumulate a running total")
+        lines.append("    total = 0")
+        indent = "    "
+        for depth in range(config["nesting_depth"]):
+            lines.append(f"{indent}for i_{depth} in range(a):")
+            indent += "    "
+            lines.append(f"{indent}if i_{depth} % 2 == 0:")
+            indent += "    "
+        for target, callee in _pick_callees(rng, index, imported, config["functions_per_file"], config["call_density"]):
+            callee_name = _function_name(target, callee)
+            if callee_name == name:
+                lines.append(f"{indent}total += len(str(b))")
+            else:
+                lines.append(f"{indent}total += {callee_name}(0) or 0")
+        lines.append("    return total")
+        lines.append("")
+    lines.append(f"class Model_{index}:")
+    lines.append(f'    """Synthetic class in {_module_name(index)}."""')
+    lines.append("    def __init__(self, items=None):")
+    lines.append("        self.items = items or []")
+    lines.append("    def __len__(self):")
+    lines.append("        return len(self.items)")
+    lines.append("    def run(self):")
+    lines.append(f"        return {_function_name(index, 0)}(len(self.items))")
+    lines.append("")
+    return "\n".join(lines)
+
+
+def _javascript_file(rng, index, imported, config, files_per_package):
+    lines = []
+    for target in imported:
+        names = ", ".join(_function_name(target, f) for f in range(config["functions_per_file"]))
+        path = f"../{_package_name(target, files_per_package)}/{_module_name(target)}.js"
+        lines.append(f"import {{ {names} }} from '{path}';")
+    lines.append("")
+    exported = []
+    for func_index in range(config["functions_per_file"]):
+        name = _function_name(index, func_index)
+        exported.append(name)
+        lines.append(f"// {name} adds up synthetic values")
+        lines.append(f"function {name}(a, b) {{")
+        lines.append("  let total = 0;")
+        indent = "  "
+        for depth in range(config["nesting_depth"]):
+            lines.append(f"{indent}for (let i{depth} = 0; i{depth} < a; i{depth}++) {{")
+            indent += "  "
+        for target, callee in _pick_callees(rng, index, imported, config["functions_per_file"], config["call_density"]):
+            callee_name = _function_name(target, callee)
+            if callee_name == name:
+                lines.append(f"{indent}total += String(b).length;")
+            else:
+                lines.append(f"{indent}total += {callee_name}(0, 'x');")
+        for depth in reversed(range(config["nesting_depth"])):
+            indent = "  " * (depth + 1)
+            lines.append(f"{indent}}}")
+        lines.append("  return total;")
+        lines.append("}")
+        lines.append("")
+    lines.append(f"class Model{index} {{")
+    lines.append("  constructor(items) { this.items = items || []; }")
+    lines.append(f"  run() {{ return {_function_name(index, 0)}(this.items.length, null); }}")
+    lines.append("}")
+    lines.append("")
+    lines.append(f"export {{ {', '.join(exported)}, Model{index} }};")
+    return "\n".join(lines)
+
+
+def _java_file(rng, index, imported, config, files_per_package):
+    pkg = _package_name(index, files_per_package)
+    class_name = f"Mod{index}"
+    lines = [f"package {pkg};", "", "import java.util.List;", "import java.util.ArrayList;"]
+    for target in imported:
+        lines.append(f"import {_package_name(target, files_per_package)}.Mod{target};")
+    lines.append("")
+    lines.append(f"public class {class_name} {{")
+    for func_index in range(config["functions_per_file"]):
+        name = _function_name(index, func_index)
+        lines.append(f"    // {name} adds up synthetic values")
+        lines.append(f"    public static int {name}(int a, String b) {{")
+        lines.append("        int total = 0;")
+        indent = "        "
+        for depth in range(config["nesting_depth"]):
+            lines.append(f"{indent}for (int i{depth} = 0; i{depth} < a; i{depth}++) {{")
+            indent += "    "
+        for target, callee in _pick_callees(rng, index, imported, config["functions_per_file"], config["call_density"]):
+            callee_name = _function_name(target, callee)
+            if callee_name == name:
+                lines.append(f"{indent}total += String.valueOf(b).length();")
+            elif target == index:
+                lines.append(f"{indent}total += {callee_name}(0, \"x\");")
+            else:
+                lines.append(f"{indent}total += Mod{target}.{callee_name}(0, \"x\");")
+        for depth in reversed(range(config["nesting_depth"])):
+            lines.append("        " + "    " * depth + "}")
+        lines.append("        return total;")
+        lines.append("    }")
+        lines.append("")
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def _c_file(rng, index, imported, config, files_per_package):
+    lines = ["#include <stdio.h>", "#include <string.h>"]
+    for target in imported:
+        lines.append(f"#include \"../{_package_name(target, files_per_package)}/{_module_name(target)}.h\"")
+    lines.append("")
+    for func_index in range(config["functions_per_file"]):
+        name = _function_name(index, func_index)
+        lines.append(f"/* {name} adds up synthetic values */")
+        lines.append(f"int {name}(int a, const char *b) {{")
+        lines.append("    int total = 0;")
+        indent = "    "
+        for depth in range(config["nesting_depth"]):
+            lines.append(f"{indent}for (int i{depth} = 0; i{depth} < a; i{depth}++) {{")
+            indent += "    "
+        for target, callee in _pick_callees(rng, index, imported, config["functions_per_file"], config["call_density"]):
+            callee_name = _function_name(target, callee)
+            if callee_name == name:
+                lines.append(f"{indent}total += (int)strlen(b);")
+            else:
+                lines.append(f"{indent}total += {callee_name}(0, \"x\");")
+        for depth in reversed(range(config["nesting_depth"])):
+            lines.append("    " + "    " * depth + "}")
+        lines.append("    return total;")
+        lines.append("}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+GENERATORS = {
+    "python": _python_file,
+    "javascript": _javascript_file,
+    "java": _java_file,
+    "c": _c_file,
+}
+
+
+def generate_repo(out_dir, languages=("python", "javascript", "java", "c"), files=50,
+                  functions_per_file=8, call_density=3, import_fanout=3,
+                  nesting_depth=1, files_per_package=10, seed=0):
+    """Write a synthetic multi-language codebase to out_dir and return its config."""
+    config = {
+        "languages": list(languages),
+        "files": files,
+        "functions_per_file": functions_per_file,
+        "call_density": call_density,
+        "import_fanout": import_fanout,
+        "nesting_depth": nesting_depth,
+        "files_per_package": files_per_package,
+        "seed": seed,
+    }
+    total_bytes = 0
+    total_files = 0
+    for language in languages:
+        if language not in GENERATORS:
+            raise ValueError(f"Unsupported language: {language}. Use one of {sorted(GENERATORS)}.")
+        rng = random.Random(f"{seed}-{language}")
+        root = os.path.join(out_dir, language)
+        for index in range(files):
+            # Only import earlier modules so the generated graph stays acyclic per language.
+            fanout = min(import_fanout, index)
+            imported = sorted(rng.sample(range(index), fanout)) if fanout else []
+            code = GENERATORS[language](rng, index, imported, config, files_per_package)
+            pkg_dir = os.path.join(root, _package_name(index, files_per_package))
+            os.makedirs(pkg_dir, exist_ok=True)
+            if language == "python":
+                init_path = os.path.join(pkg_dir, "__init__.py")
+                if not os.path.exists(init_path):
+                    with open(init_path, "w", encoding="utf-8") as f:
+                        f.write(f'"""Synthetic package {_package_name(index, files_per_package)}."""\n')
+            file_name = (f"Mod{index}" if language == "java" else _module_name(index)) + LANGUAGE_EXTS[language]
+            with open(os.path.join(pkg_dir, file_name), "w", encoding="utf-8") as f:
+                f.write(code)
+            total_bytes += len(code)
+            total_files += 1
+    config["generated_files"] = total_files
+    config["generated_bytes"] = total_bytes
+    return config
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic codebase for benchmarking.")
+    parser.add_argument("out_dir")
+    parser.add_argument("--languages", nargs="+", default=list(GENERATORS))
+    parser.add_argument("--files", type=int, default=50)
+    parser.add_argument("--functions-per-file", type=int, default=8)
+    parser.add_argument("--call-density", type=int, default=3)
+    parser.add_argument("--import-fanout", type=int, default=3)
+    parser.add_argument("--nesting-depth", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    config = generate_repo(
+        args.out_dir, languages=args.languages, files=args.files,
+        functions_per_file=args.functions_per_file, call_density=args.call_density,
+        import_fanout=args.import_fanout, nesting_depth=args.nesting_depth, seed=args.seed
+    )
+    print(f"Generated {config['generated_files']} files ({config['generated_bytes']} bytes) in {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
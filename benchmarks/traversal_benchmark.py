@@ -0,0 +1,133 @@
+import os
+import io
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+import contextlib
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(REPO_ROOT)
+from benchmarks.synthetic_repo import generate_repo
+from benchmarks.run_benchmarks import INPUT_PY, load_input_module, time_target, git_revision
+
+
+def recursive_walk(node):
+    """The traversal shape input.py used before the TreeCursor walker."""
+    count = 1
+    for child in node.children:
+        count += recursive_walk(child)
+    return count
+
+
+def cursor_walk(tree):
+    cursor = tree.walk()
+    count = 0
+    while True:
+        count += 1
+        if cursor.goto_first_child():
+            continue
+        while not cursor.goto_next_sibling():
+            if not cursor.goto_parent():
+                return count
+
+
+def _time_walk(walk, target, repeat):
+    try:
+        return time_target(lambda: walk(target), repeat, warmup=0)
+    except RecursionError as e:
+        return {"error": f"RecursionError: {e}"}
+
+
+def bench_traversal(repo_dir, repeat):
+    """Time raw tree traversal on the largest generated file of each language."""
+    from tree_sitter_language_pack import get_parser
+    largest = {}
+    for root, _, files in os.walk(repo_dir):
+        for file in files:
+            language = {".py": "python", ".js": "javascript", ".c": "c", ".java": "java"}.get(os.path.splitext(file)[1])
+            if not language:
+                continue
+            path = os.path.join(root, file)
+            if language not in largest or os.path.getsize(path) > os.path.getsize(largest[language]):
+                largest[language] = path
+    results = {}
+    for language, path in sorted(largest.items()):
+        with open(path, "rb") as f:
+            source = f.read()
+        tree = get_parser(language).parse(source)
+        results[language] = {
+            "file_bytes": len(source),
+            "nodes": cursor_walk(tree),
+            "recursive": _time_walk(recursive_walk, tree.root_node, repeat),
+            "cursor": _time_walk(cursor_walk, tree, repeat),
+        }
+        print(f"{language}: {results[language]['nodes']} nodes", flush=True)
+    return results
+
+
+def _count_parse_errors(module, repo_dir):
+    analyzer = module.CodebaseAnalyzer(repo_dir)
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = analyzer.analyze()
+    return sum(1 for info in result["ast"].values() if info.get("error"))
+
+
+def bench_analyzer(repo_dir, repeat, baseline_rev):
+    """Time the full tree-sitter analyze() for this tree and, optionally, an older revision."""
+    modules = {"current": load_input_module()}
+    if baseline_rev:
+        source = subprocess.check_output(
+            ["git", "show", f"{baseline_rev}:{os.path.relpath(INPUT_PY, REPO_ROOT)}"], cwd=REPO_ROOT
+        )
+        baseline_path = os.path.join(tempfile.mkdtemp(), "input_baseline.py")
+        with open(baseline_path, "wb") as f:
+            f.write(source)
+        modules[baseline_rev] = load_input_module(baseline_path, "seering_input_baseline")
+    results = {}
+    for label, module in modules.items():
+        results[label] = time_target(lambda: module.CodebaseAnalyzer(repo_dir).analyze(), repeat)
+        results[label]["parse_errors"] = _count_parse_errors(module, repo_dir)
+        print(f"analyze[{label}]: median {results[label]['median']:.4f}s, "
+              f"{results[label]['parse_errors']} parse errors", flush=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare recursive and TreeCursor traversal on large files.")
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--files", type=int, default=4)
+    parser.add_argument("--functions-per-file", type=int, default=40)
+    parser.add_argument("--nesting-depth", type=int, default=150)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline-rev", default=None, help="git revision of input.py to compare analyze() against")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config = generate_repo(
+            tmp_dir, languages=["python", "javascript", "c"], files=args.files,
+            functions_per_file=args.functions_per_file, nesting_depth=args.nesting_depth
+        )
+        print(f"Generated {config['generated_files']} files ({config['generated_bytes']} bytes)", flush=True)
+        report = {
+            "revision": git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "config": config,
+            "recursion_limit": sys.getrecursionlimit(),
+            "traversal": bench_traversal(tmp_dir, args.repeat),
+            "analyze": bench_analyzer(tmp_dir, args.repeat, args.baseline_rev),
+        }
+
+    output = args.output or os.path.join(
+        REPO_ROOT, "benchmarks", "results", f"traversal-{report['revision'] or 'unknown'}-{int(time.time())}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import statistics
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(REPO_ROOT)
+from benchmarks.synthetic_repo import generate_repo
+from benchmarks.run_benchmarks import git_revision
+from src.retriever.BM25Index import load_files
+from src.retriever.TrigramIndex import TrigramIndex
+
+# (pattern, literal, ignore_case), chosen for the synthetic repo: rare and common literals,
+# regexes with and without usable trigrams, and a case-insensitive query.
+DEFAULT_QUERIES = [
+    ("func_1234_7", True, False),
+    ("class Model_42:", True, False),
+    (r"func_12\d\d_3\(", False, False),
+    (r"(?i)MOD15\d\d\b", False, False),
+    (r"#include \"\.\./pkg_3\d/mod_3\d\d\.h\"", False, False),
+    (r"Model(_17|17)\b", False, False),
+    (r"total \+= len\(str\(b\)\)", False, False),
+    ("synthetic", True, True),
+    (r"\bi\d+\+\+", False, False),
+]
+
+
+def full_scan(code_files, pattern, literal=False, ignore_case=False):
+    """What a tool without an index does: run the regex over every file and count newlines for line numbers."""
+    regex = re.compile(re.escape(pattern) if literal else pattern, re.MULTILINE | (re.IGNORECASE if ignore_case else 0))
+    hits = []
+    for path in sorted(code_files):
+        text, pos = code_files[path], 0
+        while pos <= len(text):
+            match = regex.search(text, pos)
+            if match is None:
+                break
+            line_start = text.rfind("\n", 0, match.start()) + 1
+            line_end = text.find("\n", match.start())
+            line_end = len(text) if line_end < 0 else line_end
+            hits.append({"path": path, "line": text.count("\n", 0, match.start()) + 1,
+                         "column": match.start() - line_start, "text": text[line_start:line_end].rstrip("\r")})
+            pos = line_end + 1
+    return hits
+
+
+def _timed(fn, repeats):
+    times, result = [], None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare trigram-indexed regex search with a full scan.")
+    parser.add_argument("path", nargs="?", default=None, help="Directory to index (default: a synthetic repo)")
+    parser.add_argument("--output", default=None)
+    parser.add_argument("--files", type=int, default=1800, help="Synthetic files per language (4 languages)")
+    parser.add_argument("--functions-per-file", type=int, default=12)
+    parser.add_argument("--query", action="append", default=None, help="Regex to time (repeatable; default: a built-in mix)")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    queries = [(q, False, False) for q in args.query] if args.query else DEFAULT_QUERIES
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        directory = args.path
+        if directory is None:
+            directory = os.path.join(tmp_dir, "repo")
+            generate_repo(directory, files=args.files, functions_per_file=args.functions_per_file, seed=args.seed)
+        code_files = load_files(directory)
+        total_lines = sum(code.count("\n") + 1 for code in code_files.values())
+        print(f"{len(code_files)} files, {total_lines} lines, {sum(map(len, code_files.values())) / 1e6:.1f} MB", flush=True)
+
+        index_dir = os.path.join(tmp_dir, "trigram")
+        start = time.perf_counter()
+        index = TrigramIndex()
+        index.sync(code_files)
+        index.save(index_dir)
+        build_seconds = time.perf_counter() - start
+        index_bytes = sum(os.path.getsize(os.path.join(index_dir, name)) for name in os.listdir(index_dir))
+        start = time.perf_counter()
+        index = TrigramIndex.load(index_dir)
+        load_ms = (time.perf_counter() - start) * 1000
+        print(f"built in {build_seconds:.1f}s, {index_bytes / 1e6:.1f} MB on disk "
+              f"({len(index.grams)} trigrams), loads in {load_ms:.0f} ms", flush=True)
+
+        results = []
+        for pattern, literal, ignore_case in queries:
+            index_ms, hits = _timed(lambda: index.search(pattern, literal, ignore_case, max_results=10 ** 9), args.repeats)
+            scan_ms, expected = _timed(lambda: full_scan(code_files, pattern, literal, ignore_case), args.repeats)
+            candidates = len(index.candidates(pattern, literal, ignore_case))
+            results.append({"pattern": pattern, "literal": literal, "ignore_case": ignore_case,
+                            "matches": len(hits), "candidate_files": candidates, "index_ms": index_ms,
+                            "scan_ms": scan_ms, "speedup": scan_ms / max(index_ms, 1e-6), "correct": hits == expected})
+            print(f"{pattern!r:45} {len(hits):6} matches in {candidates:5}/{len(code_files)} files: "
+                  f"{index_ms:8.2f} ms indexed vs {scan_ms:8.1f} ms scan ({scan_ms / max(index_ms, 1e-6):.0f}x)"
+                  f"{'' if hits == expected else '  MISMATCH'}", flush=True)
+
+        # Edit one file, sync, and check the edit is searchable without a rebuild.
+        path = random.Random(args.seed).choice(sorted(code_files))
+        edited = dict(code_files)
+        edited[path] = code_files[path] + "\nfreshly_added_marker = 1\n"
+        start = time.perf_counter()
+        changes = index.sync(edited)
+        update_ms = (time.perf_counter() - start) * 1000
+        update_correct = index.search("freshly_added_marker", literal=True) == full_scan(edited, "freshly_added_marker", True)
+        print(f"one-file update {changes}: {update_ms:.1f} ms, {'correct' if update_correct else 'MISMATCH'}", flush=True)
+
+    index_times = [r["index_ms"] for r in results]
+    report = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "config": vars(args),
+        "files": len(code_files),
+        "lines": total_lines,
+        "build_seconds": build_seconds,
+        "index_bytes": index_bytes,
+        "load_ms": load_ms,
+        "queries": results,
+        "index_ms_p50": statistics.median(index_times),
+        "scan_ms_p50": statistics.median(r["scan_ms"] for r in results),
+        "update_ms": update_ms,
+        "update_correct": update_correct,
+    }
+    output = args.output or os.path.join(
+        REPO_ROOT, "benchmarks", "results", f"trigram-{report['revision'] or 'unknown'}-{int(time.time())}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}", flush=True)
+    if not update_correct or not all(r["correct"] for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
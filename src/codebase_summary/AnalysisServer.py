@@ -0,0 +1,324 @@
+import os
+import io
+import sys
+import json
+import time
+import shutil
+import hashlib
+import zipfile
+import argparse
+import tempfile
+import threading
+import contextlib
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+OPERATIONS = ("analyze", "ast_info", "graph", "summary")
+IGNORED_DIRS = {".git", ".hg", ".svn", "__pycache__", "node_modules", ".venv", "venv"}
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "seering-cache")
+MAX_ARCHIVE_BYTES = 200 * 1024 * 1024
+MAX_UNPACKED_BYTES = 1024 * 1024 * 1024    # zip uploads are checked against these before extracting
+MAX_ARCHIVE_MEMBERS = 100000
+
+
+def _to_json(value):
+    if isinstance(value, set):
+        return sorted(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _relative(mapping, root):
+    """Key results by repo-relative path so identical content yields identical output."""
+    return {os.path.relpath(path, root).replace(os.sep, "/"): value for path, value in mapping.items()}
+
+
+def _warm_worker():
+    """Import what the jobs use once per worker so the first request does not pay for it.
+
+    The analyzers defer networkx, NumPy and SciPy to first use, so those are imported here by
+    name; benchmarks/import_time.py fails if a job still imports anything after this.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        import networkx  # noqa: F401
+        import src.parser.CodeBase_CodeLine  # noqa: F401
+        import src.parser.CallGraph  # noqa: F401
+        import src.parser.GraphMetrics  # noqa: F401
+        import src.parser.GraphExport  # noqa: F401
+        import src.downloader.Z_U_F  # noqa: F401
+        import src.codebase_summary.CodeBase_Sum  # noqa: F401
+
+
+def _run_job(operation, directory, params):
+    """Run one operation over a directory in a pool worker.
+
+    Returns the result as encoded JSON, which is what the cache stores and the server sends,
+    and whether it is worth caching.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        if operation == "summary":
+            from src.downloader.Z_U_F import load_codebase
+            from src.codebase_summary.CodeBase_Sum import generate_summary
+            summary, errors = generate_summary(_relative(load_codebase(directory), directory))
+            # LLM failures are usually transient; let the next request retry.
+            return json.dumps({"summary": summary, "errors": errors}).encode("utf-8"), not summary.startswith("Error")
+        else:
+            from src.parser.CodeBase_CodeLine import CodebaseAnalyzer
+            analyzer = CodebaseAnalyzer(directory)
+            analysis = analyzer.analyze(sort_by=params.get("sort_by", "function_calls"))
+            if operation == "analyze":
+                result = {"directory": analysis["directory"], "ast": _relative(analysis["ast"], directory),
+                          "graph": analysis["graph"], "metrics": analysis["metrics"]}
+            elif operation == "ast_info":
+                result = _relative(analyzer.get_ast_info(
+                    mode=int(params.get("mode", 0)), num_files=int(params.get("num_files", 5)),
+                    criteria=params.get("criteria", "function_calls")), directory)
+            else:
+                # Optional "package" and "center" (+ "hops") params cut the graph down for Graphviz and UIs.
+                from src.parser.GraphExport import khop_subgraph, package_subgraph, to_dot
+                graph = analyzer.graph
+                if params.get("package"):
+                    graph = package_subgraph(graph, params["package"])
+                if params.get("center"):
+                    graph = khop_subgraph(graph, params["center"], int(params.get("hops", 2)))
+                result = {"dot": to_dot(graph), "nodes": sorted(graph.nodes),
+                          "edges": sorted(graph.edges), "metrics": analysis["metrics"]}
+    return json.dumps(result, default=_to_json).encode("utf-8"), True
+
+
+def content_hash(directory):
+    """SHA-256 over every file's relative path and bytes, in a stable order."""
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(d for d in dirs if d not in IGNORED_DIRS)
+        for file in sorted(files):
+            path = os.path.join(root, file)
+            digest.update(os.path.relpath(path, directory).replace(os.sep, "/").encode("utf-8") + b"\0")
+            with open(path, "rb") as f:
+                for block in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(block)
+            digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class AnalysisService:
+    """Warm worker pool behind a content-hash result cache with single-flight coalescing."""
+
+    def __init__(self, workers=2, cache_dir=DEFAULT_CACHE_DIR, memory_entries=256, allowed_roots=None):
+        self.cache_dir = cache_dir
+        self.memory_entries = memory_entries
+        self.allowed_roots = [os.path.abspath(r) for r in allowed_roots or []]
+        os.makedirs(os.path.join(cache_dir, "results"), exist_ok=True)
+        os.makedirs(os.path.join(cache_dir, "trees"), exist_ok=True)
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker)
+        self.lock = threading.Lock()
+        self.memory = OrderedDict()
+        self.inflight = {}
+        self.stats = {"requests": 0, "memory_hits": 0, "disk_hits": 0, "coalesced": 0, "computed": 0, "errors": 0}
+
+    def __count(self, name):
+        with self.lock:
+            self.stats[name] += 1
+
+    def resolve_path(self, path):
+        path = os.path.abspath(path)
+        if not os.path.isdir(path):
+            raise FileNotFoundError(f"Not a directory: {path}")
+        if self.allowed_roots and not any(os.path.commonpath([path, root]) == root for root in self.allowed_roots):
+            raise PermissionError(f"Path is outside the allowed roots: {path}")
+        return path
+
+    def store_archive(self, data):
+        """Unpack a zip upload under trees/<content hash>, reusing an earlier identical upload."""
+        tmp_dir = tempfile.mkdtemp(dir=os.path.join(self.cache_dir, "trees"))
+        try:
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                members = archive.infolist()
+                # Extraction stops each member at its declared file_size, so these bound the disk used.
+                if len(members) > MAX_ARCHIVE_MEMBERS:
+                    raise ValueError(f"Archive has {len(members)} members; the limit is {MAX_ARCHIVE_MEMBERS}")
+                unpacked = sum(member.file_size for member in members)
+                if unpacked > MAX_UNPACKED_BYTES:
+                    raise ValueError(f"Archive unpacks to {unpacked} bytes; the limit is {MAX_UNPACKED_BYTES}")
+                archive.extractall(tmp_dir)
+            digest = content_hash(tmp_dir)
+            target = os.path.join(self.cache_dir, "trees", digest)
+            try:
+                os.replace(tmp_dir, target)
+            except OSError:
+                # Already unpacked, possibly by a concurrent upload of the same archive.
+                if not os.path.isdir(target):
+                    raise
+                shutil.rmtree(tmp_dir)
+            return target, digest
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+    def __cache_file(self, key):
+        return os.path.join(self.cache_dir, "results", hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json")
+
+    def __remember(self, key, result):
+        with self.lock:
+            self.memory[key] = result
+            self.memory.move_to_end(key)
+            while len(self.memory) > self.memory_entries:
+                self.memory.popitem(last=False)
+
+    def run(self, operation, directory, params, digest=None):
+        """Return (encoded JSON result, source) where source is memory, disk, coalesced or computed."""
+        self.__count("requests")
+        digest = digest or content_hash(directory)
+        key = json.dumps([operation, digest, sorted(params.items())])
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return self.memory[key], "memory"
+            shared = self.inflight.get(key)
+            owner = shared is None
+            if owner:
+                shared = self.inflight[key] = Future()
+            else:
+                self.stats["coalesced"] += 1
+        if not owner:
+            return shared.result(), "coalesced"
+        try:
+            cache_file = self.__cache_file(key)
+            if os.path.exists(cache_file):
+                with open(cache_file, "rb") as f:
+                    result = f.read()
+                source = "disk"
+                self.__count("disk_hits")
+            else:
+                result, cacheable = self.pool.submit(_run_job, operation, directory, params).result()
+                source = "computed"
+                self.__count("computed")
+                if not cacheable:
+                    shared.set_result(result)
+                    return result, source
+                tmp_file = f"{cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_file, "wb") as f:
+                    f.write(result)
+                os.replace(tmp_file, cache_file)
+            # Cached before the in-flight entry goes away, so later callers never recompute.
+            self.__remember(key, result)
+            shared.set_result(result)
+            return result, source
+        except Exception as e:
+            self.__count("errors")
+            shared.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                self.inflight.pop(key, None)
+
+    def close(self):
+        self.pool.shutdown(wait=True, cancel_futures=True)
+
+
+class AnalysisRequestHandler(BaseHTTPRequestHandler):
+    """POST /<operation> with a JSON body {"path": ..., "params": {...}} or a zip archive body;
+    GET /health and /stats."""
+    server_version = "SeeringAnalysis/1.0"
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def __send(self, status, payload, raw_result=None):
+        body = json.dumps(payload, default=_to_json).encode("utf-8")
+        if raw_result is not None:
+            # Splice the cached JSON in as-is instead of decoding and re-encoding it.
+            body = body[:-1] + b', "result": ' + raw_result + b'}'
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        route = urlparse(self.path).path.strip("/")
+        service = self.server.service
+        if route == "health":
+            self.__send(200, {"status": "ok"})
+        elif route == "stats":
+            with service.lock:
+                self.__send(200, dict(service.stats, cached=len(service.memory), inflight=len(service.inflight)))
+        else:
+            self.__send(404, {"error": f"Unknown route: /{route}"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        operation = url.path.strip("/")
+        if operation not in OPERATIONS:
+            self.__send(404, {"error": f"Unknown operation: /{operation}. Use one of {', '.join(OPERATIONS)}."})
+            return
+        service = self.server.service
+        start = time.perf_counter()
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            if length > MAX_ARCHIVE_BYTES:
+                self.__send(413, {"error": f"Request body exceeds {MAX_ARCHIVE_BYTES} bytes"})
+                return
+            body = self.rfile.read(length)
+            params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            digest = None
+            if self.headers.get("Content-Type", "").split(";")[0] in ("application/zip", "application/octet-stream"):
+                directory, digest = service.store_archive(body)
+            else:
+                request = json.loads(body or b"{}")
+                params.update(request.get("params", {}))
+                directory = service.resolve_path(request["path"])
+            result, source = service.run(operation, directory, params, digest)
+            self.__send(200, {"operation": operation, "source": source,
+                              "seconds": round(time.perf_counter() - start, 4)}, raw_result=result)
+        except (KeyError, ValueError, zipfile.BadZipFile) as e:
+            self.__send(400, {"error": f"{type(e).__name__}: {e}"})
+        except (FileNotFoundError, PermissionError) as e:
+            self.__send(404 if isinstance(e, FileNotFoundError) else 403, {"error": str(e)})
+        except Exception as e:
+            self.__send(500, {"error": f"{type(e).__name__}: {e}"})
+
+
+class AnalysisHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 drops connections under bursts and clients retry a second later.
+    request_queue_size = 128
+
+
+def make_server(host="127.0.0.1", port=8000, workers=2, cache_dir=DEFAULT_CACHE_DIR, allowed_roots=None, quiet=True):
+    server = AnalysisHTTPServer((host, port), AnalysisRequestHandler)
+    server.service = AnalysisService(workers=workers, cache_dir=cache_dir, allowed_roots=allowed_roots)
+    server.quiet = quiet
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve codebase analysis and summaries over a local JSON API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=2, help="Size of the warm worker pool")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--allow-root", action="append", default=None,
+                        help="Only analyze paths under this directory (repeatable)")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.workers, args.cache_dir, args.allow_root, quiet=not args.verbose)
+    print(f"Serving on http://{server.server_address[0]}:{server.server_address[1]} "
+          f"({args.workers} workers, cache at {args.cache_dir})", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,11 +4,12 @@ from typing import Dict
 import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 from src.downloader.Z_U_F import load_codebase
+from src.codebase_summary.Skeleton import SkeletonCompressor
 from src.parser.CodeBase_CodeLine import CodebaseAnalyzer
 import threading
-import streamlit as st
 
-LLM_API_URL = "https://openrouter.ai/api/v1/chat/completions"
+# Override to point at another OpenAI-compatible endpoint, e.g. the MockLLM server.
+LLM_API_URL = os.environ.get("OPENROUTER_API_URL", "https://openrouter.ai/api/v1/chat/completions")
 LLM_API_KEY = "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"  # Replace with your actual OpenRouter API key
 LLM_API_KEY2= "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"
 
@@ -54,8 +55,14 @@ def generate_summary(code_files):
         "Here is the codebase you should analyze:\n\n"
     )
 
+    # Spread the prompt limit over the files; only files over their share are cut to a skeleton.
+    compressor = SkeletonCompressor(token_budget=max(200, (max_token_limit - len(base_prompt) // 4) // len(code_files)))
     file_contents = []
     for path, content in code_files.items():
+        content = compressor.compress(path, content)
+        stats = compressor.stats[path]
+        if stats["saved_tokens"] > 0:
+            print(f"Debug: Skeleton for {path}: {stats['original_tokens']} -> {stats['tokens']} tokens ({stats['ratio']}x)", flush=True)
         if len(content) > max_file_size:
             print(f"Skipping large file: {path} ({len(content)} bytes)", flush=True)
             continue
@@ -67,6 +74,7 @@ def generate_summary(code_files):
         print("Error: No valid files after filtering", flush=True)
         return "Error: No valid files after filtering", errors
 
+    print(f"Debug: Skeleton compression: {compressor.report()}", flush=True)
     prompt = base_prompt + "".join(file_contents)
     prompt_length_chars = len(prompt)
     estimated_tokens = prompt_length_chars // 4
@@ -0,0 +1,199 @@
+import os
+import io
+import re
+import sys
+import json
+import time
+import argparse
+import contextlib
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.parser.CodeBase_CodeLine import CodebaseAnalyzer
+from src.parser.CallGraph import CallGraph, MODULE_CODE
+from src.retriever.BM25Index import BM25Index
+from src.codebase_summary.MapScheduler import estimate_tokens
+from src.codebase_summary.CodeBase_Sum_2_TEST_API import call_llm, load_codebase
+
+PART_SUFFIX = re.compile(r" \(part \d+\)$")
+
+
+class CodebaseQA:
+    """Answers questions about a codebase with one bounded LLM call instead of a whole-repo prompt.
+
+    The question is run against a local BM25 index of function, method and class chunks; the top
+    k functions go into the prompt with their callers and callees from the function-level
+    CallGraph, whose calls are resolved through each module's imports, so a common name such as
+    `run` does not pull in every `run` in the repo; a matching class brings its methods along
+    instead. Blocks are added best first
+    until token_budget is reached: hits get up to hit_lines lines, neighbors up to neighbor_lines.
+    """
+
+    def __init__(self, code_files, k=6, token_budget=6000, neighbors=3, hit_lines=60, neighbor_lines=15,
+                 index_dir=None, log_path=None):
+        self.code_files = code_files
+        self.k = k
+        self.token_budget = token_budget
+        self.neighbors = neighbors
+        self.hit_lines = hit_lines
+        self.neighbor_lines = neighbor_lines
+        self.log_path = log_path
+        self.log = []
+
+        start = time.perf_counter()
+        if index_dir and os.path.exists(os.path.join(index_dir, "meta.json")):
+            self.index = BM25Index.load(index_dir)
+        else:
+            self.index = BM25Index()
+        self.index.sync(code_files)
+        if index_dir:
+            self.index.save(index_dir)
+        self.__build_call_graph()
+        self.setup_seconds = time.perf_counter() - start
+
+    def __build_call_graph(self):
+        analyzer = CodebaseAnalyzer(".")
+        with contextlib.redirect_stdout(io.StringIO()):
+            analyzer.parse_files(self.code_files, max_size=float("inf"))
+        self.graph = CallGraph.from_parsed(analyzer.parsed, analyzer.file_module_map)
+        self.members = {}     # (path, class name) -> [(path, qualified name) of its methods]
+        for path, info in analyzer.parsed.items():
+            for method in info.get("methods", []):
+                self.members.setdefault((path, method["class"]), []).append((path, f"{method['class']}.{method['name']}"))
+
+    def __key(self, func_id):
+        """(path, name within the file) for a call graph id, the form the index and prompt use."""
+        path = self.graph.files[func_id]
+        return path, self.graph.names[func_id][len(self.graph.modules[path]) + 1:]
+
+    def __span(self, key):
+        func_id = self.graph.index.get(f"{self.graph.modules.get(key[0])}.{key[1]}")
+        return None if func_id is None else (int(self.graph.lines[func_id]), int(self.graph.end_lines[func_id]))
+
+    def __related(self, key):
+        func_id = self.graph.index.get(f"{self.graph.modules.get(key[0])}.{key[1]}")
+        if func_id is None:
+            return [("method of", self.members.get(key, []))]
+        related = lambda ids: [self.__key(i) for i in ids if not self.graph.names[i].endswith(MODULE_CODE)]
+        return [("calls", related(self.graph.caller_ids(func_id))), ("called by", related(self.graph.callee_ids(func_id)))]
+
+    def __source(self, path, start, end, max_lines):
+        lines = self.code_files[path].splitlines()[start - 1:end]
+        text = "\n".join(lines[:max_lines])
+        if len(lines) > max_lines:
+            text += f"\n# ... {len(lines) - max_lines} more lines"
+        return text
+
+    def retrieve(self, question):
+        """Context blocks for a question, best first, and how long retrieval took."""
+        start = time.perf_counter()
+        hits = self.index.search(question, self.k)
+        blocks, seen = [], set()
+        for hit in hits:
+            key = (hit["path"], PART_SUFFIX.sub("", hit["name"]))
+            start_line, end_line = self.__span(key) or (hit["start"], hit["end"])
+            if key in seen:
+                continue
+            seen.add(key)
+            blocks.append({"role": "match", "path": hit["path"], "name": key[1], "start": start_line,
+                           "score": hit["score"], "source": self.__source(hit["path"], start_line, end_line, self.hit_lines)})
+        for block in list(blocks):
+            key = (block["path"], block["name"])
+            for role, related in self.__related(key):
+                for neighbor in related[:self.neighbors]:
+                    if neighbor in seen:
+                        continue
+                    seen.add(neighbor)
+                    start_line, end_line = self.__span(neighbor)
+                    blocks.append({"role": f"{role} {key[1]}", "path": neighbor[0], "name": neighbor[1],
+                                   "start": start_line,
+                                   "source": self.__source(neighbor[0], start_line, end_line, self.neighbor_lines)})
+        return blocks, (time.perf_counter() - start) * 1000
+
+    def build_prompt(self, question, blocks):
+        """The prompt for question, with as many blocks as fit token_budget; returns (prompt, blocks used)."""
+        header = f"""
+    You are a code analysis assistant answering a question about a codebase.
+    Below are the functions most relevant to the question, followed by some of their callers and callees.
+    Answer from this code, cite functions as path:line, and say so if the excerpts are not enough.
+
+    Question: {question}
+    """
+        used, sections, tokens = [], [], estimate_tokens(header)
+        for block in blocks:
+            section = f"\n--- {block['path']}:{block['start']} {block['name']} ({block['role']}) ---\n{block['source']}\n"
+            cost = estimate_tokens(section)
+            if tokens + cost > self.token_budget:
+                continue
+            sections.append(section)
+            used.append(block)
+            tokens += cost
+        return header + "".join(sections) + "\n    Answer:\n    ", used
+
+    def ask(self, question, dry_run=False):
+        """Answer question with one LLM call (or return the prompt with dry_run=True), logging the cost."""
+        blocks, retrieval_ms = self.retrieve(question)
+        prompt, used = self.build_prompt(question, blocks)
+        start = time.perf_counter()
+        answer = prompt if dry_run else call_llm(prompt)
+        entry = {
+            "question": question,
+            "retrieval_ms": round(retrieval_ms, 2),
+            "prompt_tokens": estimate_tokens(prompt),
+            "matches": sum(block["role"] == "match" for block in used),
+            "neighbors": sum(block["role"] != "match" for block in used),
+            "dropped_blocks": len(blocks) - len(used),
+            "llm_seconds": None if dry_run else round(time.perf_counter() - start, 2),
+            "context": [f"{block['path']}:{block['start']} {block['name']}" for block in used],
+        }
+        self.log.append(entry)
+        print(f"ask: retrieval {entry['retrieval_ms']:.1f} ms, prompt {entry['prompt_tokens']} tokens "
+              f"({entry['matches']} matches + {entry['neighbors']} neighbors, {entry['dropped_blocks']} over budget)"
+              + ("" if dry_run else f", LLM {entry['llm_seconds']:.1f}s"), flush=True)
+        if self.log_path:
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+        return answer
+
+
+def ask(question, path=".", **kwargs):
+    """One-off question about the codebase at path (local directory or GitHub URL).
+
+    Builds the index and call graph each time; keep a CodebaseQA around to ask several questions.
+    """
+    with contextlib.redirect_stdout(io.StringIO()):
+        code_files = load_codebase(path)
+    return CodebaseQA(code_files, **kwargs).ask(question)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ask questions about a codebase using retrieved functions as context.")
+    parser.add_argument("input_path", help="GitHub URL or local path")
+    parser.add_argument("question", nargs="*", help="Question to ask (reads one per line from stdin if omitted)")
+    parser.add_argument("-k", type=int, default=6, help="Functions to retrieve per question")
+    parser.add_argument("--token-budget", type=int, default=6000, metavar="TOKENS", help="Cap on prompt size")
+    parser.add_argument("--neighbors", type=int, default=3, help="Callers and callees to add per retrieved function")
+    parser.add_argument("--index", metavar="DIR", help="Keep the BM25 index here so later runs only re-index changed files")
+    parser.add_argument("--log", metavar="FILE", help="Append per-query retrieval latency and prompt size as JSON lines")
+    parser.add_argument("--dry-run", action="store_true", help="Print the prompt instead of calling the LLM")
+    args = parser.parse_args()
+
+    github_token = None
+    if args.input_path.startswith("https://github.com"):
+        github_token = input("Enter your GitHub token (optional, for private repos): ").strip()
+    code_files = load_codebase(args.input_path, github_token)
+    if not code_files:
+        print("Could not load codebase. Exiting.")
+        return
+    qa = CodebaseQA(code_files, k=args.k, token_budget=args.token_budget, neighbors=args.neighbors,
+                    index_dir=args.index, log_path=args.log)
+    print(f"Indexed {len(qa.index)} chunks and {len(qa.graph)} functions in {qa.setup_seconds:.1f}s.")
+
+    questions = [" ".join(args.question)] if args.question else (line.strip() for line in sys.stdin)
+    for question in questions:
+        if not question:
+            continue
+        answer = qa.ask(question, dry_run=args.dry_run)
+        print(f"\n{answer if answer else 'No answer could be generated.'}\n", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+import io
+import time
+import heapq
+import threading
+import contextlib
+from src.parser.CodeBase_CodeLine import CodebaseAnalyzer
+
+PRIORITIES = ("pagerank", "in_degree", "order")
+
+
+def estimate_tokens(text):
+    """Rough prompt size; about four characters per token for code and English."""
+    return len(text) // 4 + 1
+
+
+def resolve_imports(graph, modules):
+    """Map import targets onto file modules with CallGraph.module_resolver.
+
+    The analyzer names modules by path from base_path while imports are written from wherever
+    the package root is, so an edge from an import would otherwise land on a node with no file
+    behind it.
+    """
+    import networkx as nx
+    from src.parser.CallGraph import module_resolver   # numpy; only needed once a graph is resolved
+    resolver = module_resolver(modules)
+
+    def resolve(node):
+        return resolver(node) or node
+
+    resolved = nx.DiGraph()
+    resolved.add_nodes_from(map(resolve, graph))
+    resolved.add_edges_from((resolve(u), resolve(v)) for u, v in graph.edges if resolve(u) != resolve(v))
+    return resolved
+
+
+def centrality_scores(code_files, method="pagerank", base_path="."):
+    """Score each file by how much of the codebase depends on it, using CodebaseAnalyzer.graph.
+
+    The graph's edges run dependency -> dependent, so "in_degree" counts a module's dependents
+    (its out-degree there) and "pagerank" is GraphMetrics' PageRank on the reversed graph. Files the analyzer does
+    not parse (non-Python) score 0 and keep their load order among themselves.
+    """
+    if method == "order":
+        return {}
+    analyzer = CodebaseAnalyzer(base_path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer.parse_files(code_files, max_size=float("inf"))
+        analyzer.build_graph(sort_by="file")
+    if method == "pagerank":
+        ranks = analyzer.compute_metrics()["pagerank"]
+    elif method == "in_degree":
+        ranks = dict(resolve_imports(analyzer.graph, set(analyzer.module_file_map)).out_degree())
+    else:
+        raise ValueError(f"Unknown priority '{method}'; use one of {', '.join(PRIORITIES)}")
+    return {path: ranks.get(module, 0.0) for path, module in analyzer.file_module_map.items()}
+
+
+class MapScheduler:
+    """Hands out files to map workers highest score first.
+
+    With a deadline (seconds from construction) nothing new starts once it passes; with a
+    token_budget a file is only started if its estimated prompt still fits, so smaller, lower
+    ranked files can use up what is left. Either way the map ends with the most central files
+    done, and the reduce works from whatever completed.
+
+    cost(path, content) gives a file's prompt tokens for the budget and for batching; it defaults
+    to estimate_tokens(content) and should count what is actually sent, e.g. the skeleton.
+    """
+
+    def __init__(self, code_files, scores=None, deadline=None, token_budget=None, cost=None):
+        scores = scores or {}
+        self.code_files = code_files
+        self.cost = cost or (lambda path, content: estimate_tokens(content))
+        self.deadline = time.monotonic() + deadline if deadline else None
+        self.token_budget = token_budget
+        self.tokens_started = 0
+        self.dropped = []
+        self.stats = {"started": 0, "dropped_deadline": 0, "dropped_budget": 0}
+        self.__heap = [(-scores.get(path, 0.0), index, path) for index, path in enumerate(code_files)]
+        heapq.heapify(self.__heap)
+        self.__costs = {}
+        self.__lock = threading.Lock()
+
+    def next(self):
+        """The next path to summarize, or None when nothing is left to start."""
+        with self.__lock:
+            return self.__pop()
+
+    def next_batch(self, max_tokens, small_tokens, max_files=8, max_scan=64):
+        """The next path plus, if it is small, up to max_files - 1 more small files that fit in max_tokens.
+
+        Files are packed first-fit in priority order; ones that do not fit stay queued for a
+        later batch, and at most max_scan of them are passed over per call. Returns [] at the end.
+        """
+        with self.__lock:
+            path = self.__pop()
+            if path is None:
+                return []
+            batch, tokens = [path], self.__cost(path)
+            if tokens > small_tokens:
+                return batch
+            passed_over = []
+            while self.__heap and len(batch) < max_files and len(passed_over) < max_scan and tokens < max_tokens:
+                item = heapq.heappop(self.__heap)
+                cost = self.__cost(item[2])
+                if cost > small_tokens or tokens + cost > max_tokens or not self.__affordable(cost):
+                    passed_over.append(item)
+                    continue
+                batch.append(item[2])
+                tokens += cost
+                self.tokens_started += cost
+                self.stats["started"] += 1
+            for item in passed_over:
+                heapq.heappush(self.__heap, item)
+            return batch
+
+    def __cost(self, path):
+        if path not in self.__costs:
+            self.__costs[path] = self.cost(path, self.code_files[path])
+        return self.__costs[path]
+
+    def __affordable(self, cost):
+        return self.token_budget is None or self.tokens_started + cost <= self.token_budget
+
+    def __pop(self):
+        while self.__heap:
+            if self.deadline is not None and time.monotonic() >= self.deadline:
+                self.stats["dropped_deadline"] += len(self.__heap)
+                self.dropped.extend(path for _, _, path in sorted(self.__heap))
+                self.__heap = []
+                break
+            _, _, path = heapq.heappop(self.__heap)
+            cost = self.__cost(path)
+            if not self.__affordable(cost):
+                self.stats["dropped_budget"] += 1
+                self.dropped.append(path)
+                continue
+            self.tokens_started += cost
+            self.stats["started"] += 1
+            return path
+        return None
+
+    def remove(self, paths):
+        """Take paths out of the queue, e.g. files summarized some other way; they are not counted as dropped."""
+        paths = set(paths)
+        with self.__lock:
+            self.__heap = [item for item in self.__heap if item[2] not in paths]
+            heapq.heapify(self.__heap)
+
+    def close(self):
+        """Stop handing out work, e.g. on Ctrl-C; files already started still finish."""
+        with self.__lock:
+            self.__heap = []
@@ -0,0 +1,303 @@
+import re
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+# Section names and visual cues the real prompts ask for, so the summarizers' output checks pass.
+SUMMARY_SECTIONS = ["High-Level Overview", "Class-Level Breakdown", "Function-Level Breakdown",
+                    "Interdependencies and Flow", "Engineering Commentary"]
+VISUAL_CUES = ["[Visualize module graph]", "[Show data flow for analyze]", "[Highlight call_llm retries]",
+               "[Animate file summaries merging]"]
+FILLER = ("module parses files builds graph calls function returns summary class method data flow "
+          "cache request response token prompt edge node import dependency pipeline worker").split()
+
+
+def parse_distribution(spec):
+    """Turn 'fixed:0.2', 'uniform:0.1,0.5', 'normal:0.3,0.05', 'lognormal:-1.5,0.5' or
+    'exponential:0.3' into a function drawing seconds from a random.Random."""
+    name, _, args = spec.partition(":")
+    values = [float(v) for v in args.split(",") if v]
+    samplers = {
+        "fixed": lambda rng: values[0],
+        "uniform": lambda rng: rng.uniform(values[0], values[1]),
+        "normal": lambda rng: rng.gauss(values[0], values[1]),
+        "lognormal": lambda rng: rng.lognormvariate(values[0], values[1]),
+        "exponential": lambda rng: rng.expovariate(1.0 / values[0]),
+    }
+    if name not in samplers:
+        raise ValueError(f"Unknown distribution: {spec}. Use one of {', '.join(samplers)}.")
+    return lambda rng: max(0.0, samplers[name](rng))
+
+
+class MockLLMConfig:
+    def __init__(self, latency="fixed:0.05", tokens_per_second=0.0, output_tokens=200, rate_429=0.0,
+                 rate_5xx=0.0, retry_after=1.0, max_concurrency=0, seed=0, prompt_tokens_per_second=0.0):
+        self.latency = parse_distribution(latency)
+        self.latency_spec = latency
+        self.tokens_per_second = tokens_per_second
+        # Prompt processing speed; long prompts then take longer to answer, as they do upstream.
+        self.prompt_tokens_per_second = prompt_tokens_per_second
+        self.output_tokens = output_tokens
+        self.rate_429 = rate_429
+        self.rate_5xx = rate_5xx
+        self.retry_after = retry_after
+        # Requests beyond this many in flight get a 429, like a provider's concurrency cap.
+        self.max_concurrency = max_concurrency
+        self.seed = seed
+
+
+class MockLLMState:
+    """Counters and per-prompt attempt numbers shared by all request threads."""
+
+    def __init__(self, config):
+        self.config = config
+        self.lock = threading.Lock()
+        self.attempts = {}
+        self.in_flight = 0
+        self.stats = {"requests": 0, "ok": 0, "rate_limited": 0, "server_errors": 0, "streamed": 0,
+                      "prompt_tokens": 0, "completion_tokens": 0, "max_in_flight": 0}
+
+    def begin(self, prompt):
+        """Register a request and return its RNG, seeded by prompt and attempt for determinism."""
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        with self.lock:
+            attempt = self.attempts.get(digest, 0)
+            self.attempts[digest] = attempt + 1
+            self.in_flight += 1
+            self.stats["requests"] += 1
+            self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self.in_flight)
+            over_capacity = bool(self.config.max_concurrency) and self.in_flight > self.config.max_concurrency
+        return random.Random(f"{self.config.seed}-{digest}-{attempt}"), digest, over_capacity
+
+    def end(self, outcome, prompt_tokens=0, completion_tokens=0):
+        with self.lock:
+            self.in_flight -= 1
+            self.stats[outcome] += 1
+            self.stats["prompt_tokens"] += prompt_tokens
+            self.stats["completion_tokens"] += completion_tokens
+
+
+def make_reply(prompt, digest, max_tokens, output_tokens):
+    """Deterministic text whose shape matches what the prompt asks for."""
+    rng = random.Random(digest)
+    budget = min(output_tokens, max_tokens) if max_tokens else output_tokens
+    if "scriptwriter" in prompt:
+        header = ["Opening:"] + VISUAL_CUES + ["Core Explanation:"]
+    elif "Here is the codebase" in prompt or "Individual File Summaries" in prompt:
+        header = [f"{i}. *{name}*:" for i, name in enumerate(SUMMARY_SECTIONS, 1)]
+    else:
+        paths = re.findall(r"File Path: (\S+)", prompt)
+        if len(paths) > 1:
+            # Batched map request: one delimited section per file, each as long as a single reply.
+            sections = []
+            for path in paths:
+                words = [rng.choice(FILLER) for _ in range(budget)]
+                sections.append(f"### FILE: {path}\nSummary of {path}: " + " ".join(words))
+            return "\n\n".join(sections)
+        header = [f"Summary of {paths[0]}:" if paths else "Summary:"]
+    words = " ".join(header).split()
+    words += [rng.choice(FILLER) for _ in range(max(0, budget - len(words)))]
+    return " ".join(words)
+
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    """OpenRouter (/api/v1/chat/completions) and Gemini (/v1beta/models/<m>:generateContent,
+    :streamGenerateContent) endpoints backed by a deterministic generator."""
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+    def __send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def __send_error(self, wire, status, message, headers=None):
+        if wire == "gemini":
+            payload = {"error": {"code": status, "message": message,
+                                 "status": "RESOURCE_EXHAUSTED" if status == 429 else "UNAVAILABLE"}}
+        else:
+            payload = {"error": {"code": status, "message": message}}
+        self.__send_json(status, payload, headers)
+
+    def __stream(self, chunks):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        for chunk, delay in chunks:
+            if delay:
+                time.sleep(delay)
+            self.wfile.write(b"data: " + chunk + b"\n\n")
+            self.wfile.flush()
+        self.close_connection = True
+
+    def do_GET(self):
+        if urlparse(self.path).path.strip("/") == "stats":
+            with self.server.state.lock:
+                self.__send_json(200, dict(self.server.state.stats, in_flight=self.server.state.in_flight))
+        else:
+            self.__send_json(404, {"error": {"code": 404, "message": "Not found"}})
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self.__send_json(400, {"error": {"code": 400, "message": "Invalid JSON"}})
+            return
+        if path.rstrip("/").endswith("/chat/completions"):
+            wire, stream = "openrouter", bool(payload.get("stream"))
+            prompt = "\n".join(str(m.get("content", "")) for m in payload.get("messages", []))
+            max_tokens = payload.get("max_tokens")
+            model = payload.get("model", "mock")
+        elif ":generateContent" in path or ":streamGenerateContent" in path:
+            wire, stream = "gemini", ":streamGenerateContent" in path
+            prompt = "\n".join(part.get("text", "") for content in payload.get("contents", [])
+                               for part in content.get("parts", []))
+            max_tokens = payload.get("generationConfig", {}).get("maxOutputTokens")
+            model = path.rsplit("/", 1)[-1].split(":")[0]
+        else:
+            self.__send_json(404, {"error": {"code": 404, "message": f"Unknown endpoint: {path}"}})
+            return
+
+        state, config = self.server.state, self.server.state.config
+        rng, digest, over_capacity = state.begin(prompt)
+        prefill = len(prompt) / 4 / config.prompt_tokens_per_second if config.prompt_tokens_per_second else 0.0
+        time.sleep(config.latency(rng) + prefill)
+        draw = rng.random()
+        if over_capacity or draw < config.rate_429:
+            state.end("rate_limited")
+            self.__send_error(wire, 429, "Rate limit exceeded",
+                              {"Retry-After": f"{config.retry_after:g}"} if config.retry_after else None)
+            return
+        if draw < config.rate_429 + config.rate_5xx:
+            state.end("server_errors")
+            status = 503 if rng.random() < 0.5 else 500
+            self.__send_error(wire, status, "Mock upstream failure")
+            return
+
+        text = make_reply(prompt, digest, max_tokens, config.output_tokens)
+        words = text.split(" ")
+        prompt_tokens, completion_tokens = len(prompt) // 4, len(words)
+        per_token = 1.0 / config.tokens_per_second if config.tokens_per_second else 0.0
+        if stream:
+            with state.lock:
+                state.stats["streamed"] += 1
+            chunks = []
+            for i in range(0, len(words), 8):
+                piece = " ".join(words[i:i + 8]) + (" " if i + 8 < len(words) else "")
+                if wire == "gemini":
+                    event = {"candidates": [{"content": {"parts": [{"text": piece}], "role": "model"}, "index": 0}]}
+                else:
+                    event = {"id": f"mock-{digest[:12]}", "object": "chat.completion.chunk", "model": model,
+                             "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]}
+                chunks.append((json.dumps(event).encode("utf-8"), per_token * len(words[i:i + 8])))
+            if wire == "gemini":
+                final = {"candidates": [{"content": {"parts": [{"text": ""}], "role": "model"},
+                                         "finishReason": "STOP", "index": 0}],
+                         "usageMetadata": {"promptTokenCount": prompt_tokens,
+                                           "candidatesTokenCount": completion_tokens,
+                                           "totalTokenCount": prompt_tokens + completion_tokens}}
+                chunks.append((json.dumps(final).encode("utf-8"), 0))
+            else:
+                chunks.append((json.dumps({"id": f"mock-{digest[:12]}", "object": "chat.completion.chunk",
+                                           "model": model, "choices": [{"index": 0, "delta": {},
+                                                                        "finish_reason": "stop"}]}).encode("utf-8"), 0))
+                chunks.append((b"[DONE]", 0))
+            try:
+                self.__stream(chunks)
+            finally:
+                state.end("ok", prompt_tokens, completion_tokens)
+            return
+
+        time.sleep(per_token * completion_tokens)
+        state.end("ok", prompt_tokens, completion_tokens)
+        if wire == "gemini":
+            self.__send_json(200, {
+                "candidates": [{"content": {"parts": [{"text": text}], "role": "model"},
+                                "finishReason": "STOP", "index": 0}],
+                "usageMetadata": {"promptTokenCount": prompt_tokens, "candidatesTokenCount": completion_tokens,
+                                  "totalTokenCount": prompt_tokens + completion_tokens},
+                "modelVersion": model,
+            })
+        else:
+            self.__send_json(200, {
+                "id": f"mock-{digest[:12]}", "object": "chat.completion", "created": int(time.time()),
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                          "total_tokens": prompt_tokens + completion_tokens},
+            })
+
+
+class MockLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+
+def make_server(config=None, host="127.0.0.1", port=0, quiet=True):
+    """Build (but do not start) a mock server; port 0 picks a free port."""
+    server = MockLLMServer((host, port), MockLLMHandler)
+    server.state = MockLLMState(config or MockLLMConfig())
+    server.quiet = quiet
+    return server
+
+
+def start_in_thread(config=None, host="127.0.0.1", port=0):
+    """Start a mock server in a daemon thread and return (server, base_url)."""
+    server = make_server(config, host, port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{server.server_address[0]}:{server.server_address[1]}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve deterministic mock OpenRouter and Gemini responses.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", default="fixed:0.05",
+                        help="Time to first token, e.g. fixed:0.2, uniform:0.1,0.5, lognormal:-1.5,0.5")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Generation speed; 0 is instant")
+    parser.add_argument("--output-tokens", type=int, default=200, help="Reply length before max_tokens caps it")
+    parser.add_argument("--prompt-tokens-per-second", type=float, default=0.0,
+                        help="Prompt processing speed added to the latency; 0 is instant")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="Probability of a 429 per request")
+    parser.add_argument("--rate-5xx", type=float, default=0.0, help="Probability of a 500/503 per request")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--max-concurrency", type=int, default=0, help="429 requests beyond this many in flight")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    config = MockLLMConfig(args.latency, args.tokens_per_second, args.output_tokens, args.rate_429,
+                           args.rate_5xx, args.retry_after, args.max_concurrency, args.seed,
+                           args.prompt_tokens_per_second)
+    server = make_server(config, args.host, args.port, quiet=not args.verbose)
+    base_url = f"http://{args.host}:{server.server_address[1]}"
+    print(f"Mock LLM listening on {base_url}", flush=True)
+    print(f"  OPENROUTER_API_URL={base_url}/api/v1/chat/completions", flush=True)
+    print(f"  GEMINI_API_BASE={base_url}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
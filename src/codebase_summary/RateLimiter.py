@@ -0,0 +1,88 @@
+import time
+import threading
+from collections import deque
+from email.utils import parsedate_to_datetime
+
+
+def parse_retry_after(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date); None if absent or bad."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class AdaptiveLimiter:
+    """Additive-increase / multiplicative-decrease cap on concurrent LLM calls.
+
+    Every success grows the window by increase / window, so a full window of successes adds
+    about `increase`. A 429 multiplies it by `decrease`, at most once per round of requests
+    that were already in flight when the limit hit. Retry-After pauses every caller until it
+    passes.
+    """
+
+    def __init__(self, initial=2.0, min_window=1.0, max_window=32.0, increase=1.0, decrease=0.5, history=1000):
+        self.window = float(initial)
+        self.min_window = float(min_window)
+        self.max_window = float(max_window)
+        self.increase = increase
+        self.decrease = decrease
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.history = deque(maxlen=history)
+        self.stats = {"acquired": 0, "succeeded": 0, "rate_limited": 0, "cuts": 0, "waited_seconds": 0.0}
+        self.__last_cut = 0.0
+        self.__condition = threading.Condition()
+        self.__record()
+
+    def __record(self):
+        self.history.append((time.time(), self.window))
+
+    def acquire(self):
+        """Block until a slot is free and no Retry-After pause is active; return a ticket for release()."""
+        start = time.monotonic()
+        with self.__condition:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    self.__condition.wait(self.paused_until - now)
+                elif self.in_flight >= max(1, int(self.window)):
+                    self.__condition.wait()
+                else:
+                    break
+            self.in_flight += 1
+            self.stats["acquired"] += 1
+            self.stats["waited_seconds"] += now - start
+        return now
+
+    def release(self, ticket, rate_limited=False, retry_after=None):
+        """Return a slot and adapt the window to how the call went."""
+        with self.__condition:
+            self.in_flight -= 1
+            if rate_limited:
+                self.stats["rate_limited"] += 1
+                # Calls issued before the last cut were sent under the old, larger window.
+                if ticket >= self.__last_cut:
+                    self.window = max(self.min_window, self.window * self.decrease)
+                    self.__last_cut = time.monotonic()
+                    self.stats["cuts"] += 1
+                    self.__record()
+                if retry_after:
+                    self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+            else:
+                self.stats["succeeded"] += 1
+                self.window = min(self.max_window, self.window + self.increase / self.window)
+                self.__record()
+            self.__condition.notify_all()
+
+    def metrics(self):
+        """Current window and counters, for logs and benchmarks."""
+        with self.__condition:
+            return dict(self.stats, window=round(self.window, 3), in_flight=self.in_flight,
+                        paused_for=round(max(0.0, self.paused_until - time.monotonic()), 3))
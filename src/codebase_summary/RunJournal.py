@@ -0,0 +1,100 @@
+import os
+import json
+import time
+import secrets
+import hashlib
+import tempfile
+
+DEFAULT_RUNS_DIR = os.path.join(os.getcwd(), ".summary_runs")
+
+
+def content_digest(text):
+    return hashlib.sha256(text.encode("utf-8", errors="replace")).hexdigest()
+
+
+def atomic_write_json(path, data):
+    """Write JSON so readers see either the old file or the complete new one, never a torn write."""
+    directory = os.path.dirname(path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class RunJournal:
+    """On-disk record of one summarization run.
+
+    Layout: <runs_dir>/<run_id>/manifest.json, one map/<sha1 of path>.json per summarized file,
+    and one stage/<name>.json per reduce-side output. Entries carry the digest of what they were
+    built from, so a file edited between runs is summarized again instead of reused.
+    """
+
+    def __init__(self, run_id, runs_dir=DEFAULT_RUNS_DIR):
+        self.run_id = run_id
+        self.path = os.path.join(runs_dir, run_id)
+        manifest_path = os.path.join(self.path, "manifest.json")
+        if not os.path.exists(manifest_path):
+            raise FileNotFoundError(f"No run journal found for run id '{run_id}' in {runs_dir}")
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            self.manifest = json.load(f)
+
+    @classmethod
+    def create(cls, input_path, runs_dir=DEFAULT_RUNS_DIR):
+        run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(3)}"
+        path = os.path.join(runs_dir, run_id)
+        os.makedirs(os.path.join(path, "map"))
+        os.makedirs(os.path.join(path, "stage"))
+        atomic_write_json(os.path.join(path, "manifest.json"), {
+            "run_id": run_id, "input_path": input_path, "created": time.time(), "status": "running"
+        })
+        return cls(run_id, runs_dir)
+
+    def __entry_path(self, file_path):
+        return os.path.join(self.path, "map", hashlib.sha1(file_path.encode("utf-8")).hexdigest() + ".json")
+
+    def record(self, file_path, content, summary):
+        """Persist one map result as soon as it arrives; safe to call from worker threads."""
+        atomic_write_json(self.__entry_path(file_path), {
+            "path": file_path, "digest": content_digest(content), "summary": summary
+        })
+
+    def completed(self, code_files):
+        """Summaries already journaled for files whose content is unchanged."""
+        done = {}
+        for file_path, content in code_files.items():
+            entry_path = self.__entry_path(file_path)
+            if not os.path.exists(entry_path):
+                continue
+            try:
+                with open(entry_path, "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+            except ValueError:
+                continue
+            if entry.get("path") == file_path and entry.get("digest") == content_digest(content):
+                done[file_path] = entry["summary"]
+        return done
+
+    def save_stage(self, name, inputs, text):
+        """Persist a reduce-side output together with a digest of the inputs it was built from."""
+        atomic_write_json(os.path.join(self.path, "stage", f"{name}.json"),
+                          {"digest": content_digest(inputs), "text": text})
+
+    def load_stage(self, name, inputs):
+        stage_path = os.path.join(self.path, "stage", f"{name}.json")
+        if not os.path.exists(stage_path):
+            return None
+        with open(stage_path, "r", encoding="utf-8") as f:
+            stage = json.load(f)
+        return stage["text"] if stage.get("digest") == content_digest(inputs) else None
+
+    def set_status(self, status):
+        self.manifest["status"] = status
+        self.manifest["updated"] = time.time()
+        atomic_write_json(os.path.join(self.path, "manifest.json"), self.manifest)
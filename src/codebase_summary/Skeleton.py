@@ -0,0 +1,115 @@
+import threading
+from collections import Counter
+from src.parser.CodeBase_CodeLine import CodebaseAnalyzer
+from src.codebase_summary.MapScheduler import estimate_tokens
+
+
+class SkeletonCompressor:
+    """Shrinks source files to a skeleton before they go into a prompt.
+
+    Built on CodebaseAnalyzer.analyze_code: files within token_budget are sent unchanged.
+    Larger ones first lose comment-only and blank lines, then function bodies, longest
+    first, until they fit. Signatures, decorators, docstrings, class headers (with their
+    bases) and imports always stay, and each elided body leaves a one-line marker naming
+    its most frequent calls. Only Python is compressed; other files pass through.
+    """
+
+    MARKER = "..."
+
+    def __init__(self, token_budget=1500, top_calls=5):
+        self.token_budget = token_budget
+        self.top_calls = top_calls
+        self.stats = {}
+        self.__cache = {}
+        self.__analyzer = CodebaseAnalyzer(".")
+        self.__lock = threading.Lock()
+
+    def compress(self, path, code):
+        """Return the text to send for path and record how much it saved."""
+        text, elided = self.__compressed(path, code)
+        original, tokens = estimate_tokens(code), estimate_tokens(text)
+        with self.__lock:
+            self.stats[path] = {"original_tokens": original, "tokens": tokens, "saved_tokens": original - tokens,
+                                "ratio": round(original / tokens, 2), "elided_bodies": elided}
+        return text
+
+    def tokens(self, path, code):
+        """Estimated tokens of what compress would send for path, without recording it in stats."""
+        return estimate_tokens(self.__compressed(path, code)[0])
+
+    def __compressed(self, path, code):
+        # Kept per path, so metering a file's skeleton and then sending it compresses once.
+        with self.__lock:
+            cached = self.__cache.get(path)
+        if cached and cached[0] == code and cached[1] == self.token_budget:
+            return cached[2], cached[3]
+        budget, text, elided = self.token_budget, code, 0
+        if budget and path.endswith(".py") and estimate_tokens(code) > budget:
+            info = self.__analyzer.analyze_code(code, path)
+            if not info.get("error"):
+                text, elided = self.__skeleton(code, info)
+        with self.__lock:
+            self.__cache[path] = (code, budget, text, elided)
+        return text, elided
+
+    def __skeleton(self, code, info):
+        lines = code.splitlines()
+        keep = [True] * len(lines)
+        markers = {}
+        chars = sum(len(line) + 1 for line in lines)
+
+        def fits():
+            return chars // 4 + 1 <= self.token_budget
+
+        comment_lines = {c["lineno"] - 1 for c in info["comments"] if c["type"] == "inline"}
+        for index, line in enumerate(lines):
+            stripped = line.strip()
+            if not stripped or (index in comment_lines and stripped.startswith("#")):
+                keep[index] = False
+                chars -= len(line) + 1
+
+        calls_by_line = {}
+        for call in info["function_calls"]:
+            calls_by_line.setdefault(call["lineno"], []).append(call["name"])
+        bodies = [f for f in info["functions"] + info["methods"] if f["body_lineno"] and f["body_lineno"] > f["lineno"]]
+        bodies.sort(key=lambda f: (f["body_lineno"] - f["end_lineno"], f["lineno"]))
+        elided_spans = []
+        for func in bodies:
+            if fits():
+                break
+            start, end = func["body_lineno"], func["end_lineno"]
+            if any(s <= start and end <= e for s, e in elided_spans):
+                continue
+            calls = Counter(name for lineno in range(start, end + 1) for name in calls_by_line.get(lineno, ()))
+            indent = lines[start - 1][:len(lines[start - 1]) - len(lines[start - 1].lstrip())]
+            marker = f"{indent}{self.MARKER}  # {end - start + 1} lines elided"
+            if calls:
+                marker += "; calls " + ", ".join(name for name, _ in calls.most_common(self.top_calls))
+            if len(marker) >= sum(len(lines[index]) + 1 for index in range(start - 1, end) if keep[index]):
+                continue
+            for index in range(start - 1, end):
+                if keep[index]:
+                    keep[index] = False
+                    chars -= len(lines[index]) + 1
+                markers.pop(index, None)
+            markers[start - 1] = marker
+            chars += len(marker) + 1
+            elided_spans.append((start, end))
+
+        out = []
+        for index, line in enumerate(lines):
+            if index in markers:
+                out.append(markers[index])
+            if keep[index]:
+                out.append(line)
+        return "\n".join(out), len(elided_spans)
+
+    def report(self):
+        """Totals over every file compressed so far."""
+        with self.__lock:
+            stats = list(self.stats.values())
+        original = sum(s["original_tokens"] for s in stats)
+        tokens = sum(s["tokens"] for s in stats)
+        return {"files": len(stats), "compressed": sum(1 for s in stats if s["tokens"] < s["original_tokens"]),
+                "original_tokens": original, "tokens": tokens, "saved_tokens": original - tokens,
+                "ratio": round(original / tokens, 2) if tokens else 1.0}
@@ -0,0 +1,99 @@
+import os
+import re
+import json
+import threading
+from collections import Counter
+from src.parser.CodeBase_CodeLine import CodebaseAnalyzer
+
+CONFIG_EXTENSIONS = {".json", ".toml", ".ini", ".cfg", ".yaml", ".yml"}
+CONFIG_KEY = re.compile(r"^\[([^\]]+)\]|^([A-Za-z_][\w.-]*)\s*[:=]")
+
+
+def _names(items, limit=12):
+    items = list(dict.fromkeys(items))
+    shown = ", ".join(f"`{item}`" for item in items[:limit])
+    return shown + (f" and {len(items) - limit} more" if len(items) > limit else "")
+
+
+class StaticSummarizer:
+    """Deterministic summaries for files too trivial to be worth an LLM call.
+
+    A Python file qualifies when it has at most max_lines lines, no functions or methods and at
+    most max_calls calls (module-level side effects); it is then described from
+    CodebaseAnalyzer.analyze_code facts as empty, a re-export module or a constants module. Small
+    JSON/TOML/INI/YAML files are described by their top-level keys. summarize() returns None for
+    everything else, which goes to the LLM. max_lines=0 turns the router off.
+    """
+
+    def __init__(self, max_lines=80, max_calls=3):
+        self.max_lines = max_lines
+        self.max_calls = max_calls
+        self.stats = Counter()
+        self.__analyzer = CodebaseAnalyzer(".")
+        self.__lock = threading.Lock()
+
+    def summarize(self, path, code):
+        """A summary for a trivial file, or None if it should go to the LLM."""
+        kind, summary = None, None
+        if self.max_lines and code.count("\n") < self.max_lines:
+            ext = os.path.splitext(path)[1].lower()
+            if not code.strip():
+                kind, summary = "empty", f"`{path}` is empty" + (
+                    "; it only marks its directory as a Python package." if path.endswith("__init__.py") else ".")
+            elif ext == ".py":
+                kind, summary = self.__python(path, code)
+            elif ext in CONFIG_EXTENSIONS:
+                kind, summary = self.__config(path, code, ext)
+        with self.__lock:
+            self.stats[kind or "llm"] += 1
+        return summary
+
+    def __python(self, path, code):
+        info = self.__analyzer.analyze_code(code, path)
+        if info.get("error") or info["functions"] or info["methods"] or len(info["function_calls"]) > self.max_calls:
+            return None, None
+        parts = []
+        if info["docstring"]:
+            parts.append(info["docstring"].strip().split("\n\n")[0].replace("\n", " "))
+        imports = [imp["asname"] or imp["name"] for imp in info["imports"]]
+        sources = [imp["module"] or imp["name"] for imp in info["imports"]]
+        constants = [name for name in info["variables"] if name != "__all__"]
+        if info["classes"]:
+            parts.append("Defines classes without methods: " + _names(
+                f"{c['name']}({', '.join(c['bases'])})" if c["bases"] else c["name"] for c in info["classes"]) + ".")
+        if constants:
+            parts.append(f"Defines {len(constants)} module-level names: {_names(constants)}.")
+        if imports:
+            parts.append(f"Imports {_names(imports)} from {_names(sources, limit=6)}.")
+        if "__all__" in info["variables"]:
+            parts.append("Declares `__all__` to control its public names.")
+        if info["function_calls"]:
+            parts.append(f"Runs {_names(call['name'] for call in info['function_calls'])} at import time.")
+        if constants or info["classes"]:
+            kind, label = "constants", "a constants and declarations module"
+        elif imports:
+            kind, label = "reexport", "a re-export module"
+        else:
+            kind, label = "trivial", "a trivial module"
+        return kind, " ".join([f"`{path}` is {label} with no functions or methods."] + parts)
+
+    def __config(self, path, code, ext):
+        if ext == ".json":
+            try:
+                data = json.loads(code)
+            except ValueError:
+                return None, None
+            keys = list(data) if isinstance(data, dict) else []
+            shape = f"a JSON object with keys {_names(keys)}" if keys else f"a JSON {type(data).__name__}"
+        else:
+            keys = [m.group(1) or m.group(2) for m in map(CONFIG_KEY.match, code.splitlines()) if m]
+            if not keys:
+                return None, None
+            shape = f"a {ext[1:].upper()} file setting {_names(keys)}"
+        return "config", f"`{path}` is a configuration file: {shape}."
+
+    def report(self):
+        with self.__lock:
+            stats = dict(self.stats)
+        llm = stats.pop("llm", 0)
+        return {"static": sum(stats.values()), "llm": llm, "by_kind": stats}
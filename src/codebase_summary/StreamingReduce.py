@@ -0,0 +1,92 @@
+import os
+import json
+import hashlib
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+
+def package_of(path):
+    """Directory a file lives in; files at the root share the "." package."""
+    return os.path.dirname(path.replace("\\", "/")) or "."
+
+
+class StreamingReducer:
+    """Folds map results into per-package partial summaries while the map is still running.
+
+    A package's buffered summaries are reduced as soon as the package has no files left to
+    wait for, or once chunk_size of them have piled up. A lone summary is passed through without
+    an LLM call. finish() returns the partials, so the final reduce only sees a handful of them.
+    """
+
+    def __init__(self, file_paths, reduce_fn, chunk_size=20, max_workers=4, journal=None):
+        self.reduce_fn = reduce_fn
+        self.chunk_size = chunk_size
+        self.journal = journal
+        self.expected = Counter(package_of(path) for path in file_paths)
+        self.seen = Counter()
+        self.buffers = {}
+        self.chunks = {}
+        self.futures = []
+        self.stats = {"partials": 0, "passed_through": 0, "reused": 0, "failed": 0}
+        self.__lock = threading.Lock()
+        self.__pool = ThreadPoolExecutor(max_workers=max_workers)
+
+    def add(self, path, summary):
+        """Record one finished map call; summary is None when the file could not be summarized."""
+        package = package_of(path)
+        with self.__lock:
+            self.seen[package] += 1
+            if summary:
+                self.buffers.setdefault(package, []).append((path, summary))
+            if len(self.buffers.get(package, ())) >= self.chunk_size or self.seen[package] >= self.expected[package]:
+                self.__flush(package)
+
+    def __flush(self, package):
+        items = self.buffers.pop(package, [])
+        if not items:
+            return
+        index = self.chunks.get(package, 0)
+        self.chunks[package] = index + 1
+        self.futures.append((package, index, items, self.__pool.submit(self.__reduce, package, items)))
+
+    def __reduce(self, package, items):
+        if len(items) == 1:
+            with self.__lock:
+                self.stats["passed_through"] += 1
+            return items[0][1]
+        inputs = json.dumps([package, items])
+        stage = "partial-" + hashlib.sha1(inputs.encode("utf-8")).hexdigest()[:16]
+        if self.journal is not None:
+            cached = self.journal.load_stage(stage, inputs)
+            if cached is not None:
+                with self.__lock:
+                    self.stats["reused"] += 1
+                return cached
+        text = self.reduce_fn(package, items)
+        if text and self.journal is not None:
+            self.journal.save_stage(stage, inputs, text)
+        return text
+
+    def finish(self):
+        """Reduce whatever is still buffered and return [(label, partial summary)] in package order."""
+        with self.__lock:
+            for package in list(self.buffers):
+                self.__flush(package)
+            futures = list(self.futures)
+        partials = []
+        for package, index, items, future in sorted(futures, key=lambda f: (f[0], f[1])):
+            text = future.result()
+            if text:
+                if len(items) == 1:
+                    label = items[0][0]
+                else:
+                    label = package if self.chunks[package] == 1 else f"{package} (part {index + 1})"
+                partials.append((label, text))
+                self.stats["partials"] += 1
+            else:
+                # Keep the file summaries rather than lose a package to one failed reduce.
+                self.stats["failed"] += 1
+                partials.extend(items)
+        self.__pool.shutdown(wait=True)
+        return partials
@@ -9,11 +9,13 @@ import sys
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 from src.downloader.Z_U_F import load_codebase
+from src.codebase_summary.Skeleton import SkeletonCompressor
 
 
 # Load environment variables
 load_dotenv()
-LLM_API_URL = "https://openrouter.ai/api/v1/chat/completions"
+# Override to point at another OpenAI-compatible endpoint, e.g. the MockLLM server.
+LLM_API_URL = os.environ.get("OPENROUTER_API_URL", "https://openrouter.ai/api/v1/chat/completions")
 LLM_API_KEY = "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" 
 
 def generate_summary(code_files):
@@ -55,8 +57,14 @@ def generate_summary(code_files):
         "Here is the codebase you should analyze:\n\n"
     )
 
+    # Spread the prompt limit over the files; only files over their share are cut to a skeleton.
+    compressor = SkeletonCompressor(token_budget=max(200, (max_token_limit - len(base_prompt) // 4) // len(code_files)))
     file_contents = []
     for path, content in code_files.items():
+        content = compressor.compress(path, content)
+        stats = compressor.stats[path]
+        if stats["saved_tokens"] > 0:
+            st.write(f"Debug: Skeleton for {path}: {stats['original_tokens']} -> {stats['tokens']} tokens ({stats['ratio']}x)")
         if len(content) > max_file_size:
             st.write(f"Skipping large file: {path} ({len(content)} bytes)")
             continue
@@ -67,6 +75,7 @@ def generate_summary(code_files):
     if not file_contents:
         return "Error: No valid files after filtering", ["Error: No valid files after filtering"]
 
+    st.write(f"Debug: Skeleton compression: {compressor.report()}")
     prompt = base_prompt + "".join(file_contents)
     prompt_length_chars = len(prompt)
     estimated_tokens = prompt_length_chars // 4
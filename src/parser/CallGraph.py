@@ -0,0 +1,348 @@
+import os
+import io
+import re
+import sys
+import json
+import time
+import argparse
+import contextlib
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.parser.CodeBase_CodeLine import CodebaseAnalyzer
+
+FORMAT_VERSION = 1
+DOTTED = re.compile(r"[A-Za-z_][\w.]*")
+LAST_NAME = re.compile(r"(\w+)$")
+MODULE_CODE = "<module>"
+VECTOR_FRONTIER = 64
+
+
+def module_resolver(modules):
+    """A function mapping an import target onto one of modules by unique dotted suffix, else None.
+
+    The analyzer names modules by path from base_path while imports are written from wherever
+    the package root is, so "parser.TokenParse" finds "src.parser.TokenParse" and, when the
+    codebase was loaded from inside src, "src.parser.TokenParse" finds "parser.TokenParse".
+    """
+    modules = set(modules)
+    by_suffix = {}
+    for module in modules:
+        parts = module.split(".")
+        for i in range(len(parts)):
+            by_suffix.setdefault(".".join(parts[i:]), set()).add(module)
+
+    def resolve(name):
+        parts = name.split(".")
+        for i in range(len(parts)):
+            candidate = ".".join(parts[i:])
+            if candidate in modules:
+                return candidate
+            matches = by_suffix.get(candidate, ())
+            if len(matches) == 1:
+                return next(iter(matches))
+        return None
+
+    return resolve
+
+
+def _gather(offsets, targets, nodes):
+    """Concatenated CSR rows for nodes, without a Python loop over them."""
+    starts, ends = offsets[nodes], offsets[nodes + 1]
+    lengths = ends - starts
+    total = int(lengths.sum())
+    if not total:
+        return targets[:0]
+    shifts = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    return targets[np.arange(total, dtype=np.int64) + shifts]
+
+
+class CallGraph:
+    """Function-level call graph with interned qualified names and CSR adjacency arrays.
+
+    Every function, method and module body ("module.<module>") gets an integer id; names holds
+    the qualified name per id ("pkg.mod.func", "pkg.mod.Class.method"), index maps back, and
+    files, lines and end_lines say where each one is defined.
+    Edges are stored twice as compressed sparse rows, callees by caller and callers by callee
+    (int64 offsets plus int32 ids), so callers(), callees() and a k-hop neighborhood() are array
+    slices and a vectorized breadth-first search rather than dict-of-dict walks.
+    """
+
+    def __init__(self, names, sources, targets, files=None, lines=None, end_lines=None, modules=None):
+        self.names = [sys.intern(name) for name in names]
+        self.index = {name: i for i, name in enumerate(self.names)}
+        n = len(self.names)
+        self.files = list(files) if files is not None else [""] * n
+        self.lines = np.asarray(lines if lines is not None else np.zeros(n), dtype=np.int32)
+        self.end_lines = np.asarray(end_lines if end_lines is not None else np.zeros(n), dtype=np.int32)
+        self.modules = dict(modules or {})   # path -> module name
+        edges = np.unique(np.asarray(sources, dtype=np.int64) * max(n, 1) + np.asarray(targets, dtype=np.int64))
+        sources, targets = edges // max(n, 1), edges % max(n, 1)
+        self.out_offsets, self.out_ids = self.__csr(sources, targets, n)
+        order = np.argsort(targets, kind="stable")
+        self.in_offsets, self.in_ids = self.__csr(targets[order], sources[order], n)
+
+    @staticmethod
+    def __csr(rows, cols, n):
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=offsets[1:])
+        return offsets, cols.astype(np.int32)
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def num_edges(self):
+        return len(self.out_ids)
+
+    @classmethod
+    def from_codebase(cls, code_files, base_path="."):
+        """Parse {path: source} with CodebaseAnalyzer and build the graph from its call lists."""
+        analyzer = CodebaseAnalyzer(base_path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            analyzer.parse_files(code_files, max_size=float("inf"))
+        return cls.from_parsed(analyzer.parsed, analyzer.file_module_map)
+
+    @classmethod
+    def from_parsed(cls, parsed, file_module_map, max_fanout=5):
+        """Build from CodebaseAnalyzer.parsed / file_module_map.
+
+        A call is attributed to the innermost function containing it (or to the module body) and
+        resolved, in order, as: self.x / cls.x to the enclosing class's method; a bare name to a
+        function or class (its __init__) defined in the module or imported from another one;
+        alias.x through `import module as alias`; Class.x to that class's method. Other attribute
+        calls (obj.x) go to methods named x in the module or the modules it imports, unless more
+        than max_fanout of them qualify.
+        """
+        resolve = module_resolver(file_module_map.values())
+        names, files, lines, end_lines, index = [], [], [], [], {}
+
+        def intern(name, path, lineno, end_lineno):
+            if name not in index:
+                index[name] = len(names)
+                names.append(name)
+                files.append(path)
+                lines.append(lineno)
+                end_lines.append(end_lineno)
+            return index[name]
+
+        local = {}       # module -> {"func" / "Class" / "Class.method" / "func.nested": id}
+        methods = {}     # module -> {method name: [ids]}
+        method_ids = set()
+        owners = {}      # path -> (line -> innermost index into defs or -1, defs as (start, end, id, class))
+        for path, module in sorted(file_module_map.items(), key=lambda item: item[1]):
+            info = parsed.get(path, {})
+            if info.get("error"):
+                continue
+            table, by_method = local.setdefault(module, {}), methods.setdefault(module, {})
+            defs, open_spans = [], []   # open_spans: (end, qualname) of enclosing functions
+            for func in sorted(info["functions"] + info["methods"], key=lambda f: f["lineno"]):
+                while open_spans and open_spans[-1][0] < func["lineno"]:
+                    open_spans.pop()
+                if "class" in func:
+                    qualname = f"{func['class']}.{func['name']}"
+                else:
+                    # Nested functions are qualified by their enclosing function.
+                    qualname = f"{open_spans[-1][1]}.{func['name']}" if open_spans else func["name"]
+                func_id = intern(f"{module}.{qualname}", path, func["lineno"], func["end_lineno"])
+                table.setdefault(qualname, func_id)
+                if "class" in func:
+                    by_method.setdefault(func["name"], []).append(func_id)
+                    method_ids.add(func_id)
+                open_spans.append((func["end_lineno"], qualname))
+                defs.append((func["lineno"], func["end_lineno"], func_id, func.get("class")))
+            for c in info["classes"]:
+                if f"{c['name']}.__init__" in table:
+                    table.setdefault(c["name"], table[f"{c['name']}.__init__"])
+            # Paint each line with its innermost definition: outer spans first, inner ones over them.
+            owner = np.full(max((d[1] for d in defs), default=0) + 2, -1, dtype=np.int32)
+            for i in sorted(range(len(defs)), key=lambda i: defs[i][0] - defs[i][1]):
+                owner[defs[i][0]:defs[i][1] + 1] = i
+            owners[path] = (owner, defs)
+
+        sources, targets = [], []
+        for path, module in sorted(file_module_map.items(), key=lambda item: item[1]):
+            info = parsed.get(path, {})
+            if info.get("error"):
+                continue
+            imported_names, imported_modules, visible = {}, {}, [module]
+            for imp in info["imports"]:
+                if imp["module"] is None:
+                    target = resolve(imp["name"])
+                    if target:
+                        imported_modules[imp["asname"] or imp["name"]] = target
+                        visible.append(target)
+                    continue
+                submodule = resolve(f"{imp['module']}.{imp['name']}")
+                target = resolve(imp["module"])
+                if submodule:
+                    imported_modules[imp["asname"] or imp["name"]] = submodule
+                    visible.append(submodule)
+                elif target:
+                    imported_names[imp["asname"] or imp["name"]] = (target, imp["name"])
+                    visible.append(target)
+
+            def lookup(module_name, name):
+                return local.get(module_name, {}).get(name)
+
+            owner, defs = owners[path]
+            for call in info["function_calls"]:
+                caller = defs[owner[call["lineno"]]] if call["lineno"] < len(owner) and owner[call["lineno"]] >= 0 else None
+                caller_id = caller[2] if caller else intern(f"{module}.{MODULE_CODE}", path, 0, 0)
+                name = call["name"]
+                callees = []
+                if DOTTED.fullmatch(name):
+                    parts = name.split(".")
+                    head, attr = ".".join(parts[:-1]), parts[-1]
+                    if not head:
+                        # Enclosing function scopes first (class bodies are not scopes for calls).
+                        scope, found = names[caller_id][len(module) + 1:] if caller else "", None
+                        while scope and found is None:
+                            found = lookup(module, f"{scope}.{attr}")
+                            found = None if found in method_ids else found
+                            scope = scope.rpartition(".")[0]
+                        if found is None:
+                            found = lookup(module, attr)
+                        if found is None and attr in imported_names:
+                            found = lookup(*imported_names[attr])
+                        callees = [found] if found is not None else []
+                    elif head in ("self", "cls") and caller and caller[3]:
+                        found = lookup(module, f"{caller[3]}.{attr}")
+                        callees = [found] if found is not None else []
+                    elif head in imported_modules:
+                        found = lookup(imported_modules[head], attr)
+                        callees = [found] if found is not None else []
+                    elif lookup(module, f"{head}.{attr}") is not None:
+                        callees = [lookup(module, f"{head}.{attr}")]
+                    elif head in imported_names and lookup(imported_names[head][0], f"{imported_names[head][1]}.{attr}") is not None:
+                        callees = [lookup(imported_names[head][0], f"{imported_names[head][1]}.{attr}")]
+                    if not callees and head:
+                        callees = [i for m in dict.fromkeys(visible) for i in methods.get(m, {}).get(attr, ())]
+                else:
+                    match = LAST_NAME.search(name)
+                    if match:
+                        callees = [i for m in dict.fromkeys(visible) for i in methods.get(m, {}).get(match.group(1), ())]
+                if len(callees) > max_fanout:
+                    continue
+                for callee in callees:
+                    if callee != caller_id:
+                        sources.append(caller_id)
+                        targets.append(callee)
+        return cls(names, sources, targets, files, lines, end_lines, file_module_map)
+
+    def id(self, name):
+        """Id of a qualified name, or of the one name ending in ".name"; KeyError otherwise."""
+        if name in self.index:
+            return self.index[name]
+        matches = self.find(name)
+        if len(matches) != 1:
+            raise KeyError(f"{name!r} matches {len(matches)} functions" + (f": {', '.join(matches[:5])}" if matches else ""))
+        return self.index[matches[0]]
+
+    def find(self, suffix):
+        """Qualified names equal to suffix or ending in "." + suffix."""
+        dotted = "." + suffix
+        return [name for name in self.names if name == suffix or name.endswith(dotted)]
+
+    def callee_ids(self, i):
+        return self.out_ids[self.out_offsets[i]:self.out_offsets[i + 1]]
+
+    def caller_ids(self, i):
+        return self.in_ids[self.in_offsets[i]:self.in_offsets[i + 1]]
+
+    def callees(self, name):
+        return [self.names[i] for i in self.callee_ids(self.id(name))]
+
+    def callers(self, name):
+        return [self.names[i] for i in self.caller_ids(self.id(name))]
+
+    def neighborhood_ids(self, start, k=2, direction="both"):
+        """(ids, hop distances) of everything within k calls of start, start itself at distance 0.
+
+        Small frontiers walk the CSR slices directly; once a hop reaches VECTOR_FRONTIER nodes the
+        rows are gathered in one vectorized step, so wide fan-outs do not loop in Python per node.
+        """
+        rows = []
+        if direction in ("out", "both"):
+            rows.append((self.out_offsets, self.out_ids))
+        if direction in ("in", "both"):
+            rows.append((self.in_offsets, self.in_ids))
+        distance, frontier = {int(start): 0}, [int(start)]
+        for hop in range(1, k + 1):
+            if len(frontier) < VECTOR_FRONTIER:
+                reached = [j for i in frontier for offsets, ids in rows
+                           for j in ids[offsets[i]:offsets[i + 1]].tolist()]
+            else:
+                nodes = np.asarray(frontier, dtype=np.int64)
+                reached = np.unique(np.concatenate([_gather(offsets, ids, nodes) for offsets, ids in rows])).tolist()
+            frontier = []
+            for j in reached:
+                if j not in distance:
+                    distance[j] = hop
+                    frontier.append(j)
+            if not frontier:
+                break
+        ids = np.fromiter(distance, dtype=np.int64, count=len(distance))
+        hops = np.fromiter(distance.values(), dtype=np.int32, count=len(distance))
+        order = np.argsort(ids)
+        return ids[order], hops[order]
+
+    def neighborhood(self, name, k=2, direction="both"):
+        """{qualified name: hops} within k calls of name; direction "out" follows callees, "in" callers."""
+        if direction not in ("out", "in", "both"):
+            raise ValueError(f"Unknown direction '{direction}'; use out, in or both")
+        ids, hops = self.neighborhood_ids(self.id(name), k, direction)
+        return {self.names[i]: int(h) for i, h in sorted(zip(ids, hops), key=lambda item: item[1])}
+
+    def save(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        for name in ("out_offsets", "out_ids", "in_offsets", "in_ids", "lines", "end_lines"):
+            tmp_path = os.path.join(directory, f".{name}.tmp.npy")
+            np.save(tmp_path, getattr(self, name))
+            os.replace(tmp_path, os.path.join(directory, f"{name}.npy"))
+        tmp_path = os.path.join(directory, ".meta.tmp.json")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": FORMAT_VERSION, "names": self.names, "files": self.files, "modules": self.modules},
+                      f, separators=(",", ":"))
+        os.replace(tmp_path, os.path.join(directory, "meta.json"))
+
+    @classmethod
+    def load(cls, directory):
+        with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported call graph format {meta.get('version')} in {directory}; rebuild it")
+        graph = cls.__new__(cls)
+        graph.names = [sys.intern(name) for name in meta["names"]]
+        graph.index = {name: i for i, name in enumerate(graph.names)}
+        graph.files = meta["files"]
+        graph.modules = meta["modules"]
+        for name in ("out_offsets", "out_ids", "in_offsets", "in_ids", "lines", "end_lines"):
+            setattr(graph, name, np.load(os.path.join(directory, f"{name}.npy")))
+        return graph
+
+
+def main():
+    from src.retriever.BM25Index import load_files
+    parser = argparse.ArgumentParser(description="Query a function-level call graph of a Python codebase.")
+    parser.add_argument("path", help="Codebase directory")
+    parser.add_argument("query", choices=["callers", "callees", "hops"])
+    parser.add_argument("name", help="Qualified name, or any unambiguous dotted suffix of one")
+    parser.add_argument("-k", type=int, default=2, help="Hops for the hops query")
+    parser.add_argument("--direction", choices=["out", "in", "both"], default="both")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    graph = CallGraph.from_codebase(load_files(args.path))
+    print(f"{len(graph)} functions, {graph.num_edges} calls in {time.perf_counter() - start:.2f}s")
+    start = time.perf_counter()
+    if args.query == "hops":
+        result = [f"{hops}  {name}" for name, hops in graph.neighborhood(args.name, args.k, args.direction).items()]
+    else:
+        result = getattr(graph, args.query)(args.name)
+    print(f"{len(result)} results in {(time.perf_counter() - start) * 1000:.3f} ms")
+    for line in result:
+        print(f"  {line}")
+
+
+if __name__ == "__main__":
+    main()
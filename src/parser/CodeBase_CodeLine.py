@@ -1,11 +1,12 @@
 import os
 import ast
-import networkx as nx
 import tokenize
 import io
 import sys
+import contextlib
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 from src.downloader.Z_U_F import load_codebase
+from src.parser.GraphExport import to_dot, write_dot
 import builtins
 import keyword  
 
@@ -17,18 +18,35 @@ INBUILT_DATASTRUCTURES = {
     "DefaultDict", "OrderedDict", "array", "queue", "bytes", "bytearray", "memoryview"
 }
 
+def body_start(node):
+    body = node.body
+    if body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant) \
+            and isinstance(body[0].value.value, str):
+        body = body[1:]
+    return body[0].lineno if body else None
+
 class CodebaseAnalyzer:
     def __init__(self, base_path):
         self.base_path = base_path
-        self.graph = nx.DiGraph()
+        self.__graph = None
         self.parsed = {}
         self.file_module_map = {}
         self.module_file_map = {}
         self.directory_structure = []
+        self.metrics = None
+
+    @property
+    def graph(self):
+        """The module dependency graph, created on first use so analyzers that only call
+        analyze_code (Skeleton, StaticSummary) never import networkx."""
+        if self.__graph is None:
+            import networkx as nx
+            self.__graph = nx.DiGraph()
+        return self.__graph
 
     def is_probably_datastructure(self, class_node):
         special_methods = {"__getitem__", "__setitem__", "__delitem__", "__iter__", "__next__", "__len__", "__contains__"}
-        method_names = {n.name for n in class_node.body if isinstance(n, ast.FunctionDef)}
+        method_names = {n.name for n in class_node.body if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))}
         if special_methods & method_names:
             return True
         for base in class_node.bases:
@@ -107,13 +125,15 @@ class CodebaseAnalyzer:
             "user_ds": set(),
             "inbuilt_ds": set(),
             "comments": [],
-            "uses_self": False
+            "uses_self": False,
+            "docstring": None
         }
         user_defined_funcs = set()
         user_defined_methods = set()
         if not error:
+            info["docstring"] = ast.get_docstring(tree)
             for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef):
+                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
                     parent = getattr(node, "parent", None)
                     if isinstance(parent, ast.ClassDef):
                         user_defined_methods.add(node.name)
@@ -124,7 +144,7 @@ class CodebaseAnalyzer:
                     child.parent = node
                 if isinstance(node, ast.Name) and node.id == "self":
                     info["uses_self"] = True
-                if isinstance(node, ast.FunctionDef):
+                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
                     parent = getattr(node, "parent", None)
                     func_info = {
                         "name": node.name,
@@ -132,12 +152,16 @@ class CodebaseAnalyzer:
                         "returns": ast.unparse(node.returns) if node.returns else None,
                         "decorators": [ast.unparse(dec) for dec in node.decorator_list],
                         "lineno": node.lineno,
+                        "end_lineno": node.end_lineno,
+                        "body_lineno": body_start(node),
+                        "docstring": ast.get_docstring(node),
                         "return_exprs": []
                     }
                     for n in ast.walk(node):
                         if isinstance(n, ast.Return) and n.value:
                             func_info["return_exprs"].append(ast.unparse(n.value))
                     if isinstance(parent, ast.ClassDef):
+                        func_info["class"] = parent.name
                         info["methods"].append(func_info)
                         info["user_method"].add(node.name)
                     else:
@@ -151,6 +175,8 @@ class CodebaseAnalyzer:
                         "name": node.name,
                         "bases": [ast.unparse(base) for base in node.bases],
                         "lineno": node.lineno,
+                        "end_lineno": node.end_lineno,
+                        "docstring": ast.get_docstring(node),
                         "is_datastructure": is_ds
                     })
                     if is_ds:
@@ -160,7 +186,8 @@ class CodebaseAnalyzer:
                         info["imports"].append({
                             "module": getattr(node, 'module', None),
                             "name": alias.name,
-                            "asname": alias.asname
+                            "asname": alias.asname,
+                            "lineno": node.lineno
                         })
                 elif isinstance(node, (ast.Assign, ast.AugAssign)):
                     targets = [node.target] if hasattr(node, 'target') else node.targets
@@ -229,7 +256,7 @@ class CodebaseAnalyzer:
                 if isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant):
                     if isinstance(node.value.value, str):
                         parent = getattr(node, 'parent', None)
-                        if not isinstance(parent, (ast.FunctionDef, ast.ClassDef, ast.Module)):
+                        if not isinstance(parent, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Module)):
                             info["comments"].append({
                                 "text": node.value.value.strip(),
                                 "lineno": node.lineno,
@@ -263,8 +290,15 @@ class CodebaseAnalyzer:
             )
         elif criteria == "name":
             files = sorted(files)
+        elif criteria == "pagerank":
+            ranks = (self.metrics or self.compute_metrics())["pagerank"]
+            files = sorted(
+                files,
+                key=lambda f: ranks.get(self.file_module_map[f], 0.0),
+                reverse=True
+            )
         else:
-            print(f"Error: Invalid criteria {criteria}. Use 'function_calls', 'size', or 'name'.", flush=True)
+            print(f"Error: Invalid criteria {criteria}. Use 'function_calls', 'size', 'name' or 'pagerank'.", flush=True)
             return []
         return files[:min(num_files, len(files))]
 
@@ -289,14 +323,9 @@ class CodebaseAnalyzer:
             }
         return result
 
-    def analyze(self, sort_by="function_calls"):
-        self.directory_structure = []
-        print("\n=== Directory Structure ===\n", flush=True)
-        self.print_directory_structure()
-        print("\n", flush=True)
-        code_dict = load_codebase(self.base_path)
+    def parse_files(self, code_dict, max_size=5000):
         for file_path, code in code_dict.items():
-            if len(code) > 5000:
+            if len(code) > max_size:
                 print(f"Skipping large file: {file_path} ({len(code)} bytes)", flush=True)
                 continue
             if not file_path.endswith('.py'):
@@ -307,6 +336,12 @@ class CodebaseAnalyzer:
             self.module_file_map[module_name] = file_path
             self.parsed[file_path] = self.analyze_code(code, file_path)
             print(f"Parsed: {module_name}", flush=True)
+
+    def build_graph(self, sort_by="function_calls"):
+        defined_in = {}
+        for mod, mod_file in self.module_file_map.items():
+            for name in {f["name"] for f in self.parsed.get(mod_file, {}).get("functions", [])}:
+                defined_in.setdefault(name, []).append(mod)
         module_order = list(self.module_file_map.keys())
         if sort_by == "function_calls":
             module_order = sorted(
@@ -332,13 +367,20 @@ class CodebaseAnalyzer:
             call_edges = []
             for call in data.get("user_function_calls", []):
                 callee = call["name"].split(".")[0]
-                for mod, mod_file in self.module_file_map.items():
-                    mod_data = self.parsed.get(mod_file, {})
-                    user_funcs = {f["name"] for f in mod_data.get("functions", [])}
-                    if callee in user_funcs and mod != module:
+                for mod in defined_in.get(callee, ()):
+                    if mod != module:
                         call_edges.append((mod, module, callee))
             for src, dst, callee in sorted(call_edges, key=lambda x: x[2]):
                 self.graph.add_edge(src, dst)
+
+    def analyze(self, sort_by="function_calls"):
+        self.directory_structure = []
+        print("\n=== Directory Structure ===\n", flush=True)
+        self.print_directory_structure()
+        print("\n", flush=True)
+        code_dict = load_codebase(self.base_path)
+        self.parse_files(code_dict)
+        self.build_graph(sort_by)
         print(f"\nGraph built with {self.graph.number_of_nodes()} nodes and {self.graph.number_of_edges()} edges.", flush=True)
         print("Modules:", flush=True)
         for node in sorted(self.graph.nodes):
@@ -346,20 +388,37 @@ class CodebaseAnalyzer:
         print("Dependencies:", flush=True)
         for u, v in sorted(self.graph.edges):
             print(f" - {u} -> {v}", flush=True)
+        self.compute_metrics()
+        print(f"Metrics: {len(self.metrics['cycles'])} import cycles, {self.metrics['num_layers']} layers.", flush=True)
         return {
             "directory": "\n".join(self.directory_structure),
             "ast": self.parsed,
-            "graph": self.to_dot()
+            "graph": self.to_dot(),
+            "metrics": self.metrics
         }
 
-    def to_dot(self):
-        dot = ['digraph G {']
-        for node in sorted(self.graph.nodes):
-            dot.append(f'"{node}"')
-        for u, v in sorted(self.graph.edges):
-            dot.append(f'"{u}" -> "{v}";')
-        dot.append('}')
-        return '\n'.join(dot)    
+    def compute_metrics(self):
+        """PageRank, import cycles, layers and fan-in/fan-out of the module graph (see GraphMetrics).
+
+        Import targets are resolved onto the parsed modules first, so "pkg.mod" and "src.pkg.mod"
+        count as one module; the graph is built here if analyze() has not run.
+        """
+        from src.parser.CallGraph import module_resolver   # CallGraph imports this module
+        from src.parser.GraphMetrics import graph_metrics   # numpy/scipy only when metrics are asked for
+        if not self.graph:
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.build_graph()
+        resolve = module_resolver(self.module_file_map)
+        self.metrics = graph_metrics(self.graph, lambda node: resolve(node) or node)
+        return self.metrics
+
+    def to_dot(self, f=None):
+        """DOT text for the dependency graph, or written to text file object f as it is generated
+        (see GraphExport for GraphML / JSON and k-hop or package subgraphs)."""
+        if f is not None:
+            write_dot(self.graph, f)
+            return None
+        return to_dot(self.graph)
 
 
 #analyzer=CodebaseAnalyzer(r"C:\Users\Yatharth_Shivam\OneDrive\Documents\repos\seering\src")
@@ -0,0 +1,193 @@
+import os
+import io
+import sys
+import json
+import heapq
+import pickle
+import argparse
+import tempfile
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+FORMATS = {".dot": "dot", ".gv": "dot", ".graphml": "graphml", ".json": "json"}
+SORT_CHUNK = 200000    # items sorted in memory before a run is spilled to a temporary file
+SPILL_BLOCK = 8192     # items per pickled block in a spilled run
+
+
+def escape_dot(name):
+    """name as a DOT quoted string body: backslashes, quotes and line breaks escaped."""
+    return str(name).replace("\\", "\\\\").replace('"', '\\"').replace("\r", "").replace("\n", "\\n")
+
+
+def _read_run(run):
+    """Items of a spilled run, one pickled block at a time."""
+    while True:
+        try:
+            yield from pickle.load(run)
+        except EOFError:
+            return
+
+
+def external_sort(items, chunk_size=SORT_CHUNK):
+    """Yield string tuples in sorted order, holding at most chunk_size of them in memory.
+
+    Sorted runs beyond the first are spilled to temporary files in pickled blocks and merged with
+    heapq.merge, so ordering a graph does not need all of its nodes or edges in one list.
+    """
+    runs, chunk = [], []
+    try:
+        for item in items:
+            chunk.append(item)
+            if len(chunk) >= chunk_size:
+                chunk.sort()
+                run = tempfile.TemporaryFile()
+                for start in range(0, len(chunk), SPILL_BLOCK):
+                    pickle.dump(chunk[start:start + SPILL_BLOCK], run, pickle.HIGHEST_PROTOCOL)
+                run.seek(0)
+                runs.append(run)
+                chunk = []
+        chunk.sort()
+        if not runs:
+            yield from chunk
+            return
+        yield from heapq.merge(*(_read_run(run) for run in runs), chunk)
+    finally:
+        for run in runs:
+            run.close()
+
+
+def _nodes(graph, sort, chunk_size):
+    if not sort:
+        return (str(node) for node in graph.nodes)
+    return (node for (node,) in external_sort(((str(node),) for node in graph.nodes), chunk_size))
+
+
+def _edges(graph, sort, chunk_size):
+    edges = ((str(u), str(v)) for u, v in graph.edges)
+    return external_sort(edges, chunk_size) if sort else edges
+
+
+def write_dot(graph, f, sort=True, name="G", chunk_size=SORT_CHUNK):
+    """Write graph to text file object f as DOT, one line per node then per edge."""
+    f.write(f"digraph {name} {{\n")
+    for node in _nodes(graph, sort, chunk_size):
+        f.write(f'"{escape_dot(node)}"\n')
+    for u, v in _edges(graph, sort, chunk_size):
+        f.write(f'"{escape_dot(u)}" -> "{escape_dot(v)}";\n')
+    f.write("}")
+
+
+def write_graphml(graph, f, sort=True, chunk_size=SORT_CHUNK):
+    """Write graph to text file object f as GraphML (readable by networkx.read_graphml, yEd, Gephi)."""
+    from xml.sax.saxutils import quoteattr   # pulls in urllib; only GraphML needs it
+    f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+            '  <graph edgedefault="directed">\n')
+    for node in _nodes(graph, sort, chunk_size):
+        f.write(f"    <node id={quoteattr(node)}/>\n")
+    for u, v in _edges(graph, sort, chunk_size):
+        f.write(f"    <edge source={quoteattr(u)} target={quoteattr(v)}/>\n")
+    f.write("  </graph>\n</graphml>\n")
+
+
+def write_json(graph, f, sort=True, chunk_size=SORT_CHUNK):
+    """Write graph to text file object f as JSON adjacency: {"directed": true, "adjacency": {node: [targets]}}.
+
+    Sorted output merges the sorted node and edge streams, so every node appears once, in order,
+    with its targets in order, without grouping the edges in memory.
+    """
+    f.write('{"directed": true, "adjacency": {')
+    if sort:
+        edges = iter(_edges(graph, True, chunk_size))
+        edge = next(edges, None)
+        for i, node in enumerate(_nodes(graph, True, chunk_size)):
+            targets = []
+            while edge is not None and edge[0] == node:
+                targets.append(edge[1])
+                edge = next(edges, None)
+            f.write(("," if i else "") + f"\n{json.dumps(node)}: {json.dumps(targets)}")
+    else:
+        for i, (node, neighbors) in enumerate(graph.adjacency()):
+            f.write(("," if i else "") + f"\n{json.dumps(str(node))}: {json.dumps([str(v) for v in neighbors])}")
+    f.write("\n}}\n")
+
+
+WRITERS = {"dot": write_dot, "graphml": write_graphml, "json": write_json}
+
+
+def khop_subgraph(graph, center, k=2, direction="both"):
+    """View of graph restricted to nodes within k edges of center ("out", "in" or "both" ways)."""
+    if center not in graph:
+        raise KeyError(f"{center!r} is not in the graph")
+    if direction not in ("out", "in", "both"):
+        raise ValueError(f"Unknown direction '{direction}'; use out, in or both")
+    seen, frontier = {center}, [center]
+    for _ in range(k):
+        reached = []
+        for node in frontier:
+            if direction in ("out", "both"):
+                reached.extend(v for v in graph.successors(node) if v not in seen and not seen.add(v))
+            if direction in ("in", "both"):
+                reached.extend(u for u in graph.predecessors(node) if u not in seen and not seen.add(u))
+        frontier = reached
+    return graph.subgraph(seen)
+
+
+def package_subgraph(graph, package):
+    """View of graph restricted to package and the modules under it ("pkg" keeps "pkg.mod", "pkg.sub.mod")."""
+    prefix = package + "."
+    return graph.subgraph(node for node in graph if str(node) == package or str(node).startswith(prefix))
+
+
+def export(graph, output, fmt=None, sort=True, center=None, hops=2, direction="both", package=None):
+    """Write graph (or its k-hop / package subgraph) to a path or text file object.
+
+    fmt defaults to the path's extension (.dot/.gv, .graphml, .json).
+    """
+    if package is not None:
+        graph = package_subgraph(graph, package)
+    if center is not None:
+        graph = khop_subgraph(graph, center, hops, direction)
+    if fmt is None:
+        if not isinstance(output, str):
+            raise ValueError("Pass fmt when writing to a file object")
+        fmt = FORMATS.get(os.path.splitext(output)[1].lower())
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown format '{fmt}'; use one of {', '.join(WRITERS)}")
+    if isinstance(output, str):
+        with open(output, "w", encoding="utf-8") as f:
+            WRITERS[fmt](graph, f, sort=sort)
+    else:
+        WRITERS[fmt](graph, output, sort=sort)
+    return graph
+
+
+def to_dot(graph, sort=True):
+    """DOT text for graph; use write_dot with a file for graphs too large to hold as one string."""
+    buffer = io.StringIO()
+    write_dot(graph, buffer, sort=sort)
+    return buffer.getvalue()
+
+
+def main():
+    from src.parser.Reachability import module_graph
+    from src.retriever.BM25Index import load_files
+    parser = argparse.ArgumentParser(description="Export a codebase's module dependency graph as DOT, GraphML or JSON.")
+    parser.add_argument("path", help="Codebase directory")
+    parser.add_argument("output", help="File to write; '-' for stdout (needs --format)")
+    parser.add_argument("--format", choices=sorted(WRITERS), default=None)
+    parser.add_argument("--center", help="Only export modules within --hops of this one")
+    parser.add_argument("--hops", type=int, default=2)
+    parser.add_argument("--direction", choices=["out", "in", "both"], default="both")
+    parser.add_argument("--package", help="Only export this package's modules")
+    parser.add_argument("--no-sort", action="store_true", help="Write in graph order instead of sorted")
+    args = parser.parse_args()
+
+    graph = module_graph(load_files(args.path))
+    output = sys.stdout if args.output == "-" else args.output
+    written = export(graph, output, args.format, not args.no_sort, args.center, args.hops, args.direction, args.package)
+    if output is not sys.stdout:
+        print(f"Wrote {written.number_of_nodes()} nodes and {written.number_of_edges()} edges to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import tempfile
+import numpy as np
+import networkx as nx
+from scipy.sparse.csgraph import connected_components
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.parser.GraphMetrics import adjacency, topological_layers
+
+LAYOUTS = ("layered", "force")
+LAYOUT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "seering-layouts")
+LABEL_LIMIT = 150     # above this many nodes labels are dropped
+ARROW_LIMIT = 400     # above this many edges they are drawn as one collection of plain lines
+OTHER = "(other)"
+GRAVITY = 1.0
+
+
+def graph_hash(graph):
+    """Hash of a graph's nodes and edges, independent of insertion order."""
+    digest = hashlib.sha1()
+    for node in sorted(map(str, graph.nodes)):
+        digest.update(node.encode("utf-8") + b"\0")
+    digest.update(b"\1")
+    for u, v in sorted((str(u), str(v)) for u, v in graph.edges):
+        digest.update(u.encode("utf-8") + b"\0" + v.encode("utf-8") + b"\0")
+    return digest.hexdigest()
+
+
+def cluster_by_package(graph, max_nodes):
+    """Level of detail: merge modules into their package prefixes, using the deepest prefix that
+    leaves at most max_nodes clusters. If even top-level packages are too many, the smallest are
+    merged into one "(other)" node. Returns (clustered graph, {cluster: modules in it}); edges
+    carry a weight counting the module edges they stand for."""
+    parts = {node: str(node).split(".") for node in graph}
+    depth = max((len(p) for p in parts.values()), default=1)
+    while True:
+        clusters = {node: ".".join(p[:depth]) for node, p in parts.items()}
+        if depth == 1 or len(set(clusters.values())) <= max_nodes:
+            break
+        depth -= 1
+    sizes = {}
+    for cluster in clusters.values():
+        sizes[cluster] = sizes.get(cluster, 0) + 1
+    if len(sizes) > max_nodes:
+        keep = set(sorted(sizes, key=lambda c: (-sizes[c], c))[:max_nodes - 1])
+        clusters = {node: cluster if cluster in keep else OTHER for node, cluster in clusters.items()}
+        sizes = {}
+        for cluster in clusters.values():
+            sizes[cluster] = sizes.get(cluster, 0) + 1
+    clustered = nx.DiGraph()
+    clustered.add_nodes_from(sizes)
+    for u, v in graph.edges:
+        cu, cv = clusters[u], clusters[v]
+        if cu != cv:
+            weight = clustered.edges[cu, cv]["weight"] + 1 if clustered.has_edge(cu, cv) else 1
+            clustered.add_edge(cu, cv, weight=weight)
+    return clustered, sizes
+
+
+def layered_layout(graph, sweeps=4):
+    """Layered DAG layout: x is the topological layer (cycles share one), y the order within the
+    layer after barycenter sweeps that pull each node towards its neighbors in the previous
+    (then next) layer. Linear in the edges per sweep, so it scales where spring_layout does not."""
+    nodes, matrix = adjacency(graph)
+    n = len(nodes)
+    if not n:
+        return nodes, np.zeros((0, 2))
+    count, labels = connected_components(matrix, directed=True, connection="strong")
+    layer = topological_layers(matrix, labels, count)[labels]
+    layer_sizes = np.bincount(layer)
+    layer_starts = np.concatenate([[0], np.cumsum(layer_sizes)[:-1]])
+    y = np.zeros(n)
+
+    def rank_within_layers(key):
+        order = np.lexsort((key, layer))
+        y[order] = np.arange(n) - layer_starts[layer[order]]
+
+    rank_within_layers(np.arange(n))
+    predecessors, successors = matrix.T.tocsr(), matrix
+    in_degree = np.asarray(predecessors.sum(axis=1)).ravel()
+    out_degree = np.asarray(successors.sum(axis=1)).ravel()
+    for sweep in range(sweeps):
+        neighbors, degree = (predecessors, in_degree) if sweep % 2 == 0 else (successors, out_degree)
+        barycenter = np.divide(neighbors @ y, degree, out=y.copy(), where=degree > 0)
+        rank_within_layers(barycenter)
+    pos = np.column_stack([layer.astype(float), y - (layer_sizes[layer] - 1) / 2.0])
+    return nodes, _normalize(pos)
+
+
+def force_layout(graph, iterations=50, seed=0):
+    """Fruchterman-Reingold force layout with grid Barnes-Hut repulsion in NumPy.
+
+    Nodes are binned into a grid of about sqrt(n) cells; a node is repelled exactly by the nodes
+    in its own cell and by every other cell as one mass at its center, so an iteration costs
+    O(n^1.5) array work instead of spring_layout's O(n^2) in Python.
+    """
+    nodes, matrix = adjacency(graph)
+    n = len(nodes)
+    if n < 3:
+        return nodes, _normalize(np.array([[i, 0.0] for i in range(n)]).reshape(n, 2))
+    rng = np.random.default_rng(seed)
+    pos = rng.random((n, 2))
+    edges = (matrix + matrix.T).tocoo()
+    k = 1.0 / np.sqrt(n)
+    grid = int(np.clip(n ** 0.25, 1, 64))
+    temperature = 0.1
+    for _ in range(iterations):
+        low = pos.min(axis=0)
+        span = (pos.max(axis=0) - low).max() + 1e-12
+        cells = np.minimum(((pos - low) / span * grid).astype(np.int64), grid - 1)
+        cell = cells[:, 0] * grid + cells[:, 1]
+        mass = np.bincount(cell, minlength=grid * grid).astype(float)
+        occupied = np.flatnonzero(mass)
+        centers = np.column_stack([np.bincount(cell, pos[:, 0], grid * grid)[occupied],
+                                   np.bincount(cell, pos[:, 1], grid * grid)[occupied]]) / mass[occupied, None]
+        slot = np.full(grid * grid, -1)
+        slot[occupied] = np.arange(len(occupied))
+        displacement = np.zeros_like(pos)
+        for start in range(0, n, 4096):
+            block = slice(start, start + 4096)
+            dx = pos[block, 0, None] - centers[None, :, 0]
+            dy = pos[block, 1, None] - centers[None, :, 1]
+            weight = mass[occupied][None, :] * (k * k) / (dx * dx + dy * dy + 1e-9)
+            weight[np.arange(dx.shape[0]), slot[cell[block]]] = 0.0        # own cell is handled exactly below
+            # sum_c w_ic (p_i - c_c) = p_i * sum_c w_ic - W @ c, one matrix product per block.
+            displacement[block] = pos[block] * weight.sum(axis=1)[:, None] - weight @ centers
+        order = np.argsort(cell, kind="stable")
+        for members in np.split(order, np.flatnonzero(np.diff(cell[order])) + 1):
+            if len(members) > 1:
+                members_pos = pos[members]
+                dx = members_pos[:, 0, None] - members_pos[None, :, 0]
+                dy = members_pos[:, 1, None] - members_pos[None, :, 1]
+                weight = (k * k) / (dx * dx + dy * dy + 1e-9)
+                np.fill_diagonal(weight, 0.0)
+                displacement[members] += members_pos * weight.sum(axis=1)[:, None] - weight @ members_pos
+        delta = pos[edges.row] - pos[edges.col]
+        pull = delta * (np.sqrt((delta ** 2).sum(axis=1)) / k)[:, None]
+        np.add.at(displacement, edges.row, -pull)
+        displacement -= (pos - pos.mean(axis=0)) * GRAVITY      # keeps disconnected parts from drifting off
+        length = np.maximum(np.sqrt((displacement ** 2).sum(axis=1)), 1e-9)
+        pos += displacement * (np.minimum(length, temperature) / length)[:, None]
+        temperature -= 0.1 / (iterations + 1)
+    return nodes, _normalize(pos)
+
+
+def _normalize(pos):
+    """Center on the origin and scale into [-1, 1] on the longer axis."""
+    if not len(pos):
+        return pos
+    pos = pos - pos.mean(axis=0)
+    scale = np.abs(pos).max()
+    return pos / scale if scale > 0 else pos
+
+
+def cached_layout(graph, layout="layered", cache_dir=LAYOUT_CACHE_DIR):
+    """{node: (x, y)} for graph, reusing a layout saved under cache_dir for the same graph hash."""
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout '{layout}'; use one of {', '.join(LAYOUTS)}")
+    path = os.path.join(cache_dir, f"{graph_hash(graph)}-{layout}.npy") if cache_dir else None
+    nodes = sorted(graph.nodes, key=str)
+    if path and os.path.exists(path):
+        pos = np.load(path)
+    else:
+        nodes, pos = layered_layout(graph) if layout == "layered" else force_layout(graph)
+        if path:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = os.path.join(cache_dir, f".{os.getpid()}.tmp.npy")
+            np.save(tmp_path, pos)
+            os.replace(tmp_path, path)
+    return {node: (float(x), float(y)) for node, (x, y) in zip(nodes, pos)}
+
+
+def render(graph, pos, output, sizes=None, title="Dependency Graph"):
+    """Draw graph at pos to output (.png, .svg, .pdf ... by extension) with matplotlib's
+    non-interactive canvas, so it works without a display and never blocks.
+
+    Small graphs get labelled boxes and arrows; larger ones points and plain edge lines. sizes
+    ({node: modules}) scales clustered nodes and adds the count to their labels.
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.collections import LineCollection
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    n = graph.number_of_nodes()
+    side = float(np.clip(4 + np.sqrt(n) / 2, 10, 30))
+    figure = Figure(figsize=(side * 1.4, side))
+    FigureCanvasAgg(figure)
+    ax = figure.add_subplot()
+    ax.set_title(title, fontsize=14)
+    ax.axis("off")
+    nodes = list(graph.nodes)
+    xy = np.array([pos[node] for node in nodes]).reshape(-1, 2)
+    weight = np.array([(sizes or {}).get(node, 1) for node in nodes], dtype=float)
+    if graph.number_of_edges() <= ARROW_LIMIT:
+        nx.draw_networkx_edges(graph, pos, ax=ax, arrows=True, arrowstyle="->", arrowsize=14, width=1.0,
+                               edge_color="black", node_size=1500, min_source_margin=15, min_target_margin=20)
+    else:
+        segments = [(pos[u], pos[v]) for u, v in graph.edges]
+        ax.add_collection(LineCollection(segments, colors="gray", linewidths=0.3, alpha=0.4))
+    if n <= LABEL_LIMIT:
+        labels = {node: f"{node} ({sizes[node]})" if sizes else str(node) for node in nodes}
+        nx.draw_networkx_labels(graph, pos, labels=labels, ax=ax, font_size=9, font_color="white",
+                                bbox=dict(boxstyle="round,pad=0.4", edgecolor="black", facecolor="blue"))
+        ax.margins(x=0.2, y=0.05)     # room for labels centered on the outermost nodes
+    else:
+        ax.scatter(xy[:, 0], xy[:, 1], s=4 + 30 * weight / weight.max(), c="tab:blue", linewidths=0, zorder=2)
+    ax.autoscale_view()
+    figure.tight_layout()
+    figure.savefig(output)
+    return output
+
+
+def main():
+    from src.parser.Reachability import module_graph
+    from src.retriever.BM25Index import load_files
+    parser = argparse.ArgumentParser(description="Render a codebase's module dependency graph to an image file.")
+    parser.add_argument("path", help="Codebase directory")
+    parser.add_argument("output", help="Image to write (.png, .svg or .pdf)")
+    parser.add_argument("--layout", choices=LAYOUTS, default="layered")
+    parser.add_argument("--max-nodes", type=int, default=200, help="Cluster by package above this many modules")
+    parser.add_argument("--cache-dir", default=LAYOUT_CACHE_DIR, help="Layout cache ('' to disable)")
+    args = parser.parse_args()
+
+    graph = module_graph(load_files(args.path))
+    sizes = None
+    if graph.number_of_nodes() > args.max_nodes:
+        graph, sizes = cluster_by_package(graph, args.max_nodes)
+    start = time.perf_counter()
+    pos = cached_layout(graph, args.layout, args.cache_dir or None)
+    layout_seconds = time.perf_counter() - start
+    render(graph, pos, args.output, sizes)
+    print(json.dumps({"nodes": graph.number_of_nodes(), "edges": graph.number_of_edges(), "clustered": sizes is not None,
+                      "layout_seconds": round(layout_seconds, 3), "output": args.output}))
+
+
+if __name__ == "__main__":
+    main()
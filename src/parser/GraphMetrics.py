@@ -0,0 +1,115 @@
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+
+
+def adjacency(graph, resolve=None):
+    """(nodes, CSR matrix) for a networkx DiGraph, nodes sorted so the export is deterministic.
+
+    resolve optionally maps each node onto another name (e.g. an import target onto the module
+    that defines it); nodes mapping to the same name are merged and self loops dropped.
+    """
+    resolve = resolve or (lambda node: node)
+    names = {node: resolve(node) for node in graph.nodes}
+    nodes = sorted(set(names.values()), key=str)
+    index = {node: i for i, node in enumerate(nodes)}
+    position = {node: index[name] for node, name in names.items()}
+    # One pass over networkx's adjacency dicts: sources repeat by out-degree, targets are looked up.
+    sources, degrees, targets = [], [], []
+    for u, neighbors in graph.adjacency():
+        sources.append(position[u])
+        degrees.append(len(neighbors))
+        targets.extend(map(position.__getitem__, neighbors))
+    rows = np.repeat(np.asarray(sources, dtype=np.int64), degrees)
+    cols = np.asarray(targets, dtype=np.int64)
+    keep = rows != cols
+    matrix = sp.csr_matrix((np.ones(int(keep.sum()), dtype=np.float64), (rows[keep], cols[keep])),
+                           shape=(len(nodes), len(nodes)))
+    matrix.sum_duplicates()
+    matrix.data[:] = 1.0
+    return nodes, matrix
+
+
+def pagerank(matrix, alpha=0.85, tol=1.0e-10, max_iter=100):
+    """PageRank of a CSR adjacency by power iteration; dangling nodes spread their rank evenly.
+
+    Same definition (and tolerance test) as networkx.pagerank without personalization.
+    """
+    n = matrix.shape[0]
+    if not n:
+        return np.zeros(0)
+    out_degree = np.asarray(matrix.sum(axis=1)).ravel()
+    dangling = out_degree == 0
+    inverse = np.divide(1.0, out_degree, out=np.zeros(n), where=~dangling)
+    transposed = matrix.T.tocsr()
+    rank = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        previous = rank
+        rank = alpha * (transposed @ (previous * inverse)) + (alpha * previous[dangling].sum() + 1.0 - alpha) / n
+        if np.abs(rank - previous).sum() < n * tol:
+            break
+    return rank
+
+
+def topological_layers(matrix, labels, count):
+    """Layer of each strongly connected component: 0 for components without predecessors, else one
+    more than the deepest predecessor, found by peeling the condensed graph one layer at a time."""
+    edges = matrix.tocoo()
+    condensed = sp.csr_matrix((np.ones(edges.nnz), (labels[edges.row], labels[edges.col])), shape=(count, count))
+    condensed.setdiag(0)
+    condensed.eliminate_zeros()
+    condensed.data[:] = 1.0
+    indegree = np.asarray(condensed.sum(axis=0)).ravel()
+    layer = np.full(count, -1, dtype=np.int32)
+    frontier = np.flatnonzero(indegree == 0)
+    depth = 0
+    while len(frontier):
+        layer[frontier] = depth
+        indegree -= np.asarray(condensed[frontier].sum(axis=0)).ravel()
+        frontier = np.flatnonzero((indegree == 0) & (layer < 0))
+        depth += 1
+    return layer
+
+
+def _distribution(nodes, degrees, top):
+    order = np.argsort(-degrees, kind="stable")[:top]
+    return {
+        "mean": float(degrees.mean()) if len(degrees) else 0.0,
+        "p50": float(np.percentile(degrees, 50)) if len(degrees) else 0.0,
+        "p90": float(np.percentile(degrees, 90)) if len(degrees) else 0.0,
+        "p99": float(np.percentile(degrees, 99)) if len(degrees) else 0.0,
+        "max": int(degrees.max()) if len(degrees) else 0,
+        "histogram": {int(d): int(c) for d, c in enumerate(np.bincount(degrees.astype(np.int64))) if c},
+        "top": [[nodes[i], int(degrees[i])] for i in order],
+    }
+
+
+def graph_metrics(graph, resolve=None, top=10):
+    """Ranking and structure metrics for a dependency graph whose edges run dependency -> dependent
+    (CodebaseAnalyzer.graph), computed on a sparse adjacency instead of networkx's dicts.
+
+    pagerank scores modules by how much depends on them (PageRank on the reversed edges); cycles
+    lists import cycles (strongly connected components of more than one module), largest first;
+    layers numbers modules from 0 (no dependencies) upward; fan_in counts dependents and
+    fan_out dependencies, each summarized with percentiles, a histogram and the top modules.
+    """
+    nodes, matrix = adjacency(graph, resolve)
+    fan_in = np.asarray(matrix.sum(axis=1)).ravel()
+    fan_out = np.asarray(matrix.sum(axis=0)).ravel()
+    count, labels = connected_components(matrix, directed=True, connection="strong")
+    sizes = np.bincount(labels, minlength=count)
+    by_component, starts = np.argsort(labels, kind="stable"), np.concatenate([[0], np.cumsum(sizes)])
+    cycles = [sorted((nodes[i] for i in by_component[starts[c]:starts[c + 1]]), key=str)
+              for c in np.argsort(-sizes, kind="stable")[:np.count_nonzero(sizes > 1)]]
+    layer = topological_layers(matrix, labels, count)[labels]
+    rank = pagerank(matrix.T.tocsr())
+    return {
+        "nodes": len(nodes),
+        "edges": int(matrix.nnz),
+        "pagerank": {node: float(score) for node, score in zip(nodes, rank)},
+        "cycles": cycles,
+        "layers": {node: int(depth) for node, depth in zip(nodes, layer)},
+        "num_layers": int(layer.max()) + 1 if len(layer) else 0,
+        "fan_in": _distribution(nodes, fan_in, top),
+        "fan_out": _distribution(nodes, fan_out, top),
+    }
@@ -0,0 +1,248 @@
+import os
+import io
+import sys
+import time
+import argparse
+import contextlib
+import numpy as np
+import networkx as nx
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.parser.CodeBase_CodeLine import CodebaseAnalyzer
+
+def _bit_ids(rows):
+    """Indices of the set bits in a uint64 bitset row (or the OR of several)."""
+    return np.flatnonzero(np.unpackbits(rows.view(np.uint8), bitorder="little"))
+
+
+class ReachabilityIndex:
+    """Transitive closure of a dependency graph, for "what is affected if X changes" questions.
+
+    Strongly connected components (import cycles) are condensed into one component each, and
+    every component keeps a bitset of the components reachable from it, so reaches() is one bit
+    test and descendants() / ancestors() are a row / column scan instead of a graph walk. The
+    bitsets cost components^2 / 8 bytes, which is small for module graphs; building raises
+    ValueError above max_bytes.
+
+    sync() updates the index for a changed graph: a new edge ORs its target's bitset into the
+    source's ancestors, a removed edge recomputes only its source's ancestors, and new nodes get
+    new components. Changes that merge or may split a cycle fall back to a full build.
+    """
+
+    def __init__(self, graph, max_bytes=256 * 2 ** 20):
+        self.max_bytes = max_bytes
+        self.build(graph)
+
+    def build(self, graph):
+        condensed = nx.condensation(graph)
+        order = list(nx.topological_sort(condensed))
+        rank = {c: i for i, c in enumerate(order)}      # number components in topological order
+        self.members = [sorted(condensed.nodes[c]["members"], key=str) for c in order]
+        self.component = {node: rank[c] for node, c in condensed.graph["mapping"].items()}
+        self.edge_counts = {}     # (component, component) -> node edges between them
+        for u, v in graph.edges:
+            cu, cv = self.component[u], self.component[v]
+            if cu != cv:
+                self.edge_counts[(cu, cv)] = self.edge_counts.get((cu, cv), 0) + 1
+        self.successors = [set() for _ in order]
+        for cu, cv in self.edge_counts:
+            self.successors[cu].add(cv)
+        self.edges = set(graph.edges)
+        self.bits = self.__allocate(len(order))
+        self.__close(range(len(order) - 1, -1, -1))
+
+    def __allocate(self, components, old=None):
+        words = max(1, (components + 63) // 64)
+        if old is not None:
+            # Widen geometrically as nodes are added, so most syncs only append rows.
+            words = old.shape[1] if words <= old.shape[1] else max(words, old.shape[1] * 2)
+        if components * words * 8 > self.max_bytes:
+            raise ValueError(f"A reachability index over {components} components needs "
+                             f"{components * words * 8 / 2 ** 20:.0f} MB; raise max_bytes or index a coarser graph")
+        bits = np.zeros((components, words), dtype=np.uint64)
+        if old is not None:
+            bits[:old.shape[0], :old.shape[1]] = old
+        return bits
+
+    def __close(self, components):
+        """Recompute the bitsets of components, given in reverse topological order."""
+        for c in components:
+            row = self.bits[c]
+            row[:] = 0
+            row[c >> 6] = np.uint64(1) << np.uint64(c & 63)
+            if self.successors[c]:
+                row |= np.bitwise_or.reduce(self.bits[list(self.successors[c])], axis=0)
+
+    def __ancestor_components(self, c):
+        """Components that reach c, c included."""
+        mask = np.uint64(1) << np.uint64(c & 63)
+        return np.flatnonzero(self.bits[:, c >> 6] & mask)
+
+    def __topological_order(self):
+        indegree = [0] * len(self.successors)
+        for successors in self.successors:
+            for c in successors:
+                indegree[c] += 1
+        ready = [c for c, degree in enumerate(indegree) if not degree]
+        order = []
+        while ready:
+            c = ready.pop()
+            order.append(c)
+            for successor in self.successors[c]:
+                indegree[successor] -= 1
+                if not indegree[successor]:
+                    ready.append(successor)
+        return order
+
+    def __nodes(self, components, exclude):
+        return [node for c in components.tolist() for node in self.members[c] if node != exclude]
+
+    def __len__(self):
+        return len(self.component)
+
+    @property
+    def num_components(self):
+        return len(self.members)
+
+    def reaches(self, source, target):
+        """Whether there is a path from source to target (a node always reaches itself)."""
+        cs, ct = self.component[source], self.component[target]
+        return bool((self.bits[cs, ct >> 6] >> np.uint64(ct & 63)) & np.uint64(1))
+
+    def descendants(self, node):
+        """Every node reachable from node. On CodebaseAnalyzer.graph, whose edges run dependency ->
+        dependent, this is the impact set: the modules affected if node changes."""
+        return self.__nodes(_bit_ids(self.bits[self.component[node]]), node)
+
+    def ancestors(self, node):
+        """Every node that reaches node; on CodebaseAnalyzer.graph, what node depends on."""
+        return self.__nodes(self.__ancestor_components(self.component[node]), node)
+
+    def impact(self, nodes):
+        """Union of descendants over several changed nodes, e.g. the modules touched by a diff."""
+        rows = [self.component[node] for node in nodes]
+        if not rows:
+            return []
+        changed = set(nodes)
+        return [node for c in _bit_ids(np.bitwise_or.reduce(self.bits[rows], axis=0)).tolist()
+                for node in self.members[c] if node not in changed]
+
+    def sync(self, graph):
+        """Update the index to match graph; returns "unchanged", "incremental" or "rebuilt"."""
+        edges = set(graph.edges)
+        removed, added = self.edges - edges, edges - self.edges
+        if not removed and not added and graph.nodes == self.component.keys():
+            return "unchanged"     # compares node sets: a module swapped for another keeps the count
+        if any(node not in graph for node in self.component) or any(self.component[u] == self.component[v] for u, v in removed):
+            self.build(graph)     # dropped nodes or an edge inside a cycle: components may split
+            return "rebuilt"
+        new_nodes = [node for node in graph.nodes if node not in self.component]
+        if new_nodes:
+            first = len(self.members)
+            for node in new_nodes:
+                self.component[node] = len(self.members)
+                self.members.append([node])
+                self.successors.append(set())
+            self.bits = self.__allocate(len(self.members), self.bits)
+            self.__close(range(first, len(self.members)))
+
+        dirty = set()
+        for u, v in removed:
+            pair = (self.component[u], self.component[v])
+            self.edge_counts[pair] -= 1
+            if not self.edge_counts[pair]:
+                del self.edge_counts[pair]
+                self.successors[pair[0]].discard(pair[1])
+                dirty.update(self.__ancestor_components(pair[0]).tolist())
+        if dirty:
+            self.__close([c for c in reversed(self.__topological_order()) if c in dirty])
+
+        for u, v in added:
+            cu, cv = self.component[u], self.component[v]
+            if cu == cv:
+                continue
+            if self.reaches(v, u):
+                self.build(graph)     # the edge closes a cycle, so components merge
+                return "rebuilt"
+            self.edge_counts[(cu, cv)] = self.edge_counts.get((cu, cv), 0) + 1
+            if cv not in self.successors[cu]:
+                self.successors[cu].add(cv)
+                if not self.reaches(u, v):
+                    self.bits[self.__ancestor_components(cu)] |= self.bits[cv]
+        self.edges = edges
+        return "incremental"
+
+
+def _import_target(resolve, imp):
+    """The parsed module an import record refers to, or None for stdlib / third-party imports.
+
+    "from pkg import mod" names a module when pkg.mod resolves to one ending in that path;
+    otherwise the import is of pkg itself.
+    """
+    base, name = imp.get("module"), imp["name"]
+    if not base:
+        return resolve(name)
+    submodule = resolve(f"{base}.{name}")
+    if submodule and (submodule == name or submodule.endswith(f"{base.split('.')[-1]}.{name}")):
+        return submodule
+    return resolve(base)
+
+
+def module_graph(code_files, base_path="."):
+    """Module dependency graph of code_files, dependency -> dependent, from resolved imports.
+
+    Nodes are the parsed files' modules only: imports are mapped onto them with
+    CallGraph.module_resolver and dropped when nothing matches (stdlib, third-party). The
+    name-based call edges of CodebaseAnalyzer.graph are left out, since any two modules that
+    define a function of the same name (every main()) would otherwise depend on each other.
+    """
+    from src.parser.CallGraph import module_resolver
+    analyzer = CodebaseAnalyzer(base_path)
+    with contextlib.redirect_stdout(io.StringIO()):
+        analyzer.parse_files(code_files, max_size=float("inf"))
+    resolve = module_resolver(analyzer.module_file_map)
+    graph = nx.DiGraph()
+    graph.add_nodes_from(sorted(analyzer.module_file_map))
+    for module in sorted(analyzer.module_file_map):
+        for imp in analyzer.parsed[analyzer.module_file_map[module]].get("imports", []):
+            target = _import_target(resolve, imp)
+            if target and target != module:
+                graph.add_edge(target, module)
+    return graph
+
+
+def main():
+    from src.parser.CallGraph import module_resolver
+    from src.retriever.BM25Index import load_files
+    parser = argparse.ArgumentParser(description="Impact analysis over a codebase's module dependency graph.")
+    parser.add_argument("path", help="Codebase directory")
+    parser.add_argument("query", choices=["impact", "depends", "reaches"])
+    parser.add_argument("modules", nargs="+", help="Changed modules for impact, one module for depends, two for reaches")
+    args = parser.parse_args()
+    if args.query == "reaches" and len(args.modules) < 2:
+        parser.error("reaches needs two modules")
+
+    start = time.perf_counter()
+    graph = module_graph(load_files(args.path))
+    # Modules are named relative to path; accept any unambiguous dotted suffix or extension of
+    # one, so "src.downloader.Z_U_F" works when path is src.
+    resolve = module_resolver(graph.nodes)
+    modules = [resolve(name) for name in args.modules]
+    unknown = [name for name, module in zip(args.modules, modules) if module is None]
+    if unknown:
+        parser.error(f"unknown or ambiguous module(s) under {args.path}: {', '.join(unknown)}")
+    index = ReachabilityIndex(graph)
+    print(f"{len(index)} modules in {index.num_components} components, indexed in {time.perf_counter() - start:.2f}s")
+    start = time.perf_counter()
+    if args.query == "impact":
+        result = sorted(map(str, index.impact(modules)))
+    elif args.query == "depends":
+        result = sorted(map(str, index.ancestors(modules[0])))
+    else:
+        result = [str(index.reaches(*modules[:2]))]
+    print(f"{len(result)} results in {(time.perf_counter() - start) * 1000:.3f} ms")
+    for line in result:
+        print(f"  {line}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,11 @@
-import networkx as nx
 import sys, os
 import tokenize
 import ast
 import io
 import keyword
-import matplotlib
 from collections import defaultdict
-matplotlib.use('TkAgg')  
 from typing import Dict, List
-import matplotlib.pyplot as plt
+import argparse
 import builtins
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
 from src.downloader.Z_U_F import load_codebase
@@ -271,6 +268,7 @@ class hello:
 
 class DependencyGraph:
     def __init__(self, base_path):
+        import networkx as nx   # deferred so importing the module stays cheap
         self.base_path = base_path
         self.graph = nx.DiGraph()
         self.parsed = {}
@@ -342,60 +340,43 @@ class DependencyGraph:
         for u, v in sorted(self.graph.edges):
             print(f" - {u} -> {v}")
 
-    def visualize(self):
+    def visualize(self, output="dependency_graph.png", layout="layered", max_nodes=200, cache_dir=None):
+        """Render the graph to output (.png, .svg or .pdf) without a display.
+
+        Graphs with more than max_nodes modules are drawn clustered by package. Layouts are
+        "layered" (by dependency depth) or "force", and are cached under cache_dir by graph hash
+        (GraphLayout.LAYOUT_CACHE_DIR by default, "" to disable).
+        """
+        from src.parser.GraphLayout import LAYOUT_CACHE_DIR, cached_layout, cluster_by_package, render
         if not self.graph.nodes:
             print("No nodes to visualize.")
-            return
-
-        pos = nx.spring_layout(self.graph, seed=42, k=1.8)
-
-        plt.figure(figsize=(14, 10))
-
-    # Draw edges with offset at arrowhead and tail to avoid label box overlap
-        nx.draw_networkx_edges(
-            self.graph,
-            pos,
-            arrows=True,
-            arrowstyle='->',
-            arrowsize=18,
-            width=1.5,
-            connectionstyle='arc3,rad=0.1',
-            edge_color='black',
-            node_size=3000,  # approximate node size for offset
-            min_source_margin=15,  # buffer at source
-            min_target_margin=25   # buffer at target (arrow head)
-        )
-
-    # Draw node labels with padding and visible boxes
-        nx.draw_networkx_labels(
-            self.graph,
-            pos,
-            font_size=10,
-            font_color='white',
-            bbox=dict(boxstyle="round,pad=0.5", edgecolor="black", facecolor="blue")
-        )
-
-        plt.title("Dependency Graph", fontsize=14)
-        plt.axis("off")
-        plt.tight_layout()
-        plt.show()
-
-
-
-
-
-
-
-#ca=CodeAnalyzer()
-#ast_info=ca.analyze()
-
-#print(type(ast_info))
-a=DependencyGraph(r"C:\Users\Yatharth_Shivam\OneDrive\Documents\repos\python-mini-projects-master")
-
-
-
-a.build_dependency_graph()
-a.show_summary()
-a.visualize()
-#print_directory_structure(r"C:\Users\Yatharth_Shivam\OneDrive\Documents\repos\python-mini-projects-master")
-
+            return None
+
+        graph, sizes = self.graph, None
+        if graph.number_of_nodes() > max_nodes:
+            graph, sizes = cluster_by_package(graph, max_nodes)
+            print(f"Clustered {self.graph.number_of_nodes()} modules into {graph.number_of_nodes()} packages.")
+        pos = cached_layout(graph, layout, LAYOUT_CACHE_DIR if cache_dir is None else cache_dir or None)
+        render(graph, pos, output, sizes)
+        print(f"Dependency graph written to {output}")
+        return output
+
+
+def main():
+    from src.parser.GraphLayout import LAYOUTS
+    parser = argparse.ArgumentParser(description="Build and render a codebase's module dependency graph.")
+    parser.add_argument("path", help="Codebase directory")
+    parser.add_argument("--output", default="dependency_graph.png", help="Image to write (.png, .svg or .pdf)")
+    parser.add_argument("--layout", choices=LAYOUTS, default="layered")
+    parser.add_argument("--max-nodes", type=int, default=200, help="Cluster by package above this many modules")
+    parser.add_argument("--sort-by", choices=["function_calls", "file"], default="function_calls")
+    args = parser.parse_args()
+
+    graph = DependencyGraph(args.path)
+    graph.build_dependency_graph(sort_by=args.sort_by)
+    graph.show_summary()
+    graph.visualize(args.output, args.layout, args.max_nodes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+import os
+import io
+import sys
+import json
+import time
+import hashlib
+import argparse
+import contextlib
+from collections import Counter
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.retriever.Chunking import Chunker, tokenize
+from src.downloader.Z_U_F import load_codebase
+
+FORMAT_VERSION = 1
+
+
+def file_hash(content):
+    return hashlib.sha1(content.encode("utf-8", errors="replace")).hexdigest()
+
+
+def load_files(directory):
+    """{relative path: source} for every file Z_U_F.load_codebase accepts under directory."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        code_dict = load_codebase(directory)
+    return {os.path.relpath(path, directory).replace(os.sep, "/"): code for path, code in code_dict.items()}
+
+
+class BM25Index:
+    """Inverted index over code chunks with Okapi BM25 ranking.
+
+    Postings live in flat arrays (chunk ids as uint32, term frequencies as uint16) with one
+    offset per term, saved as .npy files and memory-mapped on load, so opening an index costs
+    little more than reading its term list. Files are tracked by content hash: add_file() puts
+    new chunks in a small in-memory delta and remove_file() only tombstones chunks, until
+    compact() folds both into fresh base arrays; save() always compacts, sync() once the delta
+    and tombstones pass compact_ratio of the chunks. search() counts only live chunks, so results
+    do not depend on when compaction happened.
+    """
+
+    def __init__(self, k1=1.2, b=0.75, max_lines=80, compact_ratio=0.1):
+        self.k1 = k1
+        self.b = b
+        self.compact_ratio = compact_ratio
+        self.chunker = Chunker(max_lines)
+        self.files = {}        # path -> {"hash": ..., "chunks": [chunk ids]}
+        self.chunks = []       # chunk id -> [path, name, kind, start, end]
+        self.lengths = []      # chunk id -> number of tokens
+        self.alive = []        # chunk id -> False once its file was removed or changed
+        self.terms = {}        # term -> index into offsets (base segment)
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.ids = np.zeros(0, dtype=np.uint32)
+        self.tfs = np.zeros(0, dtype=np.uint16)
+        self.delta = {}        # term -> ([chunk ids], [tfs]) added since the last compact()
+        self.base_chunks = 0   # chunks covered by the base arrays; later ids are in the delta
+        self.__arrays = None
+
+    def __len__(self):
+        return sum(self.alive)
+
+    def add_file(self, path, content):
+        """Index content under path, replacing whatever was indexed for it; returns the chunk count."""
+        digest = file_hash(content)
+        if path in self.files:
+            if self.files[path]["hash"] == digest:
+                return len(self.files[path]["chunks"])
+            self.remove_file(path)
+        ids = []
+        for chunk in self.chunker.chunk(path, content):
+            chunk_id = len(self.chunks)
+            counts = Counter(tokenize(chunk.name + "\n" + chunk.text))
+            self.chunks.append([path, chunk.name, chunk.kind, chunk.start, chunk.end])
+            self.lengths.append(sum(counts.values()))
+            self.alive.append(True)
+            for term, tf in counts.items():
+                postings = self.delta.setdefault(term, ([], []))
+                postings[0].append(chunk_id)
+                postings[1].append(min(tf, 65535))
+            ids.append(chunk_id)
+        self.files[path] = {"hash": digest, "chunks": ids}
+        self.__arrays = None
+        return len(ids)
+
+    def remove_file(self, path):
+        entry = self.files.pop(path, None)
+        if entry is None:
+            return False
+        for chunk_id in entry["chunks"]:
+            self.alive[chunk_id] = False
+        self.__arrays = None
+        return True
+
+    def sync(self, code_files, prune=True):
+        """Bring the index in line with {path: source}: re-index changed files, drop missing ones."""
+        counts = Counter()
+        for path, content in code_files.items():
+            if path not in self.files:
+                counts["added"] += 1
+            elif self.files[path]["hash"] != file_hash(content):
+                counts["updated"] += 1
+            else:
+                counts["unchanged"] += 1
+                continue
+            self.add_file(path, content)
+        if prune:
+            for path in [p for p in self.files if p not in code_files]:
+                self.remove_file(path)
+                counts["removed"] += 1
+        stale = len(self.chunks) - self.base_chunks + self.alive.count(False)
+        if stale > self.compact_ratio * max(len(self.chunks), 1):
+            self.compact()
+        return dict(counts)
+
+    def __postings(self, term):
+        ids, tfs = [], []
+        index = self.terms.get(term)
+        if index is not None:
+            start, end = self.offsets[index], self.offsets[index + 1]
+            ids.append(self.ids[start:end])
+            tfs.append(self.tfs[start:end])
+        if term in self.delta:
+            ids.append(np.asarray(self.delta[term][0], dtype=np.uint32))
+            tfs.append(np.asarray(self.delta[term][1], dtype=np.uint16))
+        if not ids:
+            return None, None
+        return (ids[0], tfs[0]) if len(ids) == 1 else (np.concatenate(ids), np.concatenate(tfs))
+
+    def compact(self):
+        """Fold the delta into the base arrays and drop tombstoned chunks, renumbering the rest."""
+        alive = np.asarray(self.alive, dtype=bool)
+        remap = np.cumsum(alive, dtype=np.int64) - 1
+        terms, offsets, id_parts, tf_parts, total = {}, [0], [], [], 0
+        for term in sorted(set(self.terms) | set(self.delta)):
+            ids, tfs = self.__postings(term)
+            keep = alive[ids]
+            if not keep.any():
+                continue
+            id_parts.append(remap[ids[keep]].astype(np.uint32))
+            tf_parts.append(np.asarray(tfs[keep], dtype=np.uint16))
+            total += len(id_parts[-1])
+            terms[term] = len(offsets) - 1
+            offsets.append(total)
+        kept = np.flatnonzero(alive)
+        self.chunks = [self.chunks[i] for i in kept]
+        self.lengths = [self.lengths[i] for i in kept]
+        self.alive = [True] * len(kept)
+        for entry in self.files.values():
+            entry["chunks"] = [int(remap[i]) for i in entry["chunks"]]
+        self.terms = terms
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.ids = np.concatenate(id_parts) if id_parts else np.zeros(0, dtype=np.uint32)
+        self.tfs = np.concatenate(tf_parts) if tf_parts else np.zeros(0, dtype=np.uint16)
+        self.delta = {}
+        self.base_chunks = len(self.chunks)
+        self.__arrays = None
+
+    def search(self, query, k=10):
+        """Top-k chunks for a free-text query as dicts with path, name, kind, start, end and score."""
+        if self.__arrays is None:
+            lengths = np.asarray(self.lengths, dtype=np.float32)
+            alive = np.asarray(self.alive, dtype=bool)
+            avgdl = float(lengths[alive].mean()) if alive.any() else 1.0
+            self.__arrays = (alive, self.k1 * (1 - self.b + self.b * lengths / max(avgdl, 1.0)))
+        alive, norm = self.__arrays
+        n = int(alive.sum())
+        scores = np.zeros(len(self.chunks), dtype=np.float32)
+        for term in set(tokenize(query)):
+            ids, tfs = self.__postings(term)
+            if ids is None:
+                continue
+            df = len(ids) if n == len(alive) else int(alive[ids].sum())
+            idf = np.log1p((n - df + 0.5) / (df + 0.5))
+            tf = tfs.astype(np.float32)
+            scores[ids] += idf * tf * (self.k1 + 1) / (tf + norm[ids])
+        scores[~alive] = 0
+        if len(scores) > k:
+            # Everything tied with the k-th score is a candidate, so ties break the same way
+            # however chunk ids were assigned.
+            kth = scores[np.argpartition(-scores, k - 1)[k - 1]]
+            top = np.flatnonzero(scores >= max(kth, np.float32(1e-9)))
+        else:
+            top = np.flatnonzero(scores > 0)
+        hits = []
+        for chunk_id in sorted(top, key=lambda i: (-scores[i], self.chunks[i][0], self.chunks[i][3]))[:k]:
+            path, name, kind, start, end = self.chunks[chunk_id]
+            hits.append({"path": path, "name": name, "kind": kind, "start": start, "end": end,
+                         "score": round(float(scores[chunk_id]), 4)})
+        return hits
+
+    def save(self, directory):
+        """Write the index to directory (compacting first); files are replaced atomically one by one."""
+        self.compact()
+        os.makedirs(directory, exist_ok=True)
+        for name, array in (("offsets", self.offsets), ("ids", self.ids), ("tfs", self.tfs),
+                            ("lengths", np.asarray(self.lengths, dtype=np.uint32))):
+            tmp_path = os.path.join(directory, f".{name}.tmp.npy")
+            np.save(tmp_path, array)
+            os.replace(tmp_path, os.path.join(directory, f"{name}.npy"))
+        meta = {"version": FORMAT_VERSION, "k1": self.k1, "b": self.b, "max_lines": self.chunker.max_lines,
+                "files": self.files, "chunks": self.chunks, "terms": sorted(self.terms, key=self.terms.get)}
+        tmp_path = os.path.join(directory, ".meta.tmp.json")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, separators=(",", ":"))
+        os.replace(tmp_path, os.path.join(directory, "meta.json"))
+
+    @classmethod
+    def load(cls, directory):
+        with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported index format {meta.get('version')} in {directory}; rebuild it")
+        index = cls(meta["k1"], meta["b"], meta["max_lines"])
+        index.files = meta["files"]
+        index.chunks = meta["chunks"]
+        index.terms = {term: i for i, term in enumerate(meta["terms"])}
+        index.offsets = np.load(os.path.join(directory, "offsets.npy"), mmap_mode="r")
+        index.ids = np.load(os.path.join(directory, "ids.npy"), mmap_mode="r")
+        index.tfs = np.load(os.path.join(directory, "tfs.npy"), mmap_mode="r")
+        index.lengths = np.load(os.path.join(directory, "lengths.npy")).tolist()
+        index.alive = [True] * len(index.chunks)
+        index.base_chunks = len(index.chunks)
+        return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build, update and query a BM25 index of a codebase.")
+    parser.add_argument("--index", required=True, help="Index directory")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("sync", help="Index a directory, re-indexing only files whose hash changed")
+    build.add_argument("path")
+    query = sub.add_parser("query", help="Print the top-k chunks for a query")
+    query.add_argument("text")
+    query.add_argument("-k", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.command == "sync":
+        start = time.perf_counter()
+        index = BM25Index.load(args.index) if os.path.exists(os.path.join(args.index, "meta.json")) else BM25Index()
+        changes = index.sync(load_files(args.path))
+        index.save(args.index)
+        print(f"{changes} -> {len(index)} chunks from {len(index.files)} files, "
+              f"{len(index.terms)} terms in {time.perf_counter() - start:.2f}s")
+    else:
+        index = BM25Index.load(args.index)
+        start = time.perf_counter()
+        hits = index.search(args.text, args.k)
+        print(f"{len(hits)} hits in {(time.perf_counter() - start) * 1000:.1f} ms")
+        for hit in hits:
+            print(f"{hit['score']:8.3f}  {hit['path']}:{hit['start']}-{hit['end']}  {hit['kind']} {hit['name']}")
+
+
+if __name__ == "__main__":
+    main()
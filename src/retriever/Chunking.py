@@ -0,0 +1,89 @@
+import os
+import re
+import sys
+from collections import namedtuple
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.parser.CodeBase_CodeLine import CodebaseAnalyzer
+
+# start and end are 1-based, inclusive line numbers into the file.
+Chunk = namedtuple("Chunk", ["path", "name", "kind", "start", "end", "text"])
+
+IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*|\d+")
+SUBTOKEN = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+
+
+def tokenize(text):
+    """Lower-cased identifiers plus their camelCase/snake_case parts, so `parseFile` matches "parse file"."""
+    tokens = []
+    for word in IDENTIFIER.findall(text):
+        parts = SUBTOKEN.findall(word)
+        if len(parts) > 1 or (parts and parts[0] != word):
+            tokens.extend(part.lower() for part in parts if len(part) > 1)
+        if len(word) > 1:
+            tokens.append(word.lower())
+    return tokens
+
+
+def _windows(path, name, kind, lines, start, end, max_lines):
+    """Split lines start..end into chunks of at most max_lines, dropping blank edges."""
+    while start <= end and not lines[start - 1].strip():
+        start += 1
+    while end >= start and not lines[end - 1].strip():
+        end -= 1
+    chunks = []
+    for part, first in enumerate(range(start, end + 1, max_lines)):
+        last = min(end, first + max_lines - 1)
+        label = name if end - start < max_lines else f"{name} (part {part + 1})"
+        chunks.append(Chunk(path, label, kind, first, last, "\n".join(lines[first - 1:last])))
+    return chunks
+
+
+class Chunker:
+    """Splits files at function, method and class boundaries using CodebaseAnalyzer.analyze_code.
+
+    Each top-level function and each method is a chunk (nested functions stay with their parent);
+    the remaining lines of a class (header, docstring, attributes) and of the module (imports,
+    constants, script code) form chunks of their own. Anything longer than max_lines is split, and
+    files that are not Python, or do not parse, are cut into max_lines windows.
+    """
+
+    def __init__(self, max_lines=80):
+        self.max_lines = max_lines
+        self.__analyzer = CodebaseAnalyzer(".")
+
+    def chunk(self, path, code):
+        lines = code.splitlines()
+        if not lines:
+            return []
+        info = self.__analyzer.analyze_code(code, path) if path.endswith(".py") else {"error": "not python"}
+        if info.get("error"):
+            return _windows(path, os.path.basename(path), "text", lines, 1, len(lines), self.max_lines)
+
+        defs = [(f["lineno"], f["end_lineno"], "function", f["name"]) for f in info["functions"]]
+        defs += [(f["lineno"], f["end_lineno"], "method", f"{f['class']}.{f['name']}") for f in info["methods"]]
+        defs.sort(key=lambda d: (d[0], -d[1]))
+        chunks, covered, outer_end = [], [False] * (len(lines) + 2), 0
+        for start, end, kind, name in defs:
+            if start <= outer_end:
+                continue
+            outer_end = end
+            chunks.extend(_windows(path, name, kind, lines, start, end, self.max_lines))
+            for lineno in range(start, end + 1):
+                covered[lineno] = True
+
+        owner = [None] * (len(lines) + 2)
+        for cls in sorted(info["classes"], key=lambda c: c["lineno"] - c["end_lineno"]):
+            for lineno in range(cls["lineno"], cls["end_lineno"] + 1):
+                owner[lineno] = cls["name"]
+        run_start = None
+        for lineno in range(1, len(lines) + 2):
+            breaks = lineno > len(lines) or covered[lineno] or (run_start and owner[lineno] != owner[run_start])
+            if run_start and breaks:
+                name = owner[run_start] or os.path.basename(path)
+                chunks.extend(_windows(path, name, "class" if owner[run_start] else "module",
+                                       lines, run_start, lineno - 1, self.max_lines))
+                run_start = None
+            if run_start is None and lineno <= len(lines) and not covered[lineno]:
+                run_start = lineno
+        chunks.sort(key=lambda c: c.start)
+        return chunks
@@ -0,0 +1,427 @@
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.retriever.BM25Index import file_hash, load_files
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+FORMAT_VERSION = 1
+# ASCII letters that IGNORECASE also matches to non-ASCII characters (İ ı, K Kelvin sign, ſ).
+UNICODE_FOLDS = set("iksIKS")
+MAX_EXACT = 16    # strings tracked per exact set before it is turned into a trigram condition
+MAX_CLASS = 10    # largest [...] class expanded into its characters
+REPEATS = {sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT} | ({sre_parse.POSSESSIVE_REPEAT} if hasattr(sre_parse, "POSSESSIVE_REPEAT") else set())
+
+
+def trigrams(text):
+    """Sorted unique trigrams of text as uint32 (three UTF-8 bytes, ASCII letters lower-cased)."""
+    data = np.frombuffer(text.encode("utf-8").lower(), dtype=np.uint8)
+    if len(data) < 3:
+        return np.zeros(0, dtype=np.uint32)
+    data = data.astype(np.uint32)
+    return np.unique((data[:-2] << 16) | (data[1:-1] << 8) | data[2:])
+
+
+def line_starts(text):
+    """Character offset of every line start, for turning match offsets into line numbers."""
+    codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+    return np.concatenate([np.zeros(1, dtype=np.int64), np.flatnonzero(codes == 10) + 1])
+
+
+def _fold(char):
+    return char.lower() if char.isascii() else char
+
+
+def _class_chars(items, ignore_case):
+    """The characters a small [...] class matches, or None for negated, category or large classes."""
+    chars = []
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            chars.append(chr(av))
+        elif op is sre_parse.RANGE and av[1] - av[0] < MAX_CLASS:
+            chars.extend(map(chr, range(av[0], av[1] + 1)))
+        else:
+            return None
+    if len(chars) > MAX_CLASS or ignore_case and any(not c.isascii() or c in UNICODE_FOLDS for c in chars):
+        return None
+    return list(dict.fromkeys(map(_fold, chars)))
+
+
+def _strings_node(strings):
+    """Plan node for "one of these strings occurs"; None if any is too short to have a trigram."""
+    if any(len(string) < 3 for string in strings):
+        return None
+    nodes = [("grams", trigrams(string)) for string in dict.fromkeys(strings)]
+    return nodes[0] if len(nodes) == 1 else ("or", nodes)
+
+
+def _analyze(pattern, ignore_case):
+    """(exact strings or None, plan node) for a parsed pattern.
+
+    The plan node is the trigram condition any match must satisfy, a tree of ("and"|"or", [...])
+    and ("grams", array) nodes, with None meaning no constraint (every file is a candidate).
+    Alongside it the pattern is tracked as a small set of exact strings for as long as it can be
+    (literals, small classes and alternations, optional parts), concatenating sets by cross
+    product, so "Model(_17|17)" needs "model_17" or "model17" rather than just "model". When a
+    set would pass MAX_EXACT strings, or a piece is not finite (wildcards, unbounded repeats,
+    categories), the run so far becomes a required condition and a new run starts.
+    """
+    parts, run, exact = [], [""], True
+
+    def flush():
+        parts.append(_strings_node(run))
+        run[:] = [""]
+
+    def extend(options):
+        nonlocal exact
+        if len(run) * len(options) > MAX_EXACT:
+            exact = False
+            flush()
+            run[:] = options
+        else:
+            run[:] = list(dict.fromkeys(prefix + option for prefix in run for option in options))
+
+    def cut(node):
+        nonlocal exact
+        exact = False
+        flush()
+        parts.append(node)
+
+    for op, av in pattern:
+        if op is sre_parse.LITERAL:
+            char = chr(av)
+            if ignore_case and (not char.isascii() or char in UNICODE_FOLDS):
+                cut(None)  # only ASCII is case-folded in the index
+            else:
+                extend([_fold(char)])
+        elif op is sre_parse.AT:
+            continue  # zero-width, so literals on either side are still adjacent
+        elif op is sre_parse.IN:
+            chars = _class_chars(av, ignore_case)
+            if chars:
+                extend(chars)
+            else:
+                cut(None)
+        elif op is sre_parse.SUBPATTERN:
+            _, add_flags, del_flags, sub = av
+            strings, node = _analyze(sub, (ignore_case or bool(add_flags & re.IGNORECASE)) and not del_flags & re.IGNORECASE)
+            if strings is not None:
+                extend(strings)
+            else:
+                cut(node)
+        elif op is sre_parse.BRANCH:
+            branches = [_analyze(branch, ignore_case) for branch in av[1]]
+            if all(strings is not None for strings, _ in branches):
+                extend(list(dict.fromkeys(s for strings, _ in branches for s in strings)))
+            else:
+                nodes = [node for _, node in branches]
+                cut(("or", nodes) if all(node is not None for node in nodes) else None)
+        elif op in REPEATS:
+            low, high, sub = av
+            strings, node = _analyze(sub, ignore_case)
+            if strings is not None and high == 1:
+                extend(strings + [""] if low == 0 else strings)
+            else:
+                cut(node if low >= 1 else None)
+        else:
+            cut(None)
+    if exact:
+        return run[:], _strings_node(run)
+    flush()
+    parts = [part for part in parts if part is not None]
+    if not parts:
+        return None, None
+    return None, parts[0] if len(parts) == 1 else ("and", parts)
+
+
+def _first_match_per_line(regex, text, starts):
+    """Offsets of the first match on each line that has one, in order.
+
+    Matches from finditer() are kept when they start a new line; that gives the same answer as
+    searching again from the next line start unless a match runs over a newline, in which case
+    the file is searched line by line instead.
+    """
+    positions, last_line_end = [], -1
+    for match in regex.finditer(text):
+        if "\n" in match.group():
+            break
+        if match.start() > last_line_end:
+            positions.append(match.start())
+            last_line_end = text.find("\n", match.start())
+            if last_line_end < 0:
+                return positions
+    else:
+        return positions
+    positions, pos = [], 0
+    while pos <= len(text):
+        match = regex.search(text, pos)
+        if match is None:
+            break
+        positions.append(match.start())
+        line = int(np.searchsorted(starts, match.start(), side="right"))
+        pos = int(starts[line]) if line < len(starts) else len(text) + 1
+    return positions
+
+
+class TrigramIndex:
+    """Substring and regex search over a loaded codebase, narrowed by a trigram index.
+
+    Every file's trigrams go into posting lists (sorted trigram keys, offsets and file ids as
+    flat .npy arrays), so a query is first reduced to the trigrams any match must contain and
+    only files holding all of them are scanned with the real regex. File contents are stored
+    alongside as one UTF-8 blob with a line-start table per file, so the index answers queries
+    on its own and line numbers come from a binary search rather than counting newlines.
+
+    Updates follow BM25Index: sync() compares content hashes, new and changed files go to an
+    in-memory delta, old versions are tombstoned, and compact() (run by save(), and by sync()
+    once stale files pass compact_ratio) folds everything into fresh arrays.
+    """
+
+    def __init__(self, compact_ratio=0.1):
+        self.compact_ratio = compact_ratio
+        self.files = {}        # path -> {"hash": ..., "id": file id}
+        self.paths = []        # file id -> path
+        self.alive = []        # file id -> False once removed or replaced
+        self.grams = np.zeros(0, dtype=np.uint32)
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.ids = np.zeros(0, dtype=np.uint32)
+        self.text = np.zeros(0, dtype=np.uint8)
+        self.text_offsets = np.zeros(1, dtype=np.int64)   # file id -> byte range in text
+        self.lines = np.zeros(0, dtype=np.int64)
+        self.line_offsets = np.zeros(1, dtype=np.int64)   # file id -> range in lines
+        self.delta = {}        # file id -> (trigrams, text, line starts) added since the last compact()
+
+    def __len__(self):
+        return len(self.files)
+
+    def add_file(self, path, content):
+        digest = file_hash(content)
+        if path in self.files:
+            if self.files[path]["hash"] == digest:
+                return False
+            self.remove_file(path)
+        file_id = len(self.paths)
+        self.paths.append(path)
+        self.alive.append(True)
+        self.delta[file_id] = (trigrams(content), content, line_starts(content))
+        self.files[path] = {"hash": digest, "id": file_id}
+        return True
+
+    def remove_file(self, path):
+        entry = self.files.pop(path, None)
+        if entry is None:
+            return False
+        self.alive[entry["id"]] = False
+        self.delta.pop(entry["id"], None)
+        return True
+
+    def sync(self, code_files, prune=True):
+        """Bring the index in line with {path: source}: re-index changed files, drop missing ones."""
+        counts = {"added": 0, "updated": 0, "unchanged": 0, "removed": 0}
+        for path, content in code_files.items():
+            existed = path in self.files
+            if self.add_file(path, content):
+                counts["updated" if existed else "added"] += 1
+            else:
+                counts["unchanged"] += 1
+        if prune:
+            for path in [p for p in self.files if p not in code_files]:
+                self.remove_file(path)
+                counts["removed"] += 1
+        stale = len(self.delta) + self.alive.count(False)
+        if stale > self.compact_ratio * max(len(self.paths), 1):
+            self.compact()
+        return {name: count for name, count in counts.items() if count}
+
+    def compact(self):
+        """Fold the delta into the base arrays and drop tombstoned files, renumbering the rest."""
+        base = len(self.text_offsets) - 1
+        alive = np.asarray(self.alive, dtype=bool)
+        remap = np.cumsum(alive, dtype=np.int64) - 1
+
+        gram_parts = [np.repeat(np.asarray(self.grams), np.diff(np.asarray(self.offsets)))]
+        id_parts = [np.asarray(self.ids, dtype=np.int64)]
+        for file_id, (grams, _, _) in self.delta.items():
+            gram_parts.append(grams)
+            id_parts.append(np.full(len(grams), file_id, dtype=np.int64))
+        grams, ids = np.concatenate(gram_parts), np.concatenate(id_parts)
+        keep = alive[ids]
+        grams, ids = grams[keep], remap[ids[keep]]
+        order = np.argsort(grams, kind="stable")  # ids were appended in order, so stay sorted per trigram
+        grams, ids = grams[order], ids[order]
+        self.grams, starts = np.unique(grams, return_index=True)
+        self.offsets = np.append(starts, len(grams)).astype(np.int64)
+        self.ids = ids.astype(np.uint32)
+
+        texts, lines, text_offsets, line_offsets = [], [], [0], [0]
+        for file_id in np.flatnonzero(alive):
+            if file_id < base:
+                texts.append(np.asarray(self.text[self.text_offsets[file_id]:self.text_offsets[file_id + 1]]))
+                lines.append(np.asarray(self.lines[self.line_offsets[file_id]:self.line_offsets[file_id + 1]]))
+            else:
+                _, content, starts = self.delta[file_id]
+                texts.append(np.frombuffer(content.encode("utf-8"), dtype=np.uint8))
+                lines.append(starts)
+            text_offsets.append(text_offsets[-1] + len(texts[-1]))
+            line_offsets.append(line_offsets[-1] + len(lines[-1]))
+        self.text = np.concatenate(texts) if texts else np.zeros(0, dtype=np.uint8)
+        self.lines = np.concatenate(lines).astype(np.int64) if lines else np.zeros(0, dtype=np.int64)
+        self.text_offsets = np.asarray(text_offsets, dtype=np.int64)
+        self.line_offsets = np.asarray(line_offsets, dtype=np.int64)
+
+        self.paths = [self.paths[i] for i in np.flatnonzero(alive)]
+        self.alive = [True] * len(self.paths)
+        for entry in self.files.values():
+            entry["id"] = int(remap[entry["id"]])
+        self.delta = {}
+
+    def __postings(self, gram):
+        i = np.searchsorted(self.grams, gram)
+        base = self.ids[self.offsets[i]:self.offsets[i + 1]] if i < len(self.grams) and self.grams[i] == gram else ()
+        extra = [file_id for file_id, (grams, _, _) in self.delta.items()
+                 if (j := np.searchsorted(grams, gram)) < len(grams) and grams[j] == gram]
+        # Delta files have higher ids than every base file, so this stays sorted.
+        return np.concatenate([np.asarray(base, dtype=np.int64), np.asarray(extra, dtype=np.int64)])
+
+    def __evaluate(self, node):
+        """Sorted candidate file ids for a plan node, or None for "every file"."""
+        if node is None:
+            return None
+        kind, value = node
+        if kind == "grams":
+            postings = sorted((self.__postings(gram) for gram in value), key=len)
+            result = postings[0]
+            for ids in postings[1:]:
+                if not len(result):
+                    break
+                result = np.intersect1d(result, ids, assume_unique=True)
+            return result
+        children = [self.__evaluate(child) for child in value]
+        if kind == "or":
+            if any(child is None for child in children):
+                return None
+            return np.unique(np.concatenate(children))
+        children = sorted((child for child in children if child is not None), key=len)
+        if not children:
+            return None
+        result = children[0]
+        for ids in children[1:]:
+            result = np.intersect1d(result, ids, assume_unique=True)
+        return result
+
+    def __compile(self, pattern, literal, ignore_case):
+        flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+        return re.compile(re.escape(pattern) if literal else pattern, flags)
+
+    def candidates(self, pattern, literal=False, ignore_case=False):
+        """Paths of the files that can contain a match, in path order."""
+        regex = self.__compile(pattern, literal, ignore_case)
+        parsed = sre_parse.parse(regex.pattern, regex.flags)
+        ids = self.__evaluate(_analyze(parsed, bool(parsed.state.flags & re.IGNORECASE))[1])
+        ids = range(len(self.paths)) if ids is None else ids
+        return sorted(self.paths[i] for i in ids if self.alive[i])
+
+    def __contents(self, path):
+        file_id = self.files[path]["id"]
+        if file_id in self.delta:
+            _, text, starts = self.delta[file_id]
+            return text, starts
+        text = bytes(self.text[self.text_offsets[file_id]:self.text_offsets[file_id + 1]]).decode("utf-8")
+        return text, self.lines[self.line_offsets[file_id]:self.line_offsets[file_id + 1]]
+
+    def search(self, pattern, literal=False, ignore_case=False, max_results=1000):
+        """Matching lines as dicts with path, line (1-based), column (0-based) and text, like grep -n.
+
+        pattern is a Python regex (or a plain string with literal=True); ^ and $ match at line
+        boundaries. Each line is reported once, at its first match.
+        """
+        regex = self.__compile(pattern, literal, ignore_case)
+        hits = []
+        for path in self.candidates(pattern, literal, ignore_case):
+            text, starts = self.__contents(path)
+            positions = _first_match_per_line(regex, text, starts)
+            if not positions:
+                continue
+            lines = np.searchsorted(starts, positions, side="right")
+            ends = np.append(np.asarray(starts[1:]), len(text) + 1)
+            for position, line, line_start, line_end in zip(positions, lines.tolist(),
+                                                            np.asarray(starts)[lines - 1].tolist(), ends[lines - 1].tolist()):
+                hits.append({"path": path, "line": line, "column": position - line_start,
+                             "text": text[line_start:line_end].rstrip("\r\n")})
+                if len(hits) >= max_results:
+                    return hits
+        return hits
+
+    def save(self, directory):
+        """Write the index to directory (compacting first); files are replaced atomically one by one."""
+        self.compact()
+        os.makedirs(directory, exist_ok=True)
+        for name, array in (("grams", self.grams), ("offsets", self.offsets), ("ids", self.ids),
+                            ("text", self.text), ("text_offsets", self.text_offsets),
+                            ("lines", self.lines), ("line_offsets", self.line_offsets)):
+            tmp_path = os.path.join(directory, f".{name}.tmp.npy")
+            np.save(tmp_path, array)
+            os.replace(tmp_path, os.path.join(directory, f"{name}.npy"))
+        meta = {"version": FORMAT_VERSION, "files": self.files, "paths": self.paths}
+        tmp_path = os.path.join(directory, ".meta.tmp.json")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, separators=(",", ":"))
+        os.replace(tmp_path, os.path.join(directory, "meta.json"))
+
+    @classmethod
+    def load(cls, directory):
+        with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported index format {meta.get('version')} in {directory}; rebuild it")
+        index = cls()
+        index.files = meta["files"]
+        index.paths = meta["paths"]
+        index.alive = [True] * len(index.paths)
+        for name in ("grams", "offsets", "ids", "text", "text_offsets", "lines", "line_offsets"):
+            # A plain ndarray view of the mapping slices much faster than np.memmap itself.
+            setattr(index, name, np.asarray(np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")))
+        return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build, update and grep a trigram index of a codebase.")
+    parser.add_argument("--index", required=True, help="Index directory")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("sync", help="Index a directory, re-indexing only files whose hash changed")
+    build.add_argument("path")
+    grep = sub.add_parser("grep", help="Print matching lines as path:line:text")
+    grep.add_argument("pattern")
+    grep.add_argument("-F", "--fixed-strings", action="store_true", help="Treat the pattern as a literal string")
+    grep.add_argument("-i", "--ignore-case", action="store_true")
+    grep.add_argument("-m", "--max-results", type=int, default=1000)
+    args = parser.parse_args()
+
+    if args.command == "sync":
+        start = time.perf_counter()
+        index = TrigramIndex.load(args.index) if os.path.exists(os.path.join(args.index, "meta.json")) else TrigramIndex()
+        changes = index.sync(load_files(args.path))
+        index.save(args.index)
+        print(f"{changes} -> {len(index)} files, {len(index.lines)} lines, "
+              f"{len(index.grams)} trigrams in {time.perf_counter() - start:.2f}s")
+    else:
+        index = TrigramIndex.load(args.index)
+        start = time.perf_counter()
+        candidates = index.candidates(args.pattern, args.fixed_strings, args.ignore_case)
+        hits = index.search(args.pattern, args.fixed_strings, args.ignore_case, args.max_results)
+        for hit in hits:
+            print(f"{hit['path']}:{hit['line']}:{hit['text']}")
+        print(f"{len(hits)} matches in {len(candidates)} of {len(index)} files, "
+              f"{(time.perf_counter() - start) * 1000:.1f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+import os
+import sys
+import json
+import math
+import time
+import zlib
+import argparse
+from collections import Counter
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.retriever.Chunking import Chunker, tokenize
+from src.retriever.BM25Index import file_hash, load_files
+
+FORMAT_VERSION = 1
+
+
+def _candidates(scores, k):
+    """Indices of positive scores at least as high as the k-th best, ties included."""
+    if len(scores) > k:
+        kth = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        return np.flatnonzero(scores >= max(kth, np.float32(1e-9)))
+    return np.flatnonzero(scores > 0)
+
+
+class _Shard:
+    """One slice of the index: a float32 matrix (memory-mapped once saved) plus its chunk list.
+
+    Rows appended since the last save sit in a pending list and removed files are only masked
+    out, so a shard is rewritten by save() only when something in it changed.
+    """
+
+    def __init__(self, name, dim):
+        self.name = name
+        self.vectors = np.zeros((0, dim), dtype=np.float32)
+        self.chunks = []       # row -> [path, name, kind, start, end]
+        self.alive = []
+        self.rows = {}         # path -> its rows, so removing a file does not scan the shard
+        self.pending = []      # vectors for rows past the end of self.vectors
+        self.dirty = False
+
+    def __len__(self):
+        return len(self.chunks)
+
+    def __index_rows(self):
+        self.rows = {}
+        for row, chunk in enumerate(self.chunks):
+            self.rows.setdefault(chunk[0], []).append(row)
+
+    def append(self, chunks, vectors):
+        for row, chunk in enumerate(chunks, len(self.chunks)):
+            self.rows.setdefault(chunk[0], []).append(row)
+        self.chunks.extend(chunks)
+        self.alive.extend([True] * len(chunks))
+        self.pending.extend(vectors)
+        self.dirty = True
+
+    def remove(self, path):
+        for row in self.rows.pop(path, ()):
+            self.alive[row] = False
+        self.dirty = True
+
+    def matrix(self):
+        if self.pending:
+            self.vectors = np.vstack([np.asarray(self.vectors), np.asarray(self.pending, dtype=np.float32)])
+            self.pending = []
+        return self.vectors
+
+    def search(self, queries, k, block_rows):
+        """(scores, rows) of each query's top-k candidate live rows, scanning block_rows at a time."""
+        matrix = self.matrix()
+        dead = ~np.asarray(self.alive, dtype=bool)
+        best = [(np.zeros(0, dtype=np.float32), np.zeros(0, dtype=np.int64)) for _ in range(len(queries))]
+        for first in range(0, len(matrix), block_rows):
+            scores = queries @ np.asarray(matrix[first:first + block_rows]).T
+            scores[:, dead[first:first + block_rows]] = 0
+            for q, row_scores in enumerate(scores):
+                rows = _candidates(row_scores, k)
+                prev_scores, prev_rows = best[q]
+                best[q] = (np.concatenate([prev_scores, row_scores[rows]]), np.concatenate([prev_rows, rows + first]))
+        return best
+
+    def save(self, directory):
+        alive = np.asarray(self.alive, dtype=bool)
+        self.vectors = np.ascontiguousarray(self.matrix()[alive])
+        self.chunks = [chunk for chunk, keep in zip(self.chunks, self.alive) if keep]
+        self.alive = [True] * len(self.chunks)
+        self.__index_rows()      # compaction renumbered the rows
+        tmp_path = os.path.join(directory, f".{self.name}.tmp.npy")
+        np.save(tmp_path, self.vectors)
+        os.replace(tmp_path, os.path.join(directory, f"{self.name}.npy"))
+        tmp_path = os.path.join(directory, f".{self.name}.tmp.json")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.chunks, f, separators=(",", ":"))
+        os.replace(tmp_path, os.path.join(directory, f"{self.name}.json"))
+        self.vectors = np.load(os.path.join(directory, f"{self.name}.npy"), mmap_mode="r")
+        self.dirty = False
+
+    @classmethod
+    def load(cls, directory, name, dim):
+        shard = cls(name, dim)
+        shard.vectors = np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+        with open(os.path.join(directory, f"{name}.json"), "r", encoding="utf-8") as f:
+            shard.chunks = json.load(f)
+        shard.alive = [True] * len(shard.chunks)
+        shard.__index_rows()
+        return shard
+
+
+class VectorIndex:
+    """Dense retrieval over code chunks with hashed TF-IDF embeddings; no model download or GPU.
+
+    Every identifier token and its camelCase/snake_case parts (Chunking.tokenize), plus the
+    character trigrams of each, is hashed with a sign bit into one of dim buckets, weighted by
+    1 + log(tf) and by a per-bucket idf, and the vector is L2-normalized, so cosine similarity
+    tolerates partial words ("pars" ~ "parser") where BM25 needs exact terms. The idf is fitted
+    on the first sync() and then frozen so stored vectors stay comparable; rebuild the index to
+    refit it after the codebase has drifted a lot.
+
+    Vectors live in shards of about shard_size rows, each a .npy matrix memory-mapped on load.
+    A file's chunks always share a shard, so updating or removing it rewrites only that shard,
+    and search_many() scores a batch of queries with one matrix product per block of rows.
+    """
+
+    def __init__(self, dim=512, shard_size=50000, max_lines=80, block_rows=16384):
+        self.dim = dim
+        self.shard_size = shard_size
+        self.block_rows = block_rows
+        self.chunker = Chunker(max_lines)
+        self.idf = None
+        self.files = {}        # path -> {"hash": ..., "shard": shard name}
+        self.shards = {}       # shard name -> _Shard
+        self.__features = {}   # token -> (bucket indices, signed weights)
+
+    def __len__(self):
+        return sum(sum(shard.alive) for shard in self.shards.values())
+
+    def __token_features(self, token):
+        features = self.__features.get(token)
+        if features is None:
+            grams = [token] + [f"#{token}#"[i:i + 3] for i in range(len(token))]
+            hashes = [zlib.crc32(gram.encode("utf-8")) for gram in grams]
+            weights = [1.0] + [1.0 / len(token)] * len(token)
+            features = (np.asarray([h % self.dim for h in hashes], dtype=np.int64),
+                        np.asarray([w if h & 0x80000000 else -w for h, w in zip(hashes, weights)], dtype=np.float32))
+            self.__features[token] = features
+        return features
+
+    def __raw(self, text):
+        """(unweighted vector, buckets touched) for text, before idf and normalization."""
+        counts = Counter(tokenize(text))
+        if not counts:
+            return np.zeros(self.dim, dtype=np.float32), np.zeros(0, dtype=np.int64)
+        buckets, weights = [], []
+        for token, tf in counts.items():
+            idx, signed = self.__token_features(token)
+            buckets.append(idx)
+            weights.append(signed * (1.0 + math.log(tf)))
+        buckets = np.concatenate(buckets)
+        vector = np.bincount(buckets, np.concatenate(weights), minlength=self.dim).astype(np.float32)
+        return vector, buckets
+
+    def __finish(self, vector):
+        vector = vector * self.idf
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def embed(self, texts):
+        """Normalized embeddings for texts as an (n, dim) float32 matrix, using the fitted idf."""
+        return np.asarray([self.__finish(self.__raw(text)[0]) for text in texts], dtype=np.float32).reshape(-1, self.dim)
+
+    def __shard_for_new_file(self):
+        if self.shards:
+            last = self.shards[max(self.shards)]
+            if len(last) < self.shard_size:
+                return last
+        number = int(max(self.shards).split("-")[1]) + 1 if self.shards else 0
+        name = f"shard-{number:04d}"
+        self.shards[name] = _Shard(name, self.dim)
+        return self.shards[name]
+
+    def sync(self, code_files, prune=True):
+        """Bring the index in line with {path: source}, embedding only new or changed files."""
+        counts, changed = Counter(), {}
+        for path, content in code_files.items():
+            digest = file_hash(content)
+            if path not in self.files:
+                counts["added"] += 1
+            elif self.files[path]["hash"] != digest:
+                counts["updated"] += 1
+                self.shards[self.files[path]["shard"]].remove(path)
+            else:
+                counts["unchanged"] += 1
+                continue
+            changed[path] = digest
+        if prune:
+            for path in [p for p in self.files if p not in code_files]:
+                self.shards[self.files.pop(path)["shard"]].remove(path)
+                counts["removed"] += 1
+
+        chunks = {path: self.chunker.chunk(path, code_files[path]) for path in changed}
+        raw = {path: [self.__raw(chunk.name + "\n" + chunk.text) for chunk in file_chunks]
+               for path, file_chunks in chunks.items()}
+        if self.idf is None:
+            df = np.zeros(self.dim, dtype=np.float64)
+            total = 0
+            for file_raw in raw.values():
+                for _, buckets in file_raw:
+                    df[np.unique(buckets)] += 1
+                    total += 1
+            self.idf = (np.log((1 + total) / (1 + df)) + 1).astype(np.float32)
+        for path, file_chunks in chunks.items():
+            shard = self.__shard_for_new_file()
+            shard.append([[path, c.name, c.kind, c.start, c.end] for c in file_chunks],
+                         [self.__finish(vector) for vector, _ in raw[path]])
+            self.files[path] = {"hash": changed[path], "shard": shard.name}
+        return dict(counts)
+
+    def search_many(self, queries, k=10):
+        """Top-k chunks for each query, scoring the whole batch against each block of rows at once."""
+        if self.idf is None or not queries:
+            return [[] for _ in queries]
+        embedded = self.embed(queries)
+        merged = [([], []) for _ in queries]
+        for shard in self.shards.values():
+            for q, (scores, rows) in enumerate(shard.search(embedded, k, self.block_rows)):
+                merged[q][0].extend(scores.tolist())
+                merged[q][1].extend(shard.chunks[row] for row in rows)
+        results = []
+        for scores, chunks in merged:
+            # Ties break by (path, start), so shard layout and row order never change the answer.
+            order = sorted(range(len(scores)), key=lambda i: (-scores[i], chunks[i][0], chunks[i][3]))[:k]
+            results.append([{"path": chunks[i][0], "name": chunks[i][1], "kind": chunks[i][2],
+                             "start": chunks[i][3], "end": chunks[i][4], "score": round(float(scores[i]), 4)}
+                            for i in order])
+        return results
+
+    def search(self, query, k=10):
+        return self.search_many([query], k)[0]
+
+    def save(self, directory):
+        """Write changed shards, then meta.json; each file is replaced atomically."""
+        os.makedirs(directory, exist_ok=True)
+        for name, shard in list(self.shards.items()):
+            if not shard.dirty:
+                continue
+            shard.save(directory)
+            if not len(shard):
+                del self.shards[name]
+                for ext in (".npy", ".json"):
+                    os.remove(os.path.join(directory, name + ext))
+        tmp_path = os.path.join(directory, ".idf.tmp.npy")
+        np.save(tmp_path, self.idf if self.idf is not None else np.ones(self.dim, dtype=np.float32))
+        os.replace(tmp_path, os.path.join(directory, "idf.npy"))
+        meta = {"version": FORMAT_VERSION, "dim": self.dim, "shard_size": self.shard_size,
+                "max_lines": self.chunker.max_lines, "files": self.files, "shards": sorted(self.shards)}
+        tmp_path = os.path.join(directory, ".meta.tmp.json")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, separators=(",", ":"))
+        os.replace(tmp_path, os.path.join(directory, "meta.json"))
+
+    @classmethod
+    def load(cls, directory):
+        with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported index format {meta.get('version')} in {directory}; rebuild it")
+        index = cls(meta["dim"], meta["shard_size"], meta["max_lines"])
+        index.files = meta["files"]
+        index.idf = np.load(os.path.join(directory, "idf.npy"))
+        index.shards = {name: _Shard.load(directory, name, index.dim) for name in meta["shards"]}
+        return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build, update and query a hashed TF-IDF vector index of a codebase.")
+    parser.add_argument("--index", required=True, help="Index directory")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("sync", help="Index a directory, re-embedding only files whose hash changed")
+    build.add_argument("path")
+    build.add_argument("--dim", type=int, default=512, help="Embedding dimension for a new index")
+    build.add_argument("--shard-size", type=int, default=50000, help="Rows per shard for a new index")
+    query = sub.add_parser("query", help="Print the top-k chunks for a query")
+    query.add_argument("text")
+    query.add_argument("-k", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.command == "sync":
+        start = time.perf_counter()
+        if os.path.exists(os.path.join(args.index, "meta.json")):
+            index = VectorIndex.load(args.index)
+        else:
+            index = VectorIndex(dim=args.dim, shard_size=args.shard_size)
+        changes = index.sync(load_files(args.path))
+        index.save(args.index)
+        print(f"{changes} -> {len(index)} chunks from {len(index.files)} files in "
+              f"{len(index.shards)} shards in {time.perf_counter() - start:.2f}s")
+    else:
+        index = VectorIndex.load(args.index)
+        start = time.perf_counter()
+        hits = index.search(args.text, args.k)
+        print(f"{len(hits)} hits in {(time.perf_counter() - start) * 1000:.1f} ms")
+        for hit in hits:
+            print(f"{hit['score']:8.3f}  {hit['path']}:{hit['start']}-{hit['end']}  {hit['kind']} {hit['name']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,128 @@
 
 import os
+import sys
 import json
-from tree_sitter_language_pack import get_language, get_parser
-from github import Github
-import networkx as nx
-from tokenize import tokenize, COMMENT
-import io
-import keyword
 import builtins 
-import nbformat
+import keyword
+import difflib
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from query_engine import get_query, collect, build_results
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+from src.parser.GraphExport import to_dot, write_dot
+
+# Parsers are created once per language per process and reused across files. tree-sitter,
+# networkx, nbformat and PyGithub are imported where first used, so importing this module is cheap.
+_PARSERS = {}
+_worker_analyzer = None
+
+
+def _get_parser(language):
+    """Return the cached (language, parser) pair for a tree-sitter language."""
+    if language not in _PARSERS:
+        from tree_sitter_language_pack import get_language, get_parser
+        _PARSERS[language] = (get_language(language), get_parser(language))
+    return _PARSERS[language]
+
+
+def _empty_results(content, error=None):
+    """Result skeleton shared by every parse outcome."""
+    return {
+        'functions': [], 'classes': [], 'methods': [], 'imports': [],
+        'variables': set(), 'function_calls': [], 'user_function_calls': [],
+        'user_func': set(), 'inbuilt_func': set(), 'user_method': set(),
+        'inbuilt_method': set(), 'user_ds': set(), 'inbuilt_ds': set(),
+        'comments': [], 'uses_self': False, 'content': content, 'error': error
+    }
+
+
+def _point_after(row, text):
+    """Tree-sitter (row, column) reached after writing text from the start of a row."""
+    newlines = text.count(b'\n')
+    if not newlines:
+        return (row, len(text))
+    return (row + newlines, len(text) - text.rfind(b'\n') - 1)
+
+
+def _line_edits(old_source, new_source):
+    """Line-aligned tree-sitter edits that turn old_source into new_source, applied in order."""
+    old_lines = old_source.splitlines(keepends=True)
+    new_lines = new_source.splitlines(keepends=True)
+    # Trim the common head and tail first so difflib only sees the edited region.
+    head = 0
+    while head < min(len(old_lines), len(new_lines)) and old_lines[head] == new_lines[head]:
+        head += 1
+    tail = 0
+    while (tail < min(len(old_lines), len(new_lines)) - head
+           and old_lines[-1 - tail] == new_lines[-1 - tail]):
+        tail += 1
+    old_mid = old_lines[head:len(old_lines) - tail]
+    new_mid = new_lines[head:len(new_lines) - tail]
+    offset = sum(len(line) for line in new_lines[:head])
+    edits = []
+    matcher = difflib.SequenceMatcher(None, old_mid, new_mid, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            offset += sum(len(line) for line in new_mid[j1:j2])
+            continue
+        # Earlier edits are already applied, so positions are in new-source coordinates.
+        old_text = b''.join(old_mid[i1:i2])
+        new_text = b''.join(new_mid[j1:j2])
+        row = head + j1
+        edits.append({
+            'start_byte': offset, 'old_end_byte': offset + len(old_text),
+            'new_end_byte': offset + len(new_text), 'start_point': (row, 0),
+            'old_end_point': _point_after(row, old_text), 'new_end_point': _point_after(row, new_text)
+        })
+        offset += len(new_text)
+    return edits
+
+
+def _chunk_records(root, records):
+    """Split records by the top-level node that contains them: [(start, end, records)]."""
+    children = root.children
+    starts = [child.start_byte for child in children]
+    chunks = [(child.start_byte, child.end_byte, []) for child in children]
+    for record in records:
+        index = bisect_right(starts, record['start_byte']) - 1
+        if index >= 0:
+            chunks[index][2].append(record)
+    return chunks
+
+
+def _shift_record(record, byte_delta, line_delta):
+    """Copy a cached record to where its unchanged text sits after an edit."""
+    if not byte_delta and not line_delta:
+        return record
+    return dict(record, lineno=record['lineno'] + line_delta,
+                start_byte=record['start_byte'] + byte_delta, end_byte=record['end_byte'] + byte_delta)
+
+
+def _init_worker(input_path, github_token):
+    """Give each pool worker its own analyzer so parsers stay warm between batches."""
+    global _worker_analyzer
+    # Trees built in a worker never reach the parent, so there is nothing worth caching.
+    _worker_analyzer = CodebaseAnalyzer(input_path, github_token, tree_cache_size=0)
+
+
+def _parse_batch(language, batch):
+    return _worker_analyzer.parse_batch(language, batch)
 
 
 class CodebaseAnalyzer:
-    def __init__(self, input_path, github_token=None):
+    def __init__(self, input_path, github_token=None, tree_cache_size=128):
+        import networkx as nx
         self.input_path = input_path
         self.github_token = github_token
+        # Most recently parsed trees, kept so update_file() can re-parse edits incrementally.
+        self.tree_cache_size = tree_cache_size
+        self.__trees = OrderedDict()
+        # Reference index for live graph patching, built on the first refresh_file()/remove_file().
+        self.__module_refs = None
+        self.__defined_in = {}
+        self.__called_from = {}
+        self.__imported_by = {}
         self.graph = nx.DiGraph()
         self.parsed = {}
         self.file_module_map = {}
@@ -36,16 +144,19 @@ class CodebaseAnalyzer:
             ".json", ".yaml", ".yml", ".toml", ".xml",
             ".html", ".css", ".scss",
             ".md", ".rst", ".txt",
-            ".ipynb", ".sh", ".bat", ".ini", ".cfg",
+            ".ipynb", ".sh", ".bat", ".ini", ".cfg", ".go",
             ".partial_movie_file_list"
         ]
-        self.__reserved_words = set(keyword.kwlist)
         self.__inbuilt_functions = set(dir(builtins))
         self.__inbuilt_datastructures = {
             "list", "dict", "tuple", "set", "frozenset", "deque", "Counter",
             "DefaultDict", "OrderedDict", "array", "queue", "bytes", "bytearray", "memoryview"
         }
         self.__inbuilt_methods = {'append', 'extend', 'pop', 'remove', 'sort', 'clear'}
+        # Python builtins only make sense for classifying Python calls; Python defs named after a
+        # keyword or builtin are left out of the results, bodies included.
+        self.__inbuilt_names = {'python': (self.__inbuilt_functions, self.__inbuilt_methods,
+                                           set(keyword.kwlist) | self.__inbuilt_functions)}
 
     def __load_codebase(self):
         """Fetch code files from local path or GitHub URL."""
@@ -78,6 +189,7 @@ class CodebaseAnalyzer:
 
         print(f"\nScanning codebase at: {self.input_path}")
         if self.input_path.startswith("https://github.com"):
+            from github import Github
             repo_name = self.input_path.split('github.com/')[1].rstrip('/')
             g = Github(self.github_token)
             repo = g.get_repo(repo_name)
@@ -119,354 +231,242 @@ class CodebaseAnalyzer:
         print(f"Total files successfully loaded: {total_loaded}")
         return code_files
 
-    def __is_probably_datastructure(self, node, language, results):
-        """Check if a class resembles a data structure."""
-        special_methods = {"__getitem__", "__setitem__", "__delitem__", "__iter__", "__next__", "__len__", "__contains__"}
-        name_node = node.child_by_field_name('name')
-        class_name = name_node.text.decode('utf-8') if name_node else None
-        method_names = {m['name'] for m in results['methods'] if m.get('class') == class_name}
-        if special_methods & method_names:
-            return True
-        for child in node.children:
-            if language == 'python' and child.type == 'argument_list':
-                for arg in child.children:
-                    if arg.type == 'identifier' and arg.text.decode('utf-8') in self.__inbuilt_datastructures:
-                        return True
-            elif language in ('java', 'javascript', 'typescript') and child.type == 'superclass':
-                base_name = child.children[1].text.decode('utf-8') if len(child.children) > 1 else ''
-                if base_name in self.__inbuilt_datastructures:
-                    return True
-        return False
-
     def __parse_file(self, file_path, content, language):
         """Parse a file using Tree-sitter or as text for non-code files or .ipynb."""
         print(f"Attempting to parse: {file_path} (language: {language})")
         if language == 'text' or os.path.splitext(file_path)[1].lower() == '.ipynb':
             if os.path.splitext(file_path)[1].lower() == '.ipynb':
                 try:
+                    import nbformat
                     nb = nbformat.from_string(content)
                     content = "\n".join(cell["source"] for cell in nb["cells"] if cell["cell_type"] == "code")
                     language = 'python'  # Parse .ipynb code cells as Python
                 except Exception as e:
                     print(f"Failed to parse .ipynb {file_path}: {e}")
-                    return {
-                        'functions': [], 'classes': [], 'methods': [], 'imports': [],
-                        'variables': set(), 'function_calls': [], 'user_function_calls': [],
-                        'user_func': set(), 'inbuilt_func': set(), 'user_method': set(),
-                        'inbuilt_method': set(), 'user_ds': set(), 'inbuilt_ds': set(),
-                        'comments': [], 'uses_self': False, 'content': content,
-                        'error': f"IPYNBError: {str(e)}"
-                    }
+                    return _empty_results(content, f"IPYNBError: {str(e)}")
             else:
                 print(f"Non-code file detected, storing content only: {file_path}")
-                return {
-                    'functions': [], 'classes': [], 'methods': [], 'imports': [],
-                    'variables': set(), 'function_calls': [], 'user_function_calls': [],
-                    'user_func': set(), 'inbuilt_func': set(), 'user_method': set(),
-                    'inbuilt_method': set(), 'user_ds': set(), 'inbuilt_ds': set(),
-                    'comments': [], 'uses_self': False, 'content': content, 'error': None
-                }
+                return _empty_results(content)
         try:
-            LANG = get_language(language)
-            parser = get_parser(language)
-            tree = parser.parse(content.encode('utf-8'))
-            results = {
-                'functions': [], 'classes': [], 'methods': [], 'imports': [],
-                'variables': set(), 'function_calls': [], 'user_function_calls': [],
-                'user_func': set(), 'inbuilt_func': set(), 'user_method': set(),
-                'inbuilt_method': set(), 'user_ds': set(), 'inbuilt_ds': set(),
-                'comments': [], 'uses_self': False, 'content': content, 'error': None
-            }
-            user_defined_funcs = set()
-            user_defined_methods = set()
-            class_context = None
-
-            def traverse(node):
-                nonlocal class_context
-                if language == 'python':
-                    if node.type == 'function_definition':
-                        name_node = node.child_by_field_name('name')
-                        name = name_node.text.decode('utf-8') if name_node else 'anonymous'
-                        if name in self.__reserved_words or name in self.__inbuilt_functions:
-                            return
-                        params = []
-                        for param in node.child_by_field_name('parameters').children:
-                            if param.type == 'identifier':
-                                params.append(param.text.decode('utf-8'))
-                        returns = None
-                        return_exprs = []
-                        for child in node.children:
-                            if child.type == 'type' and child.text:
-                                returns = child.text.decode('utf-8')
-                            if child.type == 'block':
-                                for stmt in child.children:
-                                    if stmt.type == 'return_statement' and len(stmt.children) > 1:
-                                        return_exprs.append(stmt.children[1].text.decode('utf-8'))
-                        func_info = {
-                            'name': name, 'args': params, 'returns': returns, 'decorators': [],
-                            'lineno': node.start_point[0] + 1, 'return_exprs': return_exprs,
-                            'class': class_context.text.decode('utf-8') if class_context and class_context.child_by_field_name('name') else None
-                        }
-                        if 'self' in params:
-                            results['uses_self'] = True
-                        if class_context:
-                            results['methods'].append(func_info)
-                            user_defined_methods.add(name)
-                            results['user_method'].add(name)
-                        else:
-                            results['functions'].append(func_info)
-                            user_defined_funcs.add(name)
-                            results['user_func'].add(name)
-                    elif node.type == 'class_definition':
-                        class_context = node
-                        name_node = node.child_by_field_name('name')
-                        class_name = name_node.text.decode('utf-8') if name_node else 'anonymous'
-                        bases = []
-                        for child in node.children:
-                            if child.type == 'argument_list':
-                                for arg in child.children:
-                                    if arg.type == 'identifier':
-                                        bases.append(arg.text.decode('utf-8'))
-                        is_ds = self.__is_probably_datastructure(node, language, results)
-                        results['classes'].append({
-                            'name': class_name, 'bases': bases, 'lineno': node.start_point[0] + 1,
-                            'is_datastructure': is_ds
-                        })
-                        if is_ds:
-                            results['user_ds'].add(class_name)
-                        class_context = None
-                    elif node.type in ('import_statement', 'import_from_statement'):
-                        for child in node.children:
-                            if child.type == 'import_list':
-                                for import_node in child.children:
-                                    module = None
-                                    alias = None
-                                    if import_node.type in ('identifier', 'dotted_name'):
-                                        module = import_node.text.decode('utf-8')
-                                    elif import_node.type == 'aliased_import':
-                                        for subchild in import_node.children:
-                                            if subchild.type in ('identifier', 'dotted_name'):
-                                                module = subchild.text.decode('utf-8')
-                                            elif subchild.type == 'alias':
-                                                alias = subchild.children[-1].text.decode('utf-8') if subchild.children else None
-                                    if module:
-                                        results['imports'].append({
-                                            'module': module,
-                                            'name': module,
-                                            'asname': alias,
-                                            'lineno': node.start_point[0] + 1
-                                        })
-                    elif node.type == 'assignment':
-                        name_node = node.child_by_field_name('left')
-                        if name_node and name_node.type == 'identifier':
-                            name = name_node.text.decode('utf-8')
-                            if name not in self.__reserved_words:
-                                results['variables'].add(name)
-                        elif name_node and name_node.type == 'tuple':
-                            for elt in name_node.children:
-                                if elt.type == 'identifier':
-                                    name = elt.text.decode('utf-8')
-                                    if name not in self.__reserved_words:
-                                        results['variables'].add(name)
-                    elif node.type == 'call':
-                        callee = node.child_by_field_name('function')
-                        if callee:
-                            fname = callee.text.decode('utf-8')
-                            args = []
-                            for arg in node.child_by_field_name('arguments').children:
-                                if arg.type in ('string', 'integer', 'float', 'list', 'dictionary', 'set', 'tuple'):
-                                    args.append(arg.text.decode('utf-8'))
-                                else:
-                                    args.append('<dynamic>')
-                            call_info = {
-                                'name': fname, 'lineno': node.start_point[0] + 1, 'args': args
-                            }
-                            results['function_calls'].append(call_info)
-                            fname_base = fname.split('.')[0]
-                            if fname_base in user_defined_funcs:
-                                results['user_function_calls'].append(call_info)
-                                results['user_func'].add(fname_base)
-                            elif fname_base in self.__inbuilt_functions:
-                                results['inbuilt_func'].add(fname_base)
-                            elif '.' in fname and fname.split('.')[-1] in user_defined_methods:
-                                results['user_method'].add(fname.split('.')[-1])
-                            elif '.' in fname and fname.split('.')[-1] in self.__inbuilt_methods:
-                                results['inbuilt_method'].add(fname.split('.')[-1])
-                    elif node.type in ('list', 'dictionary', 'tuple', 'set'):
-                        results['inbuilt_ds'].add(node.type)
-                    elif node.type == 'identifier' and node.text.decode('utf-8') == 'self':
-                        results['uses_self'] = True
-                    elif node.type == 'comment':
-                        results['comments'].append({
-                            'text': node.text.decode('utf-8').strip(),
-                            'lineno': node.start_point[0] + 1,
-                            'type': 'inline'
-                        })
-                elif language in ('java', 'javascript', 'typescript'):
-                    if node.type in ('method_declaration', 'function_declaration'):
-                        name_node = node.child_by_field_name('name')
-                        name = name_node.text.decode('utf-8') if name_node else 'anonymous'
-                        params = []
-                        for param in node.child_by_field_name('parameters').children:
-                            if param.type == 'formal_parameter':
-                                params.append(param.children[1].text.decode('utf-8') if len(param.children) > 1 else '')
-                        returns = None
-                        for child in node.children:
-                            if child.type == 'type_identifier':
-                                returns = child.text.decode('utf-8')
-                        func_info = {
-                            'name': name, 'args': params, 'returns': returns, 'decorators': [],
-                            'lineno': node.start_point[0] + 1, 'return_exprs': [], 'class': None
-                        }
-                        if class_context:
-                            results['methods'].append(func_info)
-                            user_defined_methods.add(name)
-                            results['user_method'].add(name)
-                        else:
-                            results['functions'].append(func_info)
-                            user_defined_funcs.add(name)
-                            results['user_func'].add(name)
-                    elif node.type == 'class_declaration':
-                        class_context = node
-                        name_node = node.child_by_field_name('name')
-                        class_name = name_node.text.decode('utf-8') if name_node else 'anonymous'
-                        bases = []
-                        for child in node.children:
-                            if child.type == 'superclass':
-                                bases.append(child.children[1].text.decode('utf-8') if len(child.children) > 1 else '')
-                        is_ds = self.__is_probably_datastructure(node, language, results)
-                        results['classes'].append({
-                            'name': class_name, 'bases': bases, 'lineno': node.start_point[0] + 1,
-                            'is_datastructure': is_ds
-                        })
-                        if is_ds:
-                            results['user_ds'].add(class_name)
-                        class_context = None
-                    elif node.type == 'import_declaration':
-                        module = node.children[1].text.decode('utf-8').split('.')[-1]
-                        results['imports'].append({
-                            'module': module, 'name': module, 'asname': None,
-                            'lineno': node.start_point[0] + 1
-                        })
-                    elif node.type == 'variable_declarator':
-                        name_node = node.child_by_field_name('name')
-                        if name_node:
-                            name = name_node.text.decode('utf-8')
-                            results['variables'].add(name)
-                    elif node.type == 'call_expression':
-                        callee = node.child_by_field_name('function')
-                        if callee:
-                            fname = callee.text.decode('utf-8')
-                            args = []
-                            for arg in node.child_by_field_name('arguments').children:
-                                if arg.type in ('string', 'number', 'array', 'object'):
-                                    args.append(arg.text.decode('utf-8'))
-                                else:
-                                    args.append('<dynamic>')
-                            call_info = {
-                                'name': fname, 'lineno': node.start_point[0] + 1, 'args': args
-                            }
-                            results['function_calls'].append(call_info)
-                            fname_base = fname.split('.')[0]
-                            if fname_base in user_defined_funcs:
-                                results['user_function_calls'].append(call_info)
-                                results['user_func'].add(fname_base)
-                            elif '.' in fname and fname.split('.')[-1] in user_defined_methods:
-                                results['user_method'].add(fname.split('.')[-1])
-                    elif node.type == 'comment':
-                        results['comments'].append({
-                            'text': node.text.decode('utf-8').strip(),
-                            'lineno': node.start_point[0] + 1,
-                            'type': 'inline'
-                        })
-                elif language in ('cpp', 'c'):
-                    if node.type == 'function_definition':
-                        name_node = node.child_by_field_name('declarator')
-                        name = name_node.text.decode('utf-8')[:name_node.text.decode('utf-8').index('(')] if name_node and '(' in name_node.text.decode('utf-8') else 'anonymous'
-                        params = []
-                        for param in node.child_by_field_name('parameters').children:
-                            if param.type == 'parameter_declaration':
-                                params.append(param.children[-1].text.decode('utf-8') if param.children else '')
-                        returns = None
-                        for child in node.children:
-                            if child.type == 'type_identifier':
-                                returns = child.text.decode('utf-8')
-                        func_info = {
-                            'name': name, 'args': params, 'returns': returns, 'decorators': [],
-                            'lineno': node.start_point[0] + 1, 'return_exprs': [], 'class': None
-                        }
-                        results['functions'].append(func_info)
-                        user_defined_funcs.add(name)
-                        results['user_func'].add(name)
-                    elif node.type == 'class_specifier':
-                        class_context = node
-                        name_node = node.child_by_field_name('name')
-                        class_name = name_node.text.decode('utf-8') if name_node else 'anonymous'
-                        bases = []
-                        for child in node.children:
-                            if child.type == 'base_class_clause':
-                                bases.append(child.children[1].text.decode('utf-8') if len(child.children) > 1 else '')
-                        results['classes'].append({
-                            'name': class_name, 'bases': bases, 'lineno': node.start_point[0] + 1,
-                            'is_datastructure': False
-                        })
-                        class_context = None
-                    elif node.type == 'declaration':
-                        name_node = node.child_by_field_name('declarator')
-                        if name_node:
-                            name = name_node.text.decode('utf-8')
-                            results['variables'].add(name)
-                    elif node.type == 'call_expression':
-                        callee = node.child_by_field_name('function')
-                        if callee:
-                            fname = callee.text.decode('utf-8')
-                            args = []
-                            for arg in node.child_by_field_name('arguments').children:
-                                if arg.type in ('number', 'string'):
-                                    args.append(arg.text.decode('utf-8'))
-                                else:
-                                    args.append('<dynamic>')
-                            call_info = {
-                                'name': fname, 'lineno': node.start_point[0] + 1, 'args': args
-                            }
-                            results['function_calls'].append(call_info)
-                            if fname in user_defined_funcs:
-                                results['user_function_calls'].append(call_info)
-                                results['user_func'].add(fname)
-                    elif node.type == 'comment':
-                        results['comments'].append({
-                            'text': node.text.decode('utf-8').strip(),
-                            'lineno': node.start_point[0] + 1,
-                            'type': 'inline'
-                        })
-                for child in node.children:
-                    traverse(child)
-
-            traverse(tree.root_node)
-            if language == 'python':
-                try:
-                    tokens = tokenize(io.StringIO(content).readline)
-                    for tok in tokens:
-                        if tok.type == COMMENT:
-                            results['comments'].append({
-                                'text': tok.string.strip(),
-                                'lineno': tok.start[0],
-                                'type': 'inline'
-                            })
-                except Exception as e:
-                    print(f"Comment parsing failed for {file_path}: {e}")
+            LANG, parser = _get_parser(language)
+            source = content.encode('utf-8')
+            tree = parser.parse(source)
+            results = _empty_results(content)
+            query = get_query(language, LANG)
+            if query is not None:
+                records = collect(query, tree.root_node, source)
+                self.__cache_tree(file_path, language, tree, source, _chunk_records(tree.root_node, records))
+                inbuilt_functions, inbuilt_methods, reserved = self.__inbuilt_names.get(language, ((), (), ()))
+                build_results(records, results, inbuilt_functions, inbuilt_methods, self.__inbuilt_datastructures,
+                              reserved)
             print(f"Successfully parsed: {file_path} (functions: {len(results['functions'])}, classes: {len(results['classes'])}, methods: {len(results['methods'])})")
             return results
         except Exception as e:
             print(f"Parsing failed for {file_path}: {e}")
-            return {
-                'functions': [], 'classes': [], 'methods': [], 'imports': [],
-                'variables': set(), 'function_calls': [], 'user_function_calls': [],
-                'user_func': set(), 'inbuilt_func': set(), 'user_method': set(),
-                'inbuilt_method': set(), 'user_ds': set(), 'inbuilt_ds': set(),
-                'comments': [], 'uses_self': False, 'content': content,
-                'error': f"ParseError: {str(e)}"
-            }
+            return _empty_results(content, f"ParseError: {str(e)}")
+
+    def __cache_tree(self, file_path, language, tree, source, chunks):
+        """Remember a parse for incremental updates, evicting the least recently used tree."""
+        if self.tree_cache_size <= 0:
+            return
+        self.__trees[file_path] = {'language': language, 'tree': tree, 'source': source, 'chunks': chunks}
+        self.__trees.move_to_end(file_path)
+        while len(self.__trees) > self.tree_cache_size:
+            self.__trees.popitem(last=False)
+
+    def __reparse_incremental(self, file_path, content, language, entry):
+        """Re-parse from the cached tree and re-extract only top-level nodes touched by the edit."""
+        LANG, parser = _get_parser(language)
+        query = get_query(language, LANG)
+        source = content.encode('utf-8')
+        edits = _line_edits(entry['source'], source)
+        old_tree = entry['tree']
+        for edit in edits:
+            old_tree.edit(**edit)
+        tree = parser.parse(source, old_tree)
+        # changed_ranges only reports structural changes, so the edited text itself is added too.
+        touched = [(edit['start_byte'], edit['new_end_byte']) for edit in edits]
+        touched += [(r.start_byte, r.end_byte) for r in old_tree.changed_ranges(tree)]
+        old_chunks = {start: (end, records) for start, end, records in entry['chunks']}
+        chunks = []
+        reextracted = 0
+        for child in tree.root_node.children:
+            start, end = child.start_byte, child.end_byte
+            if not any(t_start <= end and t_end >= start for t_start, t_end in touched):
+                byte_delta = line_delta = 0
+                for edit in edits:
+                    if edit['new_end_byte'] > start:
+                        break
+                    byte_delta += edit['new_end_byte'] - edit['old_end_byte']
+                    line_delta += edit['new_end_point'][0] - edit['old_end_point'][0]
+                cached = old_chunks.get(start - byte_delta)
+                if cached is not None and cached[0] == end - byte_delta:
+                    chunks.append((start, end, [_shift_record(r, byte_delta, line_delta) for r in cached[1]]))
+                    continue
+            chunks.append((start, end, collect(query, child, source)))
+            reextracted += 1
+        self.__cache_tree(file_path, language, tree, source, chunks)
+        results = _empty_results(content)
+        inbuilt_functions, inbuilt_methods, reserved = self.__inbuilt_names.get(language, ((), (), ()))
+        build_results([r for _, _, records in chunks for r in records], results, inbuilt_functions,
+                      inbuilt_methods, self.__inbuilt_datastructures, reserved)
+        print(f"Incrementally re-parsed: {file_path} ({reextracted}/{len(chunks)} top-level nodes re-extracted)")
+        return results
+
+    def update_file(self, file_path, content=None):
+        """Re-parse one edited file, reusing its cached tree when possible, and patch self.parsed."""
+        if content is None:
+            with open(file_path, "r", encoding="utf-8") as f:
+                content = f.read()
+        extension = os.path.splitext(file_path)[1].lower()
+        language = self.__language_map.get(extension[1:] if extension else 'text', 'text')
+        entry = self.__trees.get(file_path)
+        results = None
+        if entry is not None and entry['language'] == language:
+            try:
+                results = self.__reparse_incremental(file_path, content, language, entry)
+            except Exception as e:
+                print(f"Incremental parse failed for {file_path}, parsing from scratch: {e}")
+                self.__trees.pop(file_path, None)
+        if results is None:
+            results = self.__parse_file(file_path, content, language)
+        self.parsed[file_path] = results
+        return results
+
+    def forget_file(self, file_path):
+        """Drop a deleted file from self.parsed and the tree cache."""
+        self.__trees.pop(file_path, None)
+        self.parsed.pop(file_path, None)
+
+    def tracks(self, file_path):
+        """Whether analyze() would load this file."""
+        return os.path.splitext(file_path)[1].lower() in self.__allowed_exts
+
+    def __module_name(self, file_path):
+        if self.input_path.startswith("https://github.com"):
+            return file_path.replace("/", ".").rsplit(".", 1)[0]
+        return os.path.relpath(file_path, self.input_path).replace(os.sep, ".").rsplit(".", 1)[0]
+
+    def __index_module(self, module_name, data):
+        """Record what a module defines, calls and imports so its edges can be recomputed alone."""
+        defined = {f["name"] for f in data.get("functions", [])} | {m["name"] for m in data.get("methods", [])}
+        called = {call["name"].split('.')[0] for call in data.get("function_calls", [])}
+        imported = {imp.get("module") for imp in data.get("imports", []) if imp.get("module")}
+        self.__module_refs[module_name] = (defined, called, imported)
+        for name in defined:
+            self.__defined_in.setdefault(name, set()).add(module_name)
+        for name in called:
+            self.__called_from.setdefault(name, set()).add(module_name)
+        for imported_module in imported:
+            self.__imported_by.setdefault(imported_module, set()).add(module_name)
+
+    def __unindex_module(self, module_name):
+        defined, called, imported = self.__module_refs.pop(module_name, (set(), set(), set()))
+        for index, names in ((self.__defined_in, defined), (self.__called_from, called),
+                             (self.__imported_by, imported)):
+            for name in names:
+                modules = index.get(name)
+                if modules is not None:
+                    modules.discard(module_name)
+                    if not modules:
+                        del index[name]
+
+    def __relink_module(self, module_name):
+        """Recompute every edge into and out of one module from the reference index."""
+        self.graph.remove_edges_from(list(self.graph.in_edges(module_name)) + list(self.graph.out_edges(module_name)))
+        defined, called, imported = self.__module_refs[module_name]
+        edges = set()
+        for imported_module in imported:
+            if imported_module in self.module_file_map:
+                edges.add((imported_module, module_name))
+        for name in called:
+            edges.update((mod, module_name) for mod in self.__defined_in.get(name, ()))
+        edges.update((module_name, mod) for mod in self.__imported_by.get(module_name, ()))
+        for name in defined:
+            edges.update((module_name, mod) for mod in self.__called_from.get(name, ()))
+        self.graph.add_edges_from(edge for edge in edges if edge[0] != edge[1])
+
+    def __ensure_index(self):
+        """Build the reference index and re-derive the graph from it.
+
+        The batch graph only links a module to modules loaded before it; live updates link
+        against every known module, so the whole edge set is recomputed once up front.
+        """
+        if self.__module_refs is not None:
+            return
+        self.__module_refs = {}
+        for file_path, data in self.parsed.items():
+            module_name = self.__module_name(file_path)
+            self.file_module_map[file_path] = module_name
+            self.module_file_map[module_name] = file_path
+            self.graph.add_node(module_name)
+            self.__index_module(module_name, data)
+        self.graph.remove_edges_from(list(self.graph.edges))
+        for module_name in self.__module_refs:
+            self.__relink_module(module_name)
+
+    def refresh_file(self, file_path, content=None):
+        """Re-parse a changed or new file and patch its dependency graph edges in place."""
+        self.__ensure_index()
+        data = self.update_file(file_path, content)
+        module_name = self.__module_name(file_path)
+        self.__unindex_module(module_name)
+        self.file_module_map[file_path] = module_name
+        self.module_file_map[module_name] = file_path
+        self.graph.add_node(module_name)
+        self.__index_module(module_name, data)
+        self.__relink_module(module_name)
+        return module_name
+
+    def remove_file(self, file_path):
+        """Drop a deleted file and its module's edges from the live state."""
+        self.__ensure_index()
+        self.forget_file(file_path)
+        module_name = self.file_module_map.pop(file_path, None)
+        if module_name is None:
+            return None
+        self.__unindex_module(module_name)
+        self.module_file_map.pop(module_name, None)
+        if module_name in self.graph:
+            self.graph.remove_node(module_name)
+        # Modules importing this one lose their edge with it but keep their references indexed.
+        return module_name
+
+    def parse_batch(self, language, batch):
+        """Parse (file_path, content) pairs of one language with a single warm parser."""
+        parsed = {}
+        for file_path, code in batch:
+            try:
+                parsed[file_path] = self.__parse_file(file_path, code, language)
+            except MemoryError:
+                print(f"Skipped due to memory constraints: {file_path}")
+                parsed[file_path] = _empty_results(code, "MemoryError: File too large to parse")
+        return parsed
+
+    def __group_by_language(self, code_dict):
+        """Bucket files by tree-sitter language so each batch reuses one parser."""
+        groups = {}
+        for file_path, code in code_dict.items():
+            extension = os.path.splitext(file_path)[1].lower()
+            language = self.__language_map.get(extension[1:] if extension else 'text', 'text')
+            groups.setdefault(language, []).append((file_path, code))
+        return groups
+
+    def __parse_parallel(self, groups, workers):
+        """Parse language groups across a process pool, one language per batch."""
+        parsed = {}
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.input_path, self.github_token)) as pool:
+            futures = []
+            for language, items in groups.items():
+                # Split each language into roughly one batch per worker; a worker that picks up
+                # several batches of the same language reuses its cached parser for all of them.
+                size = max(1, -(-len(items) // workers))
+                for start in range(0, len(items), size):
+                    futures.append(pool.submit(_parse_batch, language, items[start:start + size]))
+            for future in futures:
+                parsed.update(future.result())
+        return parsed
 
     def __select_files(self, mode, num_files, criteria):
         """Select files based on mode and criteria."""
@@ -509,15 +509,16 @@ class CodebaseAnalyzer:
 
     def __build_dependency_graph(self):
         """Build dependency graph for cross-file analysis."""
+        self.__module_refs = None
+        self.__defined_in, self.__called_from, self.__imported_by = {}, {}, {}
+        defined_names = {}
         for file_path in self.parsed:
-            if self.input_path.startswith("https://github.com"):
-                module_name = file_path.replace("/", ".").rsplit(".", 1)[0]
-            else:
-                module_name = os.path.relpath(file_path, self.input_path).replace(os.sep, ".").rsplit(".", 1)[0]
+            module_name = self.__module_name(file_path)
             self.file_module_map[file_path] = module_name
             self.module_file_map[module_name] = file_path
             self.graph.add_node(module_name)
             data = self.parsed[file_path]
+            defined_names[module_name] = {f["name"] for f in data.get("functions", [])} | {m["name"] for m in data.get("methods", [])}
             print(f"\nBuilding edges for {module_name}")
             print(f"  - Imports: {len(data.get('imports', []))}")
             print(f"  - Function Calls: {len(data.get('function_calls', []))}")
@@ -533,43 +534,36 @@ class CodebaseAnalyzer:
                 for mod, mod_file in self.module_file_map.items():
                     if mod_file == file_path:
                         continue
-                    mod_data = self.parsed.get(mod_file, {})
-                    user_funcs = {f["name"] for f in mod_data.get("functions", [])}
-                    user_methods = {m["name"] for m in mod_data.get("methods", [])}
-                    if fname_base in user_funcs or fname_base in user_methods:
+                    if fname_base in defined_names.get(mod, ()):
                         call_edges.append((mod, module_name, fname))
             for src, dst, fname in sorted(call_edges, key=lambda x: x[2]):
                 self.graph.add_edge(src, dst)
 
     def __to_dot(self):
         """Generate DOT representation of the dependency graph."""
-        dot = ['digraph G {']
-        for node in sorted(self.graph.nodes):
-            dot.append(f'"{node}"')
-        for u, v in sorted(self.graph.edges):
-            dot.append(f'"{u}" -> "{v}";')
-        dot.append('}')
-        return '\n'.join(dot)
-
-    def analyze(self, sort_by="name"):
-        """Public method to analyze the codebase."""
+        return to_dot(self.graph)
+
+    def to_dot(self, f=None):
+        """DOT text for the current, possibly live-patched, dependency graph, or written to text
+        file object f incrementally."""
+        if f is not None:
+            write_dot(self.graph, f)
+            return None
+        return self.__to_dot()
+
+    def analyze(self, sort_by="name", workers=1):
+        """Public method to analyze the codebase. workers > 1 parses in a process pool."""
         code_dict = self.__load_codebase()
-        for file_path, code in code_dict.items():
-            extension = os.path.splitext(file_path)[1].lower()
-            language = self.__language_map.get(extension[1:] if extension else 'text', 'text')
-            try:
-                parsed_data = self.__parse_file(file_path, code, language)
-                self.parsed[file_path] = parsed_data
-            except MemoryError:
-                print(f"Skipped due to memory constraints: {file_path}")
-                self.parsed[file_path] = {
-                    'functions': [], 'classes': [], 'methods': [], 'imports': [],
-                    'variables': set(), 'function_calls': [], 'user_function_calls': [],
-                    'user_func': set(), 'inbuilt_func': set(), 'user_method': set(),
-                    'inbuilt_method': set(), 'user_ds': set(), 'inbuilt_ds': set(),
-                    'comments': [], 'uses_self': False, 'content': code,
-                    'error': "MemoryError: File too large to parse"
-                }
+        groups = self.__group_by_language(code_dict)
+        if workers and workers > 1 and len(code_dict) > 1:
+            parsed = self.__parse_parallel(groups, workers)
+        else:
+            parsed = {}
+            for language, items in groups.items():
+                parsed.update(self.parse_batch(language, items))
+        # Keep the load order so graph construction and output stay deterministic.
+        for file_path in code_dict:
+            self.parsed[file_path] = parsed[file_path]
         self.__build_dependency_graph()
         ast_result = self.__get_ast_info(mode=1, num_files=len(self.parsed), criteria=sort_by)
         return {
@@ -579,36 +573,36 @@ class CodebaseAnalyzer:
             "ast_info": ast_result
         }
 
-# Initialize and run CodebaseAnalyzer
-analyzer = CodebaseAnalyzer(
-    input_path=r"C:\Users\Yatharth_Shivam\OneDrive\Documents\repos\seering\src"
-)
-result = analyzer.analyze(sort_by="name")
-
-# Print results to terminal
-print("\n=== Codebase Analysis Results ===")
-print("\nDirectory Structure:")
-print(result["directory"])
-
-print("\nParsed Files:")
-for file_path, info in result["ast"].items():
-    print(f"\nFile: {file_path}")
-    print("Metadata:")
-    for key, value in info.items():
-        if key != "content":
-            print(f"  {key}: {value}")
-    print("Content (truncated):")
-    content = info["content"]
-    print(f"    {content[:100] + '...' if len(content) > 100 else content}")
-
-print("\nDependency Graph (DOT format):")
-print(result["graph"])
-
-print("\nHierarchy Dependencies:")
-for file_path, info in result["ast_info"].items():
-    print(f"  File: {file_path}")
-    print(f"    Actual Code (truncated): {info['actual_code'][:100] + '...' if len(info['actual_code']) > 100 else info['actual_code']}")
-    print("    AST Info:")
-    for key, value in info["ast_info"].items():
-        print(f"      {key}: {value}")
+if __name__ == "__main__":
+    # Initialize and run CodebaseAnalyzer
+    analyzer = CodebaseAnalyzer(
+        input_path=r"C:\Users\Yatharth_Shivam\OneDrive\Documents\repos\seering\src"
+    )
+    result = analyzer.analyze(sort_by="name")
+
+    # Print results to terminal
+    print("\n=== Codebase Analysis Results ===")
+    print("\nDirectory Structure:")
+    print(result["directory"])
+
+    print("\nParsed Files:")
+    for file_path, info in result["ast"].items():
+        print(f"\nFile: {file_path}")
+        print("Metadata:")
+        for key, value in info.items():
+            if key != "content":
+                print(f"  {key}: {value}")
+        print("Content (truncated):")
+        content = info["content"]
+        print(f"    {content[:100] + '...' if len(content) > 100 else content}")
+
+    print("\nDependency Graph (DOT format):")
+    print(result["graph"])
 
+    print("\nHierarchy Dependencies:")
+    for file_path, info in result["ast_info"].items():
+        print(f"  File: {file_path}")
+        print(f"    Actual Code (truncated): {info['actual_code'][:100] + '...' if len(info['actual_code']) > 100 else info['actual_code']}")
+        print("    AST Info:")
+        for key, value in info["ast_info"].items():
+            print(f"      {key}: {value}")
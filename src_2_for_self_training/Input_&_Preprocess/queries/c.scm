@@ -0,0 +1,25 @@
+; Functions, including ones returning pointers
+(function_definition declarator: (function_declarator declarator: (identifier) @function.name)) @function.def
+(function_definition declarator: (pointer_declarator declarator: (function_declarator declarator: (identifier) @function.name))) @function.def
+(function_definition declarator: [(function_declarator parameters: (parameter_list (parameter_declaration declarator: [(identifier) @function.param (pointer_declarator declarator: (identifier) @function.param) (array_declarator declarator: (identifier) @function.param)])))
+                                  (pointer_declarator declarator: (function_declarator parameters: (parameter_list (parameter_declaration declarator: [(identifier) @function.param (pointer_declarator declarator: (identifier) @function.param) (array_declarator declarator: (identifier) @function.param)]))))]) @function.def
+(function_definition type: (_) @function.returns) @function.def
+(function_definition body: (compound_statement (return_statement (_) @function.return))) @function.def
+
+; Structs stand in for classes
+(struct_specifier name: (type_identifier) @class.name body: (field_declaration_list)) @class.def
+
+; Includes
+(preproc_include path: (_) @import.module) @import.def
+
+; Variables
+(declaration declarator: (identifier) @variable.name) @variable.def
+(declaration declarator: (init_declarator declarator: (identifier) @variable.name)) @variable.def
+(declaration declarator: (init_declarator declarator: (pointer_declarator declarator: (identifier) @variable.name))) @variable.def
+
+; Calls
+(call_expression function: (_) @call.name) @call.def
+(call_expression arguments: (argument_list (_) @call.arg)) @call.def
+(call_expression arguments: (argument_list [(number_literal) (string_literal) (char_literal) (true) (false) (null)] @call.literal)) @call.def
+
+(comment) @comment.text @comment.def
@@ -0,0 +1,30 @@
+; Functions, including out-of-line methods (A::f) and ones returning pointers or references
+(function_definition declarator: (function_declarator declarator: [(identifier) (field_identifier) (qualified_identifier) (destructor_name) (operator_name)] @function.name)) @function.def
+(function_definition declarator: [(pointer_declarator declarator: (function_declarator declarator: (_) @function.name))
+                                  (reference_declarator (function_declarator declarator: (_) @function.name))]) @function.def
+(function_definition declarator: (function_declarator parameters: (parameter_list (parameter_declaration declarator: [(identifier) @function.param (pointer_declarator declarator: (identifier) @function.param) (reference_declarator (identifier) @function.param)])))) @function.def
+(function_definition declarator: (function_declarator parameters: (parameter_list (optional_parameter_declaration declarator: (identifier) @function.param)))) @function.def
+(function_definition type: (_) @function.returns) @function.def
+(function_definition body: (compound_statement (return_statement (_) @function.return))) @function.def
+
+(class_specifier name: (type_identifier) @method.class body: (field_declaration_list (function_definition) @method.def))
+(struct_specifier name: (type_identifier) @method.class body: (field_declaration_list (function_definition) @method.def))
+
+; Classes and structs
+(class_specifier name: (type_identifier) @class.name) @class.def
+(struct_specifier name: (type_identifier) @class.name body: (field_declaration_list)) @class.def
+([(class_specifier) (struct_specifier)] (base_class_clause [(type_identifier) (qualified_identifier) (template_type)] @class.base)) @class.def
+
+; Includes
+(preproc_include path: (_) @import.module) @import.def
+
+; Variables
+(declaration declarator: (identifier) @variable.name) @variable.def
+(declaration declarator: (init_declarator declarator: (identifier) @variable.name)) @variable.def
+
+; Calls
+(call_expression function: (_) @call.name) @call.def
+(call_expression arguments: (argument_list (_) @call.arg)) @call.def
+(call_expression arguments: (argument_list [(number_literal) (string_literal) (char_literal) (raw_string_literal) (true) (false) (null)] @call.literal)) @call.def
+
+(comment) @comment.text @comment.def
@@ -0,0 +1,32 @@
+; Functions
+(function_declaration name: (identifier) @function.name) @function.def
+(function_declaration parameters: (parameter_list [(parameter_declaration name: (identifier) @function.param) (variadic_parameter_declaration name: (identifier) @function.param)])) @function.def
+(function_declaration result: (_) @function.returns) @function.def
+(function_declaration body: (block (return_statement (expression_list (_) @function.return)))) @function.def
+
+; Methods, attached to their receiver type
+(method_declaration name: (field_identifier) @function.name) @function.def
+(method_declaration parameters: (parameter_list [(parameter_declaration name: (identifier) @function.param) (variadic_parameter_declaration name: (identifier) @function.param)])) @function.def
+(method_declaration result: (_) @function.returns) @function.def
+(method_declaration body: (block (return_statement (expression_list (_) @function.return)))) @function.def
+(method_declaration receiver: (parameter_list (parameter_declaration type: [(type_identifier) @method.class (pointer_type (type_identifier) @method.class)]))) @method.def
+
+; Struct and interface types stand in for classes
+(type_spec name: (type_identifier) @class.name type: [(struct_type) (interface_type)]) @class.def
+(type_spec type: (struct_type (field_declaration_list (field_declaration !name type: [(type_identifier) (qualified_type)] @class.base)))) @class.def
+
+; Imports
+(import_spec path: (_) @import.module) @import.def
+(import_spec name: (_) @import.alias) @import.def
+
+; Variables
+(short_var_declaration left: (expression_list (identifier) @variable.name)) @variable.def
+(var_spec name: (identifier) @variable.name) @variable.def
+(const_spec name: (identifier) @variable.name) @variable.def
+
+; Calls
+(call_expression function: (_) @call.name) @call.def
+(call_expression arguments: (argument_list (_) @call.arg)) @call.def
+(call_expression arguments: (argument_list [(interpreted_string_literal) (raw_string_literal) (int_literal) (float_literal) (rune_literal) (true) (false) (nil)] @call.literal)) @call.def
+
+(comment) @comment.text @comment.def
@@ -0,0 +1,31 @@
+; Functions and methods (every Java method lives in a class)
+(method_declaration name: (identifier) @function.name) @function.def
+(method_declaration parameters: (formal_parameters [(formal_parameter name: (identifier) @function.param) (spread_parameter (variable_declarator name: (identifier) @function.param))])) @function.def
+(method_declaration type: (_) @function.returns) @function.def
+(method_declaration (modifiers [(marker_annotation) (annotation)] @function.decorator)) @function.def
+(method_declaration body: (block (return_statement (_) @function.return))) @function.def
+(constructor_declaration name: (identifier) @function.name) @function.def
+(constructor_declaration parameters: (formal_parameters (formal_parameter name: (identifier) @function.param))) @function.def
+
+(class_declaration name: (identifier) @method.class body: (class_body [(method_declaration) (constructor_declaration)] @method.def))
+(interface_declaration name: (identifier) @method.class body: (interface_body (method_declaration) @method.def))
+
+; Classes
+(class_declaration name: (identifier) @class.name) @class.def
+(class_declaration superclass: (superclass (type_identifier) @class.base)) @class.def
+(class_declaration interfaces: (super_interfaces (type_list (type_identifier) @class.base))) @class.def
+(interface_declaration name: (identifier) @class.name) @class.def
+
+; Imports
+(import_declaration [(scoped_identifier) (identifier)] @import.module) @import.def
+
+; Variables
+(variable_declarator name: (identifier) @variable.name) @variable.def
+
+; Calls
+(method_invocation name: (identifier) @call.name) @call.def
+(method_invocation object: (_) @call.object) @call.def
+(method_invocation arguments: (argument_list (_) @call.arg)) @call.def
+(method_invocation arguments: (argument_list [(string_literal) (decimal_integer_literal) (decimal_floating_point_literal) (character_literal) (true) (false) (null_literal)] @call.literal)) @call.def
+
+[(line_comment) (block_comment)] @comment.text @comment.def
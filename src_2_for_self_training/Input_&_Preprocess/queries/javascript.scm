@@ -0,0 +1,32 @@
+; Functions
+(function_declaration name: (identifier) @function.name) @function.def
+(function_declaration parameters: (formal_parameters [(identifier) @function.param (assignment_pattern left: (identifier) @function.param) (rest_pattern (identifier) @function.param)])) @function.def
+(function_declaration body: (statement_block (return_statement (_) @function.return))) @function.def
+(variable_declarator name: (identifier) @function.name value: [(arrow_function) (function_expression)]) @function.def
+(variable_declarator value: [(arrow_function parameters: (formal_parameters [(identifier) @function.param (assignment_pattern left: (identifier) @function.param) (rest_pattern (identifier) @function.param)]))
+                             (function_expression parameters: (formal_parameters [(identifier) @function.param (assignment_pattern left: (identifier) @function.param) (rest_pattern (identifier) @function.param)]))]) @function.def
+(variable_declarator value: (arrow_function parameter: (identifier) @function.param)) @function.def
+
+; Methods
+(method_definition name: (property_identifier) @function.name) @function.def
+(method_definition parameters: (formal_parameters [(identifier) @function.param (assignment_pattern left: (identifier) @function.param) (rest_pattern (identifier) @function.param)])) @function.def
+(method_definition body: (statement_block (return_statement (_) @function.return))) @function.def
+(class_declaration name: (identifier) @method.class body: (class_body (method_definition) @method.def))
+
+; Classes
+(class_declaration name: (identifier) @class.name) @class.def
+(class_declaration (class_heritage (_) @class.base)) @class.def
+
+; Imports
+(import_statement source: (string (string_fragment) @import.module)) @import.def
+(call_expression function: (identifier) @_require (#eq? @_require "require") arguments: (arguments (string (string_fragment) @import.module))) @import.def
+
+; Variables
+(variable_declarator name: (identifier) @variable.name) @variable.def
+
+; Calls
+(call_expression function: (_) @call.name) @call.def
+(call_expression arguments: (arguments (_) @call.arg)) @call.def
+(call_expression arguments: (arguments [(string) (template_string) (number) (array) (object) (true) (false) (null)] @call.literal)) @call.def
+
+(comment) @comment.text @comment.def
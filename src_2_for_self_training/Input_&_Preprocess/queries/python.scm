@@ -0,0 +1,43 @@
+; Functions (methods are the same nodes, tagged by the class patterns below)
+(function_definition name: (identifier) @function.name) @function.def
+(function_definition
+  parameters: (parameters
+    [(identifier) @function.param
+     (default_parameter name: (identifier) @function.param)
+     (typed_parameter (identifier) @function.param)
+     (typed_default_parameter name: (identifier) @function.param)
+     (list_splat_pattern (identifier) @function.param)
+     (dictionary_splat_pattern (identifier) @function.param)])) @function.def
+(function_definition return_type: (type) @function.returns) @function.def
+(function_definition body: (block (return_statement (_) @function.return))) @function.def
+(decorated_definition (decorator (_) @function.decorator) definition: (function_definition) @function.def)
+
+(class_definition name: (identifier) @method.class body: (block (function_definition) @method.def))
+(class_definition name: (identifier) @method.class body: (block (decorated_definition definition: (function_definition) @method.def)))
+
+; Classes
+(class_definition name: (identifier) @class.name) @class.def
+(class_definition superclasses: (argument_list [(identifier) (attribute)] @class.base)) @class.def
+
+; Imports, one record per imported name
+(import_statement name: (dotted_name) @import.module @import.def)
+(import_statement name: (aliased_import name: (dotted_name) @import.module alias: (identifier) @import.alias) @import.def)
+(import_from_statement module_name: (_) @import.module name: (dotted_name) @import.name @import.def)
+(import_from_statement module_name: (_) @import.module name: (aliased_import name: (dotted_name) @import.name alias: (identifier) @import.alias) @import.def)
+(import_from_statement module_name: (_) @import.module (wildcard_import) @import.name @import.def)
+
+; Variables
+(assignment left: (identifier) @variable.name) @variable.def
+(assignment left: [(pattern_list (identifier) @variable.name) (tuple_pattern (identifier) @variable.name)]) @variable.def
+(augmented_assignment left: (identifier) @variable.name) @variable.def
+
+; Calls
+(call function: (_) @call.name) @call.def
+(call arguments: (argument_list (_) @call.arg)) @call.def
+(call arguments: (argument_list [(string) (integer) (float) (list) (dictionary) (set) (tuple) (true) (false) (none)] @call.literal)) @call.def
+
+; Built-in data structure literals and self usage
+[(list) (dictionary) (tuple) (set)] @literal.def
+((identifier) @self.def (#eq? @self.def "self"))
+
+(comment) @comment.text @comment.def
@@ -0,0 +1,165 @@
+import os
+
+# Each language ships a queries/<language>.scm file. Captures follow a "<kind>.<field>" naming
+# scheme: "<kind>.def" marks the node a record is built for (function, method, class, import,
+# variable, call, literal, self, comment) and every other capture in the same match becomes a
+# field of that record, keyed by its full capture name. Captures starting with "_" are only
+# used by predicates.
+QUERY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'queries')
+_QUERIES = {}
+
+
+def get_query(language, ts_language):
+    """Compile the extraction query for a language once per process; None if none is shipped."""
+    if language not in _QUERIES:
+        from tree_sitter import Query
+        path = os.path.join(QUERY_DIR, f"{language}.scm")
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                _QUERIES[language] = Query(ts_language, f.read())
+        else:
+            _QUERIES[language] = None
+    return _QUERIES[language]
+
+
+def collect(query, node, source):
+    """Run the query under node and merge captures into one record per definition node."""
+    from tree_sitter import QueryCursor
+    texts = {}
+
+    def text(n):
+        # Each captured range is decoded at most once, however many patterns capture it.
+        key = (n.start_byte, n.end_byte)
+        if key not in texts:
+            texts[key] = source[n.start_byte:n.end_byte].decode('utf-8', errors='replace')
+        return texts[key]
+
+    grouped = {}
+    for _, captures in QueryCursor(query).matches(node):
+        def_node = kind = None
+        for name, nodes in captures.items():
+            if name.endswith('.def'):
+                kind, def_node = name[:-4], nodes[0]
+        if def_node is None:
+            continue
+        key = (def_node.start_byte, def_node.end_byte, def_node.type)
+        record = grouped.get(key)
+        if record is None:
+            record = grouped[key] = {
+                'kinds': set(), 'type': def_node.type, 'lineno': def_node.start_point[0] + 1,
+                'start_byte': def_node.start_byte, 'end_byte': def_node.end_byte, 'fields': {}
+            }
+        record['kinds'].add(kind)
+        for name, nodes in captures.items():
+            if name.endswith('.def') or name.startswith('_'):
+                continue
+            values = record['fields'].setdefault(name, {})
+            for n in nodes:
+                if name.endswith('.arg'):
+                    # Arguments only need their position; literals carry the text that replaces them.
+                    if not n.type.endswith('comment'):
+                        values[(n.start_byte, n.end_byte)] = None
+                else:
+                    values[(n.start_byte, n.end_byte)] = text(n)
+
+    records = []
+    for key in sorted(grouped, key=lambda k: (k[0], -k[1])):
+        record = grouped[key]
+        fields = {name: [values[r] for r in sorted(values)] for name, values in record['fields'].items()}
+        if 'call.arg' in record['fields']:
+            literals = record['fields'].get('call.literal', {})
+            fields['call.arg'] = [literals.get(r, '<dynamic>') for r in sorted(record['fields']['call.arg'])]
+        record['fields'] = fields
+        records.append(record)
+    return records
+
+
+def _first(fields, name):
+    values = fields.get(name)
+    return values[0] if values else None
+
+
+def build_results(records, results, inbuilt_functions=(), inbuilt_methods=(), inbuilt_datastructures=(),
+                  reserved_names=()):
+    """Fold query records into the analyzer's result dict and classify calls.
+
+    Functions and methods named in reserved_names (Python keywords and builtins) are skipped
+    together with everything inside them, as the tree walker did before queries. Records are
+    only read, never mutated, so callers may keep them cached between parses.
+    """
+    special_methods = {"__getitem__", "__setitem__", "__delitem__", "__iter__", "__next__", "__len__", "__contains__"}
+    calls = []
+    classes = []
+    skip_until = -1    # end byte of the reserved-name definition being skipped
+    for record in records:
+        kinds, fields = record['kinds'], record['fields']
+        lineno = record['lineno']
+        if record['start_byte'] < skip_until:
+            continue
+        if ('function' in kinds or 'method' in kinds) and _first(fields, 'function.name') in reserved_names:
+            skip_until = record['end_byte']
+            continue
+        if 'function' in kinds or 'method' in kinds:
+            func_info = {
+                'name': _first(fields, 'function.name') or 'anonymous', 'args': list(fields.get('function.param', [])),
+                'returns': _first(fields, 'function.returns'), 'decorators': list(fields.get('function.decorator', [])),
+                'lineno': lineno, 'return_exprs': list(fields.get('function.return', [])),
+                'class': _first(fields, 'method.class')
+            }
+            if 'self' in func_info['args']:
+                results['uses_self'] = True
+            if 'method' in kinds:
+                results['methods'].append(func_info)
+                results['user_method'].add(func_info['name'])
+            else:
+                results['functions'].append(func_info)
+                results['user_func'].add(func_info['name'])
+        if 'class' in kinds:
+            classes.append({
+                'name': _first(fields, 'class.name') or 'anonymous', 'bases': list(fields.get('class.base', [])),
+                'lineno': lineno, 'is_datastructure': False
+            })
+        if 'import' in kinds and fields.get('import.module'):
+            module = fields['import.module'][0].strip('"\'<>`')
+            results['imports'].append({
+                'module': module, 'name': _first(fields, 'import.name') or module,
+                'asname': _first(fields, 'import.alias'), 'lineno': lineno
+            })
+        if 'variable' in kinds:
+            results['variables'].update(fields.get('variable.name', []))
+        if 'call' in kinds and fields.get('call.name'):
+            name = fields['call.name'][0]
+            if fields.get('call.object'):
+                name = f"{fields['call.object'][0]}.{name}"
+            calls.append({'name': name, 'lineno': lineno, 'args': list(fields.get('call.arg', []))})
+        if 'literal' in kinds:
+            results['inbuilt_ds'].add(record['type'])
+        if 'self' in kinds:
+            results['uses_self'] = True
+        if 'comment' in kinds:
+            results['comments'].append({'text': fields['comment.text'][0].strip(), 'lineno': lineno, 'type': 'inline'})
+
+    for class_info in classes:
+        method_names = {m['name'] for m in results['methods'] if m['class'] == class_info['name']}
+        if special_methods & method_names or set(class_info['bases']) & set(inbuilt_datastructures):
+            class_info['is_datastructure'] = True
+            results['user_ds'].add(class_info['name'])
+        results['classes'].append(class_info)
+
+    user_defined_funcs = {f['name'] for f in results['functions']}
+    user_defined_methods = {m['name'] for m in results['methods']}
+    for call_info in calls:
+        fname = call_info['name']
+        fname_base = fname.split('.')[0]
+        # Bare calls can reach methods too (Java, C++ and Go code calls siblings unqualified).
+        fname_attr = fname.split('.')[-1]
+        results['function_calls'].append(call_info)
+        if fname_base in user_defined_funcs:
+            results['user_function_calls'].append(call_info)
+        elif fname_base in inbuilt_functions:
+            results['inbuilt_func'].add(fname_base)
+        elif fname_attr in user_defined_methods:
+            results['user_method'].add(fname_attr)
+        elif fname_attr in inbuilt_methods:
+            results['inbuilt_method'].add(fname_attr)
+    return results
@@ -0,0 +1,353 @@
+import os
+import io
+import sys
+import json
+import time
+import errno
+import select
+import socket
+import struct
+import argparse
+import tempfile
+import threading
+import contextlib
+import ctypes
+import ctypes.util
+import socketserver
+from input import CodebaseAnalyzer
+
+# Version control and dependency folders churn on checkouts and installs but hold no sources.
+IGNORED_DIRS = {".git", ".hg", ".svn", "__pycache__", "node_modules", ".venv", "venv", ".mypy_cache"}
+DEFAULT_SOCKET = os.path.join(tempfile.gettempdir(), "seering-watch.sock")
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE
+              | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+_EVENT = struct.Struct("iIII")
+
+
+def _walk_dirs(root):
+    for current, dirs, files in os.walk(root):
+        dirs[:] = [d for d in dirs if d not in IGNORED_DIRS]
+        yield current, files
+
+
+class InotifyWatcher:
+    """Recursive inotify watches through libc; Linux only."""
+    name = "inotify"
+
+    def __init__(self, root):
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self.__libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self.__libc, "inotify_init1"):
+            raise OSError(errno.ENOSYS, "inotify is not available")
+        self.__fd = self.__libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.__fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.root = root
+        self.__dirs = {}
+        for current, _ in _walk_dirs(root):
+            self.__add_watch(current)
+
+    def __add_watch(self, path):
+        wd = self.__libc.inotify_add_watch(self.__fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            # Directories can vanish between the event and the watch; anything else is fatal.
+            if ctypes.get_errno() in (errno.ENOENT, errno.ENOTDIR):
+                return
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        self.__dirs[wd] = path
+
+    def poll(self, timeout):
+        """Wait up to timeout seconds; return (changed paths, whether a full rescan is needed)."""
+        changed = set()
+        ready, _, _ = select.select([self.__fd], [], [], timeout)
+        if not ready:
+            return changed, False
+        try:
+            data = os.read(self.__fd, 256 * 1024)
+        except BlockingIOError:
+            return changed, False
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = _EVENT.unpack_from(data, offset)
+            name = data[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b"\0")
+            offset += _EVENT.size + length
+            if mask & IN_Q_OVERFLOW:
+                return changed, True
+            if mask & IN_IGNORED:
+                self.__dirs.pop(wd, None)
+                continue
+            directory = self.__dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, os.fsdecode(name))
+            if mask & IN_ISDIR:
+                if os.path.basename(path) in IGNORED_DIRS:
+                    continue
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # Files written before the new watch lands would otherwise be missed.
+                    for current, files in _walk_dirs(path):
+                        self.__add_watch(current)
+                        changed.update(os.path.join(current, f) for f in files)
+                else:
+                    # A removed directory takes every file below it along.
+                    changed.add(path + os.sep)
+                continue
+            changed.add(path)
+        return changed, False
+
+    def close(self):
+        os.close(self.__fd)
+
+
+class PollingWatcher:
+    """Portable fallback that diffs (mtime, size) snapshots of the tree."""
+    name = "polling"
+
+    def __init__(self, root, interval=1.0):
+        self.root = root
+        self.interval = interval
+        self.__snapshot = self.__scan()
+
+    def __scan(self):
+        snapshot = {}
+        for current, files in _walk_dirs(self.root):
+            for file in files:
+                path = os.path.join(current, file)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def poll(self, timeout):
+        time.sleep(min(timeout, self.interval))
+        snapshot = self.__scan()
+        changed = {path for path, sig in snapshot.items() if self.__snapshot.get(path) != sig}
+        changed.update(path for path in self.__snapshot if path not in snapshot)
+        self.__snapshot = snapshot
+        return changed, False
+
+    def close(self):
+        pass
+
+
+def make_watcher(root, force_polling=False, interval=1.0):
+    if not force_polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(root)
+        except OSError as e:
+            print(f"inotify unavailable ({e}), falling back to polling")
+    return PollingWatcher(root, interval)
+
+
+def _to_json(value):
+    if isinstance(value, set):
+        return sorted(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class WatchDaemon:
+    """Keeps a CodebaseAnalyzer warm and applies debounced file changes to it."""
+
+    def __init__(self, input_path, debounce=0.2, max_delay=2.0, force_polling=False, interval=1.0,
+                 workers=1, quiet=True):
+        self.input_path = os.path.abspath(input_path)
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.quiet = quiet
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.stats = {"batches": 0, "files_updated": 0, "files_removed": 0, "last_batch_seconds": None,
+                      "last_update": None, "started": time.time()}
+        self.analyzer = CodebaseAnalyzer(self.input_path)
+        # Watch before the initial scan so edits made while it runs are still picked up.
+        self.watcher = make_watcher(self.input_path, force_polling, interval)
+        with self.__output():
+            self.analyzer.analyze(workers=workers)
+
+    def __output(self):
+        return contextlib.redirect_stdout(io.StringIO()) if self.quiet else contextlib.nullcontext()
+
+    def __read(self, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return f.read()
+        except (OSError, UnicodeDecodeError):
+            return None
+
+    def apply(self, paths, rescan=False):
+        """Re-analyze touched files and patch the graph; deleted or emptied files are dropped."""
+        start = time.perf_counter()
+        with self.lock:
+            if rescan:
+                paths = set(paths) | set(self.analyzer.parsed)
+                for current, files in _walk_dirs(self.input_path):
+                    paths.update(os.path.join(current, f) for f in files)
+            for path in list(paths):
+                if path.endswith(os.sep):
+                    paths.discard(path)
+                    paths.update(p for p in self.analyzer.parsed if p.startswith(path))
+            updated = removed = 0
+            with self.__output():
+                for path in sorted(paths):
+                    if not self.analyzer.tracks(path):
+                        continue
+                    content = self.__read(path) if os.path.isfile(path) else None
+                    if content is not None and content.strip():
+                        self.analyzer.refresh_file(path, content)
+                        updated += 1
+                    elif path in self.analyzer.parsed:
+                        self.analyzer.remove_file(path)
+                        removed += 1
+            self.stats["batches"] += 1
+            self.stats["files_updated"] += updated
+            self.stats["files_removed"] += removed
+            self.stats["last_batch_seconds"] = time.perf_counter() - start
+            self.stats["last_update"] = time.time()
+        print(f"Applied {updated} updates and {removed} removals in {self.stats['last_batch_seconds']:.3f}s", flush=True)
+
+    def run(self):
+        """Collect events until the tree has been quiet for debounce seconds, then apply them."""
+        pending, rescan = set(), False
+        first = last = None
+        while not self.stopped.is_set():
+            paths, overflow = self.watcher.poll(self.debounce)
+            now = time.monotonic()
+            if paths or overflow:
+                pending |= paths
+                rescan = rescan or overflow
+                first = first or now
+                last = now
+            if (pending or rescan) and (now - last >= self.debounce or now - first >= self.max_delay):
+                self.apply(pending, rescan)
+                pending, rescan = set(), False
+                first = last = None
+
+    def stop(self):
+        self.stopped.set()
+
+    def handle(self, request):
+        """Answer one query against the live state."""
+        cmd = request.get("cmd")
+        with self.lock:
+            analyzer = self.analyzer
+            if cmd == "status":
+                return dict(self.stats, backend=self.watcher.name, root=self.input_path,
+                            files=len(analyzer.parsed), modules=analyzer.graph.number_of_nodes(),
+                            edges=analyzer.graph.number_of_edges())
+            if cmd == "files":
+                return sorted(analyzer.parsed)
+            if cmd == "ast":
+                path = os.path.abspath(os.path.join(self.input_path, request["path"]))
+                if path not in analyzer.parsed:
+                    raise KeyError(f"Not analyzed: {request['path']}")
+                return {k: v for k, v in analyzer.parsed[path].items() if k != "content"}
+            if cmd == "graph":
+                return {"nodes": sorted(analyzer.graph.nodes), "edges": sorted(analyzer.graph.edges)}
+            if cmd == "dot":
+                return analyzer.to_dot()
+            if cmd in ("dependencies", "dependents"):
+                module = request["module"]
+                if module not in analyzer.graph:
+                    raise KeyError(f"Unknown module: {module}")
+                neighbours = analyzer.graph.predecessors if cmd == "dependencies" else analyzer.graph.successors
+                return sorted(neighbours(module))
+        raise ValueError(f"Unknown command: {cmd}")
+
+
+class _QueryHandler(socketserver.StreamRequestHandler):
+    """Newline-delimited JSON: one request object per line, one response object per line."""
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                response = {"ok": True, "result": self.server.daemon_state.handle(json.loads(line))}
+            except Exception as e:
+                response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            self.wfile.write(json.dumps(response, default=_to_json).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+def serve(daemon, socket_path=None, port=None):
+    """Start the query server in a background thread, on a Unix socket unless a port is given."""
+    if port is not None or not hasattr(socket, "AF_UNIX"):
+        server = socketserver.ThreadingTCPServer(("127.0.0.1", port or 0), _QueryHandler)
+        address = server.server_address
+    else:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = socketserver.ThreadingUnixStreamServer(socket_path, _QueryHandler)
+        os.chmod(socket_path, 0o600)
+        address = socket_path
+    server.daemon_threads = True
+    server.daemon_state = daemon
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, address
+
+
+def query(request, socket_path=DEFAULT_SOCKET, port=None):
+    """Send one request to a running daemon and return its decoded response."""
+    if port is not None:
+        sock = socket.create_connection(("127.0.0.1", port))
+    else:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(socket_path)
+    with sock, sock.makefile("rwb") as stream:
+        stream.write(json.dumps(request).encode("utf-8") + b"\n")
+        stream.flush()
+        return json.loads(stream.readline())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Keep codebase analysis warm and answer queries over a local socket.")
+    parser.add_argument("path", nargs="?", default=".", help="Directory to watch")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help="Unix socket path for queries")
+    parser.add_argument("--port", type=int, default=None, help="Listen on 127.0.0.1:PORT instead of a Unix socket")
+    parser.add_argument("--debounce", type=float, default=0.2, help="Quiet period in seconds before applying changes")
+    parser.add_argument("--max-delay", type=float, default=2.0, help="Apply a continuous burst after this many seconds")
+    parser.add_argument("--poll", action="store_true", help="Use the polling watcher even where inotify works")
+    parser.add_argument("--interval", type=float, default=1.0, help="Polling interval in seconds")
+    parser.add_argument("--workers", type=int, default=1, help="Process pool size for the initial scan")
+    parser.add_argument("--verbose", action="store_true", help="Show the analyzer's per-file output")
+    parser.add_argument("--query", default=None, help='Send a JSON request to a running daemon, e.g. \'{"cmd": "status"}\'')
+    args = parser.parse_args()
+
+    if args.query:
+        print(json.dumps(query(json.loads(args.query), args.socket, args.port), indent=2))
+        return
+
+    start = time.perf_counter()
+    daemon = WatchDaemon(args.path, debounce=args.debounce, max_delay=args.max_delay, force_polling=args.poll,
+                         interval=args.interval, workers=args.workers, quiet=not args.verbose)
+    print(f"Analyzed {len(daemon.analyzer.parsed)} files in {time.perf_counter() - start:.2f}s "
+          f"(watching with {daemon.watcher.name})", flush=True)
+    server, address = serve(daemon, args.socket, args.port)
+    print(f"Listening on {address}", flush=True)
+    try:
+        daemon.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        daemon.watcher.close()
+        if isinstance(address, str) and os.path.exists(address):
+            os.unlink(address)
+
+
+if __name__ == "__main__":
+    main()